@@ -0,0 +1,363 @@
+#!/usr/bin/env python3.11
+"""
+Benchmark do pipeline de correlação - Arte Comercial
+Gera exportações sintéticas do Trello (licitações) e bibliotecas de prompts
+determinísticas em vários tamanhos, cronometra cada fase do
+FinalIntegrationSystem e grava os resultados em JSON para comparar commits.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource  # Pico de memória do processo (indisponível no Windows)
+except ImportError:
+    resource = None
+
+from final_integration_system import CompactAnalysisFile, FinalIntegrationSystem
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+# Data de referência fixa: a mesma semente gera sempre a mesma exportação
+REFERENCE_DATE = datetime(2025, 7, 1, tzinfo=timezone.utc)
+
+MODALIDADES = ['Pregão Eletrônico', 'Dispensa Eletrônica', 'Concorrência', 'Tomada de Preços', 'Cotação Eletrônica']
+ORGAOS = [
+    'Prefeitura Municipal de Campinas', 'Secretaria de Estado da Saúde', 'Universidade Federal de Minas Gerais',
+    'Tribunal Regional Eleitoral', 'Instituto Federal do Paraná', 'Câmara Municipal de Curitiba',
+    'Comando da Aeronáutica', 'Fundação Oswaldo Cruz', 'Prefeitura de São José dos Campos', 'SEBRAE Nacional'
+]
+OBJETOS = [
+    'instrumentos musicais', 'equipamentos de áudio', 'material gráfico', 'mobiliário escolar',
+    'uniformes e fardamentos', 'equipamentos de informática', 'material de expediente', 'kits pedagógicos',
+    'serviços de impressão', 'instrumentos de percussão', 'caixas acústicas', 'microfones sem fio'
+]
+DETALHES = [
+    'Edital publicado no portal de compras com prazo de impugnação de 3 dias úteis.',
+    'Verificar habilitação: CND federal, FGTS, trabalhista e balanço patrimonial.',
+    'Enviar proposta ajustada após a fase de lances com planilha de custos.',
+    'Cliente solicitou amostra antes da homologação; conferir especificações técnicas.',
+    'Atualizar relatório diário de disputas e sincronizar planilha de vendas.',
+    'Integração com a API do portal para importar itens do edital automaticamente.',
+    'Conferir empenho e emitir nota fiscal; acompanhar pagamento semanal.',
+    'Análise de margem: receita estimada, frete e impostos para otimização do lucro.',
+    'Processar retorno da Receita Federal (CNPJ) e CEP de entrega do órgão.',
+    'Gerar documentação para recurso administrativo dentro do prazo legal.',
+    'Webhook do Trello notifica a equipe quando o card muda de lista.',
+    'Rotina mensal de conferência de atas de registro de preço vigentes.'
+]
+LISTAS = ['Prospecção', 'Análise de Edital', 'Documentação', 'Proposta', 'Disputa', 'Recurso', 'Empenho', 'Entregue']
+LABELS = [('Urgente', 'red'), ('Alta prioridade', 'orange'), ('Pregão', 'blue'), ('Dispensa', 'sky'),
+          ('Documentação', 'purple'), ('Proposta enviada', 'green'), ('Crítico', 'black'), ('Baixa', 'lime')]
+
+PROMPT_TEMPLATES = {
+    'gpt': ('import openai\nimport json\n\n', 'def resumir_{name}(texto: str) -> str:\n'
+            '    """Resume {topic} com GPT"""\n    resposta = openai.ChatCompletion.create(model="gpt-4", '
+            'messages=[{{"role": "user", "content": texto}}])\n    return resposta["choices"][0]["message"]["content"]\n'),
+    'gov': ('import requests\n\n', 'def consultar_{name}(cnpj: str) -> dict:\n'
+            '    """Consulta {topic} na Receita Federal"""\n    url = f"https://www.receitaws.com.br/v1/cnpj/{{cnpj}}"\n'
+            '    return requests.get(url, timeout=10).json()\n'),
+    'trello': ('import requests\nimport os\n\n', 'def mover_card_{name}(card_id: str, lista: str) -> bool:\n'
+               '    """Move card de {topic} no board do Trello"""\n    params = {{"key": os.getenv("TRELLO_API_KEY"), '
+               '"token": os.getenv("TRELLO_TOKEN"), "idList": lista}}\n'
+               '    return requests.put(f"https://api.trello.com/1/cards/{{card_id}}", params=params).ok\n'),
+    'dados': ('import pandas as pd\nimport json\n\n', 'def relatorio_{name}(caminho: str) -> dict:\n'
+              '    """Gera relatório de {topic} a partir do CSV"""\n    df = pd.read_csv(caminho)\n'
+              '    return json.loads(df.describe().to_json())\n'),
+    'apis': ('import asyncio\nimport aiohttp\n\n', 'async def sincronizar_{name}(url: str) -> dict:\n'
+             '    """Sincroniza {topic} via API REST com webhook de retorno"""\n'
+             '    async with aiohttp.ClientSession() as session:\n'
+             '        async with session.get(url) as response:\n            return await response.json()\n')
+}
+
+def _trello_id(rng: random.Random) -> str:
+    return '%024x' % rng.getrandbits(96)
+
+def generate_trello_export(card_count: int, seed: int = 42) -> Dict:
+    """Exportação sintética do Trello com cards de licitações (determinística pela semente)"""
+    rng = random.Random(seed)
+    lists = [{'id': _trello_id(rng), 'name': name, 'closed': False, 'pos': pos * 1024}
+             for pos, name in enumerate(LISTAS)]
+    labels = [{'id': _trello_id(rng), 'name': name, 'color': color} for name, color in LABELS]
+    members = [_trello_id(rng) for _ in range(6)]
+
+    cards = []
+    actions = []
+    for number in range(card_count):
+        objeto = rng.choice(OBJETOS)
+        orgao = rng.choice(ORGAOS)
+        name = f"{rng.choice(MODALIDADES)} nº {rng.randint(1, 999):03d}/2025 - {orgao} - {objeto.capitalize()}"
+        desc = "\n\n".join(
+            [f"Licitação para aquisição de {objeto} ({orgao}). Valor estimado: R$ {rng.randint(2, 900) * 1000:,}."]
+            + rng.sample(DETALHES, rng.randint(0, 5))
+        ) if rng.random() > 0.1 else ""
+        due = None
+        if rng.random() < 0.7:
+            due = (REFERENCE_DATE + timedelta(days=rng.randint(-10, 60), hours=rng.randint(0, 23)))
+            due = due.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        card_id = _trello_id(rng)
+        cards.append({
+            'id': card_id,
+            'name': name,
+            'desc': desc,
+            'idList': rng.choice(lists)['id'],
+            'closed': rng.random() < 0.05,
+            'due': due,
+            'labels': rng.sample(labels, rng.randint(0, 3)),
+            'idMembers': rng.sample(members, rng.randint(0, 2)),
+            'pos': number * 1024
+        })
+        actions.append({
+            'id': _trello_id(rng), 'type': 'createCard', 'idMemberCreator': rng.choice(members),
+            'data': {'card': {'id': card_id, 'name': name}}, 'date': REFERENCE_DATE.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        })
+
+    return {
+        'id': _trello_id(rng),
+        'name': 'Arte Comercial - Licitações (benchmark)',
+        'actions': actions,
+        'cards': cards,
+        'labels': labels,
+        'lists': lists,
+        'members': [{'id': member, 'fullName': f"Membro {i}"} for i, member in enumerate(members)]
+    }
+
+def generate_prompt_library(directory: Path, prompt_count: int, seed: int = 42) -> None:
+    """Biblioteca sintética de prompts/código em `directory` (um arquivo .py por prompt)"""
+    rng = random.Random(seed)
+    categories = list(PROMPT_TEMPLATES)
+    for number in range(prompt_count):
+        category = categories[number % len(categories)]
+        header, function = PROMPT_TEMPLATES[category]
+        topics = rng.sample(OBJETOS, rng.randint(1, 4))
+        body = "".join(function.format(name=f"{topic.split()[0]}_{i}", topic=topic) + "\n"
+                       for i, topic in enumerate(topics))
+        path = directory / category / f"{category}_{number:05d}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(header + body, encoding='utf-8')
+
+def _peak_rss_mb() -> Optional[float]:
+    """Pico de memória residente do processo em MB (ru_maxrss)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+def run_size(card_count: int, prompt_count: int, workdir: Path, seed: int, options: Dict,
+             trace_memory: bool = False) -> Dict:
+    """Executa o pipeline uma vez e mede cada fase"""
+    board_path = workdir / f"board_{card_count}_{seed}.json"
+    if not board_path.exists():
+        with open(board_path, 'w', encoding='utf-8') as f:
+            json.dump(generate_trello_export(card_count, seed), f, ensure_ascii=False)
+    prompts_dir = workdir / f"prompts_{prompt_count}_{seed}"
+    if not prompts_dir.exists():
+        generate_prompt_library(prompts_dir, prompt_count, seed)
+
+    system = FinalIntegrationSystem(str(board_path), 'https://github.com/pietrorampazzo/arte_comercial',
+                                    prompts_path=str(prompts_dir), **options)
+    phases = {}
+
+    def measure(name: str, function, items: Optional[int] = None, unit: str = 'cards'):
+        if trace_memory:
+            tracemalloc.reset_peak()
+        started, cpu_started = time.perf_counter(), time.process_time()
+        value = function()
+        seconds = time.perf_counter() - started
+        phase = {
+            'seconds': round(seconds, 4),
+            'cpu_seconds': round(time.process_time() - cpu_started, 4),
+            'peak_rss_mb': _peak_rss_mb()
+        }
+        if trace_memory:
+            phase['traced_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        if items is not None:
+            phase[f'{unit}_per_second'] = round(items / seconds, 1) if seconds else None
+        phases[name] = phase
+        return value
+
+    if trace_memory:
+        tracemalloc.start()
+    if not measure('load_trello', system.load_and_analyze_trello):
+        raise RuntimeError(f"Falha ao carregar {board_path}")
+    phases['load_trello']['cards_per_second'] = round(len(system.cards) / phases['load_trello']['seconds'], 1)
+    if not measure('load_prompts', system.load_and_analyze_github, prompt_count, 'prompts'):
+        raise RuntimeError(f"Falha ao carregar {prompts_dir}")
+    correlations = measure('correlate', system.create_intelligent_correlations)
+    phases['correlate']['pairs_per_second'] = round(
+        len(system.cards) * len(system.prompts) / phases['correlate']['seconds'], 1
+    )
+    summary = measure('summary', system.generate_executive_summary,
+                      len(correlations), 'correlations')
+
+    result = measure('build_result', lambda: {
+        'success': True,
+        'executive_summary': summary,
+        'detailed_correlations': correlations,
+        'cards_analysis': [asdict(card) for card in system.cards],
+        'prompts_analysis': [asdict(prompt) for prompt in system.prompts]
+    })
+    output_path = workdir / f"analysis_{card_count}.json"
+    compact_path = workdir / f"analysis_{card_count}.compact.json"
+
+    def write_json():
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        return output_path.stat().st_size
+
+    output_bytes = measure('json_write', write_json)
+    compact_bytes = measure('compact_write', lambda: CompactAnalysisFile.write(result, str(compact_path)))
+    for name, size in (('json_write', output_bytes), ('compact_write', compact_bytes)):
+        phases[name]['megabytes_per_second'] = round(size / (1024 * 1024) / phases[name]['seconds'], 1)
+    if trace_memory:
+        tracemalloc.stop()
+    output_path.unlink()
+    compact_path.unlink()
+
+    return {
+        'cards': card_count,
+        'open_cards': len(system.cards),
+        'prompts': len(system.prompts),
+        'correlations': len(correlations),
+        'export_megabytes': round(board_path.stat().st_size / (1024 * 1024), 2),
+        'output_megabytes': round(output_bytes / (1024 * 1024), 2),
+        'compact_output_megabytes': round(compact_bytes / (1024 * 1024), 2),
+        'total_seconds': round(sum(phase['seconds'] for phase in phases.values()), 4),
+        'peak_rss_mb': _peak_rss_mb(),
+        'phases': phases
+    }
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, check=True,
+                              text=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare_results(current: Dict, baseline: Dict) -> List[str]:
+    """Linhas com a variação de tempo por fase em relação a um resultado anterior"""
+    lines = []
+    previous = {(run['cards'], run.get('workers', 1)): run for run in baseline.get('results', [])}
+    for run in current['results']:
+        old = previous.get((run['cards'], run.get('workers', 1)))
+        if not old:
+            continue
+        for name, phase in run['phases'].items():
+            old_seconds = old['phases'].get(name, {}).get('seconds')
+            if old_seconds:
+                change = (phase['seconds'] - old_seconds) / old_seconds * 100
+                marker = '🔴' if change > 10 else '🟢' if change < -10 else '⚪'
+                lines.append(f"{marker} {run['cards']:>7} cards x{run.get('workers', 1)} | {name:<12} "
+                             f"{old_seconds:>9.3f}s -> {phase['seconds']:>9.3f}s ({change:+.1f}%)")
+    return lines
+
+def scaling_lines(results: List[Dict]) -> List[str]:
+    """Speedup da fase de correlação de cada número de processos em relação a 1 processo"""
+    lines = []
+    single = {run['cards']: run['phases']['correlate']['seconds'] for run in results if run['workers'] == 1}
+    for run in results:
+        seconds = run['phases']['correlate']['seconds']
+        if run['cards'] in single and seconds:
+            lines.append(f"{run['cards']:>7} cards | {run['workers']:>2} processos: correlate {seconds:>9.3f}s "
+                         f"(speedup {single[run['cards']] / seconds:.2f}x)")
+    return lines
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Benchmark do pipeline de correlação")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Quantidades de cards")
+    parser.add_argument('--prompts', type=int, default=50, help="Arquivos na biblioteca de prompts")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workdir', help="Diretório das exportações geradas (reaproveitadas entre execuções)")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help="Resultado anterior para comparação por fase")
+    parser.add_argument('--tracemalloc', action='store_true', help="Pico de alocações Python por fase (mais lento)")
+    parser.add_argument('--semantic-mode', default='batch', choices=['batch', 'pair', 'minhash'])
+    parser.add_argument('--top-k', type=int)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1],
+                        help="Processos de pontuação; vários valores medem a escalabilidade (ex.: 1 2 4 8)")
+    parser.add_argument('--streaming-load', action='store_true')
+    parser.add_argument('--vectorized-metrics', action='store_true')
+    parser.add_argument('--single', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    options = {
+        'semantic_mode': args.semantic_mode,
+        'top_k': args.top_k,
+        'workers': args.workers[0],
+        'streaming_load': args.streaming_load,
+        'vectorized_metrics': args.vectorized_metrics
+    }
+    logging.getLogger('final_integration_system').setLevel(logging.WARNING)
+    workdir = Path(args.workdir or Path(tempfile.gettempdir()) / 'arte_comercial_benchmark')
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    if args.single:
+        # Execução filha: um tamanho por processo, para o pico de memória ser só dele
+        result = run_size(args.sizes[0], args.prompts, workdir, args.seed, options, args.tracemalloc)
+        print(json.dumps(result))
+        return
+
+    results = []
+    for size, workers in [(size, workers) for size in args.sizes for workers in args.workers]:
+        command = [sys.executable, __file__, '--single', '--sizes', str(size), '--prompts', str(args.prompts),
+                   '--seed', str(args.seed), '--workdir', str(workdir), '--semantic-mode', args.semantic_mode,
+                   '--workers', str(workers)]
+        command += ['--top-k', str(args.top_k)] if args.top_k is not None else []
+        command += [flag for flag, enabled in (('--streaming-load', args.streaming_load),
+                                               ('--vectorized-metrics', args.vectorized_metrics),
+                                               ('--tracemalloc', args.tracemalloc)) if enabled]
+        completed = subprocess.run(command, capture_output=True, text=True, cwd=os.getcwd())
+        if completed.returncode != 0:
+            logger.error(f"❌ Benchmark de {size} cards ({workers} processos) falhou: {completed.stderr[-2000:]}")
+            print(f"❌ {size} cards x{workers}: falhou (veja o log)")
+            continue
+        run = json.loads(completed.stdout.strip().splitlines()[-1])
+        run['workers'] = workers
+        results.append(run)
+        print(f"📊 {size:>7} cards x {run['prompts']} prompts ({workers} processos): {run['total_seconds']:.2f}s | "
+              + " | ".join(f"{name} {phase['seconds']:.2f}s" for name, phase in run['phases'].items())
+              + f" | pico {run['peak_rss_mb']} MB")
+
+    report = {
+        'generated_at': datetime.now().isoformat(),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': args.seed,
+        'options': dict(options, workers=args.workers),
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"💾 Resultados salvos em {args.output}")
+
+    if len(args.workers) > 1:
+        print(f"\n⚙️ Escalabilidade ({os.cpu_count()} CPUs):")
+        for line in scaling_lines(results):
+            print(f"   {line}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"\n📈 Comparação com {args.baseline} (commit {baseline.get('commit')}):")
+        for line in compare_results(report, baseline):
+            print(f"   {line}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3.11
+"""
+Benchmark do modo semântico aproximado (MinHash/LSH) - Arte Comercial
+Compara o modo "minhash" com o motor exato ("batch") num corpus sintético
+determinístico e informa recall, precisão e ganho de tempo.
+"""
+
+import argparse
+import json
+import logging
+import random
+import time
+from typing import Dict, List, Tuple
+
+from final_integration_system import FinalIntegrationSystem, MinHashLSH, SmartGitHubPrompt, SmartTrelloCard
+
+logger = logging.getLogger(__name__)
+
+def generate_corpus(card_count: int, prompt_count: int, seed: int = 42) -> Tuple[List[SmartTrelloCard],
+                                                                                  List[SmartGitHubPrompt]]:
+    """Gera cards e prompts sintéticos agrupados por assunto (mesma semente = mesmo corpus)"""
+    rng = random.Random(seed)
+    topics = [[f"termo{topic}x{word}" for word in range(40)] for topic in range(max(1, prompt_count // 4))]
+    common = ['api', 'integração', 'relatório', 'cliente', 'processar', 'dados', 'webhook', 'vendas']
+    
+    prompts = []
+    for prompt_idx in range(prompt_count):
+        topic = topics[prompt_idx % len(topics)]
+        words = rng.sample(topic, rng.randint(10, 30)) + rng.sample(common, rng.randint(0, 4))
+        prompts.append(SmartGitHubPrompt(
+            filename=f"prompt_{prompt_idx:05d}.py",
+            content="\n".join(f"def {word}(): return '{word}'" for word in words),
+            category="Benchmark",
+            path=f"benchmark/prompt_{prompt_idx:05d}.py"
+        ))
+    
+    cards = []
+    for card_idx in range(card_count):
+        topic = rng.choice(topics)
+        words = rng.sample(topic, rng.randint(3, 20)) + rng.sample(common, rng.randint(0, 3))
+        card = SmartTrelloCard(
+            id=f"card{card_idx:06d}", name=" ".join(words[:3]), desc=" ".join(words[3:]),
+            list_id="lista", list_name="Benchmark", labels=[]
+        )
+        card.calculate_metrics()
+        cards.append(card)
+    return cards, prompts
+
+def run_mode(cards: List[SmartTrelloCard], prompts: List[SmartGitHubPrompt], **options) -> Tuple[FinalIntegrationSystem,
+                                                                                                 List[Dict], float]:
+    """Executa a correlação num modo e devolve (sistema, correlações, segundos)"""
+    system = FinalIntegrationSystem('', '', **options)
+    system.cards = cards
+    system.prompts = prompts
+    start = time.perf_counter()
+    correlations = system.create_intelligent_correlations()
+    return system, correlations, time.perf_counter() - start
+
+def benchmark(card_count: int, prompt_count: int, permutations: int, bands: int, top_k: int,
+              similarity: float, seed: int = 42) -> Dict:
+    """Compara o modo "minhash" com o exato e calcula recall/precisão"""
+    cards, prompts = generate_corpus(card_count, prompt_count, seed)
+    exact, exact_correlations, exact_seconds = run_mode(cards, prompts, semantic_mode="batch", top_k=top_k)
+    approx, approx_correlations, approx_seconds = run_mode(
+        cards, prompts, semantic_mode="minhash", top_k=top_k,
+        minhash_permutations=permutations, lsh_bands=bands
+    )
+    
+    exact_pairs = {(c['card_id'], c['prompt_filename']) for c in exact_correlations}
+    approx_pairs = {(c['card_id'], c['prompt_filename']) for c in approx_correlations}
+    common_pairs = exact_pairs & approx_pairs
+    
+    # Etapa semântica isolada: matriz exata completa vs LSH + Jaccard exato dos candidatos
+    index = exact._build_correlation_index()
+    start = time.perf_counter()
+    exact_rows = exact._calculate_semantic_matrix(index)
+    exact_semantic_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    lsh_candidates = MinHashLSH(permutations, bands).candidates(index['card_keywords'], index['prompt_keywords'])
+    approx._calculate_semantic_pairs(index, [(card_idx, prompt_idx) for card_idx, prompts in enumerate(lsh_candidates)
+                                             for prompt_idx in prompts])
+    approx_semantic_seconds = time.perf_counter() - start
+    
+    # Recall dos candidatos: pares com Jaccard exato >= `similarity` que o LSH encontrou
+    similar_pairs = [
+        (card_idx, prompt_idx)
+        for card_idx, row in exact_rows.items()
+        for prompt_idx, score in row.items() if score >= similarity
+    ]
+    similar_found = sum(1 for card_idx, prompt_idx in similar_pairs if prompt_idx in lsh_candidates[card_idx])
+    
+    return {
+        'cards': card_count,
+        'prompts': prompt_count,
+        'minhash_permutations': permutations,
+        'lsh_bands': bands,
+        'top_k': top_k,
+        'exact_seconds': round(exact_seconds, 3),
+        'minhash_seconds': round(approx_seconds, 3),
+        'speedup': round(exact_seconds / approx_seconds, 2) if approx_seconds else None,
+        'exact_semantic_seconds': round(exact_semantic_seconds, 3),
+        'minhash_semantic_seconds': round(approx_semantic_seconds, 3),
+        'semantic_speedup': round(exact_semantic_seconds / approx_semantic_seconds, 2) if approx_semantic_seconds else None,
+        'exact_nonzero_pairs': sum(len(row) for row in exact_rows.values()),
+        'lsh_pairs': sum(len(prompts) for prompts in lsh_candidates),
+        'exact_candidate_pairs': exact.correlation_stats['candidate_pairs'],
+        'minhash_candidate_pairs': approx.correlation_stats['candidate_pairs'],
+        'recall_top_k': round(len(common_pairs) / len(exact_pairs), 4) if exact_pairs else 1.0,
+        'precision_top_k': round(len(common_pairs) / len(approx_pairs), 4) if approx_pairs else 1.0,
+        'similarity_threshold': similarity,
+        'similar_pairs': len(similar_pairs),
+        'recall_similar_pairs': round(similar_found / len(similar_pairs), 4) if similar_pairs else 1.0
+    }
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Benchmark MinHash/LSH vs Jaccard exato")
+    parser.add_argument('--cards', type=int, default=10000)
+    parser.add_argument('--prompts', type=int, default=2000)
+    parser.add_argument('--permutations', type=int, default=128)
+    parser.add_argument('--bands', type=int, default=64)
+    parser.add_argument('--top-k', type=int, default=1000)
+    parser.add_argument('--similarity', type=float, default=0.3,
+                        help="Jaccard mínimo dos pares usados no recall de candidatos")
+    parser.add_argument('--output', default='minhash_benchmark.json')
+    args = parser.parse_args()
+    
+    logging.getLogger('final_integration_system').setLevel(logging.WARNING)
+    result = benchmark(args.cards, args.prompts, args.permutations, args.bands, args.top_k, args.similarity)
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    
+    print("📊 BENCHMARK MINHASH/LSH")
+    print(f"   ⏱️ Exato: {result['exact_seconds']}s | MinHash: {result['minhash_seconds']}s "
+          f"({result['speedup']}x)")
+    print(f"   🧮 Etapa semântica: {result['exact_semantic_seconds']}s ({result['exact_nonzero_pairs']} pares) | "
+          f"LSH: {result['minhash_semantic_seconds']}s ({result['lsh_pairs']} pares, {result['semantic_speedup']}x)")
+    print(f"   🔎 Pares candidatos: {result['exact_candidate_pairs']} -> {result['minhash_candidate_pairs']}")
+    print(f"   🎯 Recall top-{result['top_k']}: {result['recall_top_k']} | Precisão: {result['precision_top_k']}")
+    print(f"   🧩 Recall dos pares com Jaccard >= {result['similarity_threshold']}: "
+          f"{result['recall_similar_pairs']} ({result['similar_pairs']} pares)")
+    print(f"   💾 Resultado salvo em {args.output}")
+
+if __name__ == "__main__":
+    main()
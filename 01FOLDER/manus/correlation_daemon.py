@@ -0,0 +1,421 @@
+#!/usr/bin/env python3.11
+"""
+Serviço residente de correlação - Arte Comercial
+Carrega cards e prompts uma única vez, mantém índices e scores em memória e
+responde consultas por HTTP (TCP local ou socket Unix). Inserções, alterações
+e remoções de cards recalculam apenas as linhas do card afetado.
+
+Rotas:
+    GET    /health
+    GET    /summary
+    GET    /cards/<card_id>/correlations?limit=N
+    GET    /prompts/<arquivo>/cards?limit=N
+    PUT    /cards/<card_id>      (corpo: card no formato da exportação do Trello)
+    DELETE /cards/<card_id>
+"""
+
+import argparse
+import copy
+import heapq
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from bisect import bisect_left, insort
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from final_integration_system import FinalIntegrationSystem, SmartTrelloCard, SummaryAccumulator
+
+logger = logging.getLogger(__name__)
+
+class CorrelationService:
+    """Estado em memória da correlação, atualizado card a card
+    
+    Cada correlação é a tupla leve do ranking (score, -ordem do card, -prompt,
+    scores). As linhas de um card ficam ordenadas por score; as de cada prompt
+    ficam numa lista ordenada (bisect), e os totais do resumo são somados e
+    subtraídos a cada alteração. A carga inicial usa o motor em lote; as
+    atualizações usam o índice invertido e o Jaccard par a par (mesmos scores).
+    """
+    
+    DEFAULT_LIMIT = 20
+    
+    def __init__(self, system: FinalIntegrationSystem):
+        # Todas as correlações ficam em memória: top_k não se aplica ao serviço
+        system.top_k = None
+        self.system = system
+        self._lock = threading.Lock()
+        self.index: Dict = {}
+        self.cards: Dict[str, SmartTrelloCard] = {}
+        self.card_order: Dict[str, int] = {}  # card_id -> ordem (desempate do ranking)
+        self.card_by_order: Dict[int, str] = {}
+        self.card_entries: Dict[str, List[Tuple]] = {}
+        self.card_totals: Dict[str, Tuple[str, int, int, int]] = {}  # ROI, correlações, alta prioridade, soma em milésimos
+        self.prompt_entries: List[List[Tuple]] = []
+        self.prompt_positions: Dict[str, int] = {}
+        self._next_order = 0
+        # Somas de scores em milésimos inteiros: upserts/remoções não acumulam erro de ponto flutuante
+        self._totals = {'count': 0, 'high_priority': 0, 'total_milli': 0, 'high_roi': 0}
+        self._roi_counts: Dict[str, int] = {}
+        self._prompt_counts: List[int] = []
+        self._prompt_milli: List[int] = []
+        self._summary: Optional[Dict] = None
+        self._scorer: Optional[FinalIntegrationSystem] = None
+    
+    def load(self) -> None:
+        """Carrega Trello e prompts e pontua todos os pares uma vez"""
+        system = self.system
+        if not system.load_and_analyze_trello():
+            raise RuntimeError(f"Falha ao carregar {system.trello_json_path}")
+        if not system.load_and_analyze_github():
+            raise RuntimeError("Falha ao carregar os prompts")
+        
+        started = time.perf_counter()
+        self.index = system._build_correlation_index()
+        ranked = system._score_card_range(self.index, range(len(system.cards)))['ranked']
+        ranked.sort(reverse=True)
+        
+        # Cópia rasa usada para pontuar um card isolado (Jaccard par a par, sem banco)
+        self._scorer = copy.copy(system)
+        self._scorer.semantic_mode = "pair"
+        self._scorer.store_path = None
+        self._scorer.vectorized_metrics = False
+        
+        prompt_count = len(system.prompts)
+        self.prompt_positions = {prompt.filename: idx for idx, prompt in enumerate(system.prompts)}
+        self.prompt_entries = [[] for _ in range(prompt_count)]
+        self._prompt_counts = [0] * prompt_count
+        self._prompt_milli = [0] * prompt_count
+        for card in system.cards:
+            self._register_card(card)
+            self.card_entries[card.id] = []
+        for entry in ranked:
+            self.card_entries[self.card_by_order[-entry[1]]].append(entry)
+        for card_id, entries in self.card_entries.items():
+            self._add_entries(card_id, entries)
+        
+        logger.info(f"🧠 Serviço carregado: {len(self.cards)} cards, {prompt_count} prompts, "
+                    f"{self._totals['count']} correlações em {time.perf_counter() - started:.2f}s")
+    
+    def card_correlations(self, card_id: str, limit: Optional[int] = None) -> Optional[List[Dict]]:
+        """Melhores correlações de um card (None se o card não existe)"""
+        with self._lock:
+            entries = self.card_entries.get(card_id)
+            if entries is None:
+                return None
+            return [self._record(entry) for entry in entries[:limit or self.DEFAULT_LIMIT]]
+    
+    def prompt_cards(self, filename: str, limit: Optional[int] = None) -> Optional[List[Dict]]:
+        """Cards que mais combinam com um prompt (None se o prompt não existe)"""
+        with self._lock:
+            prompt_idx = self.prompt_positions.get(filename)
+            if prompt_idx is None:
+                return None
+            entries = self.prompt_entries[prompt_idx]
+            return [self._record(entries[-position]) for position in
+                    range(1, min(limit or self.DEFAULT_LIMIT, len(entries)) + 1)]
+    
+    def summary(self) -> Dict:
+        """Resumo executivo do estado atual (recalculado só após alterações)"""
+        with self._lock:
+            if self._summary is None:
+                self._summary = self._build_summary()
+            return self._summary
+    
+    def upsert_card(self, card_data: Dict) -> Dict:
+        """Insere ou atualiza um card (formato da exportação do Trello) e repontua só ele"""
+        if card_data.get('closed', False):
+            return self.delete_card(card_data['id'])
+        
+        started = time.perf_counter()
+        with self._lock:
+            scorer = self._scorer
+            card = scorer._build_card(card_data)
+            self._remove_entries(card.id)
+            self._register_card(card)
+            
+            keywords, tag_matches = scorer._card_index_row(card)
+            index = self.index
+            card_index = dict(
+                index,
+                card_keywords=[keywords],
+                card_tag_matches=[tag_matches],
+                candidates=[scorer._card_candidates(keywords, tag_matches, index['keyword_index'],
+                                                    index['tag_index'])],
+                known_prompts=[set()],
+                known_pairs=[{}]
+            )
+            scorer.cards = [card]
+            ranked = scorer._score_card_range(card_index, range(1))['ranked']
+            scorer.cards = []
+            
+            # Tuplas do card isolado recebem a ordem do card no serviço
+            order = -self.card_order[card.id]
+            entries = sorted(((score, order, neg_prompt_idx, scores)
+                              for score, _, neg_prompt_idx, scores in ranked), reverse=True)
+            self._add_entries(card.id, entries)
+            self.card_entries[card.id] = entries
+            self._summary = None
+        
+        return {'card_id': card.id, 'correlations': len(entries),
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 3)}
+    
+    def delete_card(self, card_id: str) -> Dict:
+        """Remove um card e suas correlações"""
+        started = time.perf_counter()
+        with self._lock:
+            removed = card_id in self.cards
+            if removed:
+                self._remove_entries(card_id)
+                del self.card_by_order[self.card_order.pop(card_id)]
+                del self.cards[card_id]
+                del self.card_entries[card_id]
+                self._summary = None
+        return {'card_id': card_id, 'deleted': removed,
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 3)}
+    
+    def card_snapshot(self, card_id: str) -> Optional[Dict]:
+        """Estado atual de um card no formato da exportação do Trello (None se não existe)"""
+        with self._lock:
+            card = self.cards.get(card_id)
+            if card is None:
+                return None
+            return {
+                'id': card.id,
+                'name': card.name,
+                'desc': card.desc,
+                'idList': card.list_id,
+                'labels': [{'name': label} for label in card.labels],
+                'due': card.due_date,
+                'idMembers': list(card.members or [])
+            }
+    
+    def register_list(self, list_id: str, name: str) -> None:
+        """Registra (ou renomeia) uma lista do board para os próximos cards"""
+        with self._lock:
+            self.system.lists[list_id] = name
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'cards': len(self.cards), 'prompts': len(self.prompt_entries),
+                    'correlations': self._totals['count']}
+    
+    def _register_card(self, card: SmartTrelloCard) -> None:
+        """Guarda o card; cards novos entram no fim da ordem de desempate"""
+        if card.id not in self.card_order:
+            self.card_order[card.id] = self._next_order
+            self.card_by_order[self._next_order] = card.id
+            self._next_order += 1
+        self.cards[card.id] = card
+    
+    def _add_entries(self, card_id: str, entries: List[Tuple]) -> None:
+        """Soma as correlações de um card às listas por prompt e aos totais do resumo"""
+        if not entries:
+            return
+        card = self.cards[card_id]
+        prompts = self.system.prompts
+        high_priority = total_milli = 0
+        for entry in entries:
+            score, _, neg_prompt_idx, scores = entry
+            prompt_idx = -neg_prompt_idx
+            milli = SummaryAccumulator.to_milli(score)
+            insort(self.prompt_entries[prompt_idx], entry)
+            self._prompt_counts[prompt_idx] += 1
+            self._prompt_milli[prompt_idx] += milli
+            total_milli += milli
+            priority = self.system._calculate_implementation_priority(scores[0], card, prompts[prompt_idx])
+            if priority in ('CRÍTICA', 'ALTA'):
+                high_priority += 1
+        roi = self.system._estimate_card_roi(card)
+        self.card_totals[card_id] = (roi, len(entries), high_priority, total_milli)
+        self._update_totals(roi, len(entries), high_priority, total_milli)
+    
+    def _remove_entries(self, card_id: str) -> None:
+        """Desfaz _add_entries para as correlações atuais do card"""
+        for entry in self.card_entries.get(card_id, ()):
+            prompt_idx = -entry[2]
+            prompt_entries = self.prompt_entries[prompt_idx]
+            del prompt_entries[bisect_left(prompt_entries, entry)]
+            self._prompt_counts[prompt_idx] -= 1
+            self._prompt_milli[prompt_idx] -= SummaryAccumulator.to_milli(entry[0])
+        totals = self.card_totals.pop(card_id, None)
+        if totals:
+            roi, found, high_priority, total_milli = totals
+            self._update_totals(roi, -found, -high_priority, -total_milli)
+        self.card_entries[card_id] = []
+    
+    def _update_totals(self, roi: str, found: int, high_priority: int, total_milli: int) -> None:
+        self._totals['count'] += found
+        self._totals['high_priority'] += high_priority
+        self._totals['total_milli'] += total_milli
+        if 'ALTO' in roi:
+            self._totals['high_roi'] += found
+        count = self._roi_counts.get(roi, 0) + found
+        if count:
+            self._roi_counts[roi] = count
+        else:
+            self._roi_counts.pop(roi, None)
+    
+    def _record(self, entry: Tuple) -> Dict:
+        """Registro completo (mesmo formato de detailed_correlations)"""
+        _, neg_order, neg_prompt_idx, scores = entry
+        return self.system._build_correlation_record(
+            self.cards[self.card_by_order[-neg_order]], self.system.prompts[-neg_prompt_idx], *scores
+        )
+    
+    def _build_summary(self) -> Dict:
+        """Monta o acumulador do resumo a partir dos totais mantidos em memória"""
+        accumulator = SummaryAccumulator(len(self.prompt_entries))
+        accumulator.count = self._totals['count']
+        accumulator.high_priority = self._totals['high_priority']
+        accumulator.total_milli = self._totals['total_milli']
+        accumulator.high_roi = self._totals['high_roi']
+        accumulator.roi_distribution = dict(self._roi_counts)
+        accumulator.prompt_counts = list(self._prompt_counts)
+        accumulator.prompt_milli = list(self._prompt_milli)
+        accumulator.prompt_best = [entries[-1][:2] if entries else (-1.0, 0) for entries in self.prompt_entries]
+        for card_id, (roi, _, _, _) in self.card_totals.items():
+            best = self.card_entries[card_id][0][:3]
+            if roi not in accumulator.roi_best or best > accumulator.roi_best[roi]:
+                accumulator.roi_best[roi] = best
+        top = heapq.nlargest(
+            SummaryAccumulator.TOP_CORRELATIONS,
+            (entry for entries in self.card_entries.values() for entry in entries[:SummaryAccumulator.TOP_CORRELATIONS])
+        )
+        accumulator.close(self.system.prompts, [self._record(entry) for entry in top])
+        
+        self.system.cards = list(self.cards.values())
+        self.system.summary_accumulator = accumulator
+        return self.system.generate_executive_summary()
+
+class CorrelationRequestHandler(BaseHTTPRequestHandler):
+    """Rotas HTTP do serviço (JSON)"""
+    
+    server_version = "ArteComercialCorrelation/1.0"
+    protocol_version = "HTTP/1.1"  # Conexões persistentes (toda resposta leva Content-Length)
+    
+    def setup(self):
+        super().setup()
+        # Cabeçalho e corpo saem em escritas separadas: sem TCP_NODELAY o Nagle segura a resposta
+        if isinstance(self.client_address, tuple):
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, True)
+    
+    def do_GET(self):
+        service: CorrelationService = self.server.service
+        parts, query = self._route()
+        try:
+            limit = int(query['limit'][0]) if 'limit' in query else None
+        except ValueError:
+            self._send(400, {'error': "limit deve ser inteiro"})
+            return
+        if parts == ['health']:
+            self._send(200, dict(service.stats(), status='ok'))
+        elif parts == ['summary']:
+            self._send(200, service.summary())
+        elif len(parts) == 3 and parts[0] == 'cards' and parts[2] == 'correlations':
+            self._send_found(service.card_correlations(parts[1], limit), f"Card {parts[1]} não encontrado")
+        elif len(parts) == 3 and parts[0] == 'prompts' and parts[2] == 'cards':
+            self._send_found(service.prompt_cards(parts[1], limit), f"Prompt {parts[1]} não encontrado")
+        else:
+            self._send(404, {'error': f"Rota desconhecida: {self.path}"})
+    
+    def do_PUT(self):
+        parts, _ = self._route()
+        if len(parts) != 2 or parts[0] != 'cards':
+            self._send(404, {'error': f"Rota desconhecida: {self.path}"})
+            return
+        try:
+            card_data = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            card_data['id'] = parts[1]
+            self._send(200, self.server.service.upsert_card(card_data))
+        except (ValueError, KeyError, TypeError) as e:
+            self._send(400, {'error': f"Card inválido: {e}"})
+    
+    def do_DELETE(self):
+        parts, _ = self._route()
+        if len(parts) != 2 or parts[0] != 'cards':
+            self._send(404, {'error': f"Rota desconhecida: {self.path}"})
+            return
+        result = self.server.service.delete_card(parts[1])
+        self._send(200 if result['deleted'] else 404, result)
+    
+    def _route(self) -> Tuple[List[str], Dict[str, List[str]]]:
+        url = urlsplit(self.path)
+        return [unquote(part) for part in url.path.split('/') if part], parse_qs(url.query)
+    
+    def _send_found(self, payload: Optional[List[Dict]], error: str) -> None:
+        if payload is None:
+            self._send(404, {'error': error})
+        else:
+            self._send(200, payload)
+    
+    def _send(self, status: int, payload) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def address_string(self) -> str:
+        # Conexões por socket Unix não têm (host, porta)
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+    
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Servidor HTTP num socket Unix (uma thread por conexão)"""
+    daemon_threads = True
+
+def create_server(service: CorrelationService, host: str = '127.0.0.1', port: int = 8765,
+                  unix_socket: Optional[str] = None) -> socketserver.BaseServer:
+    """Servidor HTTP local (TCP ou socket Unix) ligado ao serviço"""
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+        server = ThreadingUnixHTTPServer(unix_socket, CorrelationRequestHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), CorrelationRequestHandler)
+        server.daemon_threads = True
+    server.service = service
+    return server
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Serviço residente de correlação cards x prompts")
+    parser.add_argument('--trello', default='/home/ubuntu/upload/arte-comercial_Jason_Update.json',
+                        help="Exportação JSON do board do Trello")
+    parser.add_argument('--prompts-path', default=os.getenv('ARTE_COMERCIAL_PROMPTS_PATH'),
+                        help="Clone local com os prompts (sem ele, dados simulados)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix-socket', help="Atende num socket Unix em vez de TCP")
+    args = parser.parse_args()
+    
+    system = FinalIntegrationSystem(
+        trello_json_path=args.trello,
+        github_repo_url='https://github.com/pietrorampazzo/arte_comercial',
+        prompts_path=args.prompts_path
+    )
+    service = CorrelationService(system)
+    service.load()
+    
+    server = create_server(service, args.host, args.port, args.unix_socket)
+    logger.info(f"🛰️ Serviço de correlação em {args.unix_socket or f'http://{args.host}:{args.port}'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("🛑 Serviço encerrado")
+    finally:
+        server.server_close()
+        if args.unix_socket and os.path.exists(args.unix_socket):
+            os.unlink(args.unix_socket)
+
+if __name__ == "__main__":
+    main()
@@ -9,14 +9,40 @@ Autor: Manus AI - Versão Definitiva
 import json
 import requests
 import os
+import random
+import mmap
+import struct
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any, Tuple
 import logging
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, InitVar
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 import hashlib
+import heapq
+from itertools import chain
+from operator import itemgetter
 import re
+import sqlite3
+import subprocess
 import time
+import tracemalloc
+import unicodedata
+
+try:
+    # Dependências opcionais para o cálculo em lote (matrizes esparsas)
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = None
+    sparse = None
+
+try:
+    # Dependência opcional: autômato Aho–Corasick em C (pyahocorasick)
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # Configuração de logging
 logging.basicConfig(
@@ -29,6 +55,64 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class KeywordMatcher:
+    """Busca de várias palavras-chave numa única passada, ignorando acentos
+    
+    Palavras e textos são comparados em minúsculas e sem acentos ('integracao'
+    casa com 'integração'). Com pyahocorasick o texto é varrido uma vez por um
+    autômato Aho–Corasick; sem ele, cada palavra é procurada com `in` no texto
+    já normalizado. `find` devolve as palavras originais do vocabulário
+    presentes no texto, e todos os scores de palavras-chave consultam esse
+    conjunto em vez de varrer o texto de novo.
+    """
+    
+    def __init__(self, keywords: List[str]):
+        # Palavra normalizada -> palavras originais (ex.: 'diário' e 'diario')
+        self.variants: Dict[str, Tuple[str, ...]] = {}
+        for keyword in dict.fromkeys(keywords):
+            folded = self.fold(keyword)
+            self.variants[folded] = self.variants.get(folded, ()) + (keyword,)
+        
+        self.automaton = None
+        if ahocorasick is not None and self.variants:
+            self.automaton = ahocorasick.Automaton()
+            for folded in self.variants:
+                self.automaton.add_word(folded, folded)
+            self.automaton.make_automaton()
+    
+    @staticmethod
+    def fold(text: str) -> str:
+        """Minúsculas sem acentos (decomposição NFKD, marcas descartadas)"""
+        text = text.lower()
+        if text.isascii():
+            return text
+        return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    
+    def find(self, text: str) -> frozenset:
+        """Palavras do vocabulário presentes no texto"""
+        folded = self.fold(text)
+        if self.automaton is not None:
+            found = set(map(itemgetter(1), self.automaton.iter(folded)))
+        else:
+            found = {folded_keyword for folded_keyword in self.variants if folded_keyword in folded}
+        return frozenset(chain.from_iterable(map(self.variants.__getitem__, found)))
+
+_KEYWORD_MATCHER: Optional[KeywordMatcher] = None
+
+def keyword_matcher() -> KeywordMatcher:
+    """Matcher único com todos os vocabulários de scores (compilado uma vez)"""
+    global _KEYWORD_MATCHER
+    if _KEYWORD_MATCHER is None:
+        vocabulary = (
+            SmartTrelloCard.HIGH_PRIORITY_LABELS + SmartTrelloCard.AUTOMATION_KEYWORDS
+            + SmartTrelloCard.REPETITIVE_PATTERNS + SmartTrelloCard.HIGH_VALUE_KEYWORDS
+            + SmartGitHubPrompt.API_KEYWORDS
+            + [k for keywords in SmartGitHubPrompt.TAG_PATTERNS.values() for k in keywords]
+            + [k for keywords in FinalIntegrationSystem.TAG_COMPATIBILITY.values() for k in keywords]
+        )
+        _KEYWORD_MATCHER = KeywordMatcher(vocabulary)
+    return _KEYWORD_MATCHER
+
 @dataclass
 class SmartTrelloCard:
     """Card do Trello com análise inteligente"""
@@ -44,42 +128,64 @@ class SmartTrelloCard:
     automation_potential: float = 0.0
     business_value: float = 0.0
     
+    # Vocabulários das métricas (compartilhados com o cálculo vetorizado do CardTable)
+    HIGH_PRIORITY_LABELS = ['urgent', 'importante', 'crítico', 'priority', 'alta']
+    AUTOMATION_KEYWORDS = [
+        'api', 'integração', 'automação', 'script', 'bot', 'webhook',
+        'sync', 'import', 'export', 'process', 'generate', 'update',
+        'automatizar', 'conectar', 'sincronizar', 'processar'
+    ]
+    REPETITIVE_PATTERNS = ['daily', 'weekly', 'monthly', 'regular', 'routine', 'diário', 'semanal', 'mensal']
+    HIGH_VALUE_KEYWORDS = [
+        'receita', 'vendas', 'cliente', 'produtividade', 'eficiência',
+        'revenue', 'sales', 'customer', 'productivity', 'efficiency',
+        'roi', 'lucro', 'economia', 'otimização'
+    ]
+    
     def calculate_metrics(self) -> None:
         """Calcula todas as métricas do card"""
+        self._keyword_hits = None  # Nome/descrição podem ter mudado: nova varredura
         self.priority_score = self._calculate_priority()
         self.automation_potential = self._calculate_automation_potential()
         self.business_value = self._calculate_business_value()
     
+    @staticmethod
+    def _parse_due_date(due_date: str) -> Optional[datetime]:
+        """Converte a data de vencimento; None se inválida ou sem fuso horário"""
+        try:
+            # Tratar diferentes formatos de data
+            if 'T' in due_date:
+                due = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
+            else:
+                due = datetime.strptime(due_date, '%Y-%m-%d')
+                due = due.replace(tzinfo=timezone.utc)
+        except:
+            return None  # Ignorar erros de data
+        
+        # Datas sem fuso não podem ser comparadas com o horário UTC atual
+        return due if due.utcoffset() is not None else None
+    
     def _calculate_priority(self) -> float:
         """Calcula prioridade baseada em múltiplos fatores"""
         score = 0.0
         
         # Urgência baseada em data de vencimento
-        if self.due_date:
-            try:
-                # Tratar diferentes formatos de data
-                if 'T' in self.due_date:
-                    due = datetime.fromisoformat(self.due_date.replace('Z', '+00:00'))
-                else:
-                    due = datetime.strptime(self.due_date, '%Y-%m-%d')
-                    due = due.replace(tzinfo=timezone.utc)
-                
-                now = datetime.now(timezone.utc)
-                days_until_due = (due - now).days
-                
-                if days_until_due <= 1:
-                    score += 10.0
-                elif days_until_due <= 7:
-                    score += 5.0
-                elif days_until_due <= 30:
-                    score += 2.0
-            except:
-                pass  # Ignorar erros de data
+        due = self._parse_due_date(self.due_date) if self.due_date else None
+        if due is not None:
+            now = datetime.now(timezone.utc)
+            days_until_due = (due - now).days
+            
+            if days_until_due <= 1:
+                score += 10.0
+            elif days_until_due <= 7:
+                score += 5.0
+            elif days_until_due <= 30:
+                score += 2.0
         
         # Importância baseada em labels
-        high_priority_labels = ['urgent', 'importante', 'crítico', 'priority', 'alta']
         for label in self.labels:
-            if any(keyword in label.lower() for keyword in high_priority_labels):
+            label_hits = keyword_matcher().find(label)
+            if any(keyword in label_hits for keyword in self.HIGH_PRIORITY_LABELS):
                 score += 3.0
         
         # Complexidade baseada na descrição
@@ -90,51 +196,153 @@ class SmartTrelloCard:
         
         return min(score, 10.0)
     
+    def keyword_hits(self) -> frozenset:
+        """Palavras do vocabulário presentes no nome/descrição (uma varredura por card)"""
+        hits = getattr(self, '_keyword_hits', None)
+        if hits is None:
+            hits = self._keyword_hits = keyword_matcher().find(self.name + " " + self.desc)
+        return hits
+    
     def _calculate_automation_potential(self) -> float:
         """Calcula potencial de automação"""
         score = 0.0
-        text = (self.name + " " + self.desc).lower()
+        hits = self.keyword_hits()
         
         # Palavras-chave de automação
-        automation_keywords = [
-            'api', 'integração', 'automação', 'script', 'bot', 'webhook',
-            'sync', 'import', 'export', 'process', 'generate', 'update',
-            'automatizar', 'conectar', 'sincronizar', 'processar'
-        ]
-        
-        for keyword in automation_keywords:
-            if keyword in text:
-                score += 1.5
+        score += len(hits.intersection(self.AUTOMATION_KEYWORDS)) * 1.5
         
         # Padrões repetitivos
-        repetitive_patterns = ['daily', 'weekly', 'monthly', 'regular', 'routine', 'diário', 'semanal', 'mensal']
-        for pattern in repetitive_patterns:
-            if pattern in text:
-                score += 2.0
+        score += len(hits.intersection(self.REPETITIVE_PATTERNS)) * 2.0
         
         return min(score, 10.0)
     
     def _calculate_business_value(self) -> float:
         """Calcula valor de negócio"""
         score = 0.0
-        text = (self.name + " " + self.desc).lower()
         
         # Palavras-chave de alto valor
-        high_value_keywords = [
-            'receita', 'vendas', 'cliente', 'produtividade', 'eficiência',
-            'revenue', 'sales', 'customer', 'productivity', 'efficiency',
-            'roi', 'lucro', 'economia', 'otimização'
-        ]
-        
-        for keyword in high_value_keywords:
-            if keyword in text:
-                score += 2.0
+        score += len(self.keyword_hits().intersection(self.HIGH_VALUE_KEYWORDS)) * 2.0
         
         # Bonus por prioridade
         score += self.priority_score * 0.3
         
         return min(score, 10.0)
 
+class CardTable:
+    """Armazenamento colunar dos cards para cálculo vetorizado das métricas
+    
+    Ids, acertos de palavras-chave, vencimentos e labels ficam em colunas; nomes
+    de listas e labels são internados (flyweight), então cada label distinta é
+    avaliada uma vez.
+    `calculate_metrics` reproduz `SmartTrelloCard.calculate_metrics` para todos
+    os cards de uma vez (faixas de vencimento em NumPy e os acertos de
+    palavras-chave do `KeywordMatcher`, uma varredura por card).
+    """
+    
+    __slots__ = ('ids', 'keyword_hits', 'desc_lengths', 'due_micros', 'labels', 'list_names',
+                 'priority_scores', 'automation_potentials', 'business_values', '_strings', '_due_cache')
+    
+    _EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    _DAY_MICROS = 86_400_000_000
+    
+    def __init__(self):
+        self.ids: List[str] = []
+        self.keyword_hits: List[frozenset] = []
+        self.desc_lengths: List[int] = []
+        self.due_micros: List[Optional[int]] = []
+        self.labels: List[Tuple[str, ...]] = []
+        self.list_names: List[str] = []
+        self.priority_scores = None
+        self.automation_potentials = None
+        self.business_values = None
+        self._strings: Dict[str, str] = {}
+        self._due_cache: Dict[str, Optional[int]] = {}
+    
+    def _intern(self, value: str) -> str:
+        return self._strings.setdefault(value, value)
+    
+    @classmethod
+    def from_cards(cls, cards: List[SmartTrelloCard]) -> 'CardTable':
+        table = cls()
+        for card in cards:
+            table.append(card)
+        return table
+    
+    def append(self, card: SmartTrelloCard) -> None:
+        """Adiciona as colunas de um card"""
+        self.ids.append(card.id)
+        self.keyword_hits.append(card.keyword_hits())
+        self.desc_lengths.append(len(card.desc))
+        self.due_micros.append(self._due_to_micros(card.due_date) if card.due_date else None)
+        self.labels.append(tuple(self._intern(label) for label in card.labels))
+        self.list_names.append(self._intern(card.list_name))
+    
+    def _due_to_micros(self, due_date: str) -> Optional[int]:
+        """Vencimento em microssegundos desde a época (cada data distinta é lida uma vez)"""
+        if due_date not in self._due_cache:
+            due = SmartTrelloCard._parse_due_date(due_date)
+            self._due_cache[due_date] = None if due is None else (due - self._EPOCH) // timedelta(microseconds=1)
+        return self._due_cache[due_date]
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def calculate_metrics(self, now: Optional[datetime] = None) -> None:
+        """Calcula prioridade, potencial de automação e valor de negócio de todos os cards"""
+        now = now or datetime.now(timezone.utc)
+        
+        # Urgência: dias até o vencimento (mesmo arredondamento de timedelta.days)
+        has_due = np.array([due is not None for due in self.due_micros], dtype=bool)
+        due_micros = np.array([due or 0 for due in self.due_micros], dtype=np.int64)
+        now_micros = (now - self._EPOCH) // timedelta(microseconds=1)
+        days_until_due = (due_micros - now_micros) // self._DAY_MICROS
+        priority = np.select(
+            [has_due & (days_until_due <= 1), has_due & (days_until_due <= 7), has_due & (days_until_due <= 30)],
+            [10.0, 5.0, 2.0],
+            default=0.0
+        )
+        
+        # Labels: cada label distinta é avaliada uma única vez
+        matcher = keyword_matcher()
+        priority_labels = frozenset(SmartTrelloCard.HIGH_PRIORITY_LABELS)
+        label_scores = {
+            label: 3.0 if matcher.find(label) & priority_labels else 0.0
+            for label in self._strings
+        }
+        priority += np.array([sum(label_scores[label] for label in labels) for labels in self.labels],
+                             dtype=np.float64)
+        
+        desc_lengths = np.array(self.desc_lengths, dtype=np.int64)
+        priority += np.where(desc_lengths > 200, 2.0, np.where(desc_lengths > 100, 1.0, 0.0))
+        priority = np.minimum(priority, 10.0)
+        
+        # Palavras-chave: conjuntos de acertos da varredura única de cada card
+        # (pesos inteiros/meios somados, portanto iguais ao laço por card)
+        def keyword_scores(keywords: List[str], weight: float):
+            vocabulary = frozenset(keywords)
+            return np.array([len(hits & vocabulary) for hits in self.keyword_hits], dtype=np.float64) * weight
+        
+        automation = np.minimum(
+            keyword_scores(SmartTrelloCard.AUTOMATION_KEYWORDS, 1.5)
+            + keyword_scores(SmartTrelloCard.REPETITIVE_PATTERNS, 2.0),
+            10.0
+        )
+        business = np.minimum(keyword_scores(SmartTrelloCard.HIGH_VALUE_KEYWORDS, 2.0) + priority * 0.3, 10.0)
+        
+        self.priority_scores = priority
+        self.automation_potentials = automation
+        self.business_values = business
+    
+    def apply_to(self, cards: List[SmartTrelloCard]) -> None:
+        """Copia as métricas calculadas de volta para os objetos de card"""
+        for card, priority, automation, business in zip(
+            cards, self.priority_scores.tolist(), self.automation_potentials.tolist(),
+            self.business_values.tolist()
+        ):
+            card.priority_score = priority
+            card.automation_potential = automation
+            card.business_value = business
+
 @dataclass
 class SmartGitHubPrompt:
     """Prompt do GitHub com análise inteligente"""
@@ -145,14 +353,31 @@ class SmartGitHubPrompt:
     complexity_score: float = 0.0
     automation_tags: List[str] = None
     implementation_effort: str = "BAIXO"
-    
-    def __post_init__(self):
+    # True = complexidade, tags e esforço vêm do cache (SHA do blob inalterado)
+    cached_analysis: InitVar[bool] = False
+    
+    # Vocabulários da análise (compartilhados com o KeywordMatcher)
+    API_KEYWORDS = ['requests', 'api', 'http', 'json', 'oauth', 'token']
+    TAG_PATTERNS = {
+        'API_INTEGRATION': ['requests', 'api', 'http', 'rest'],
+        'DATA_PROCESSING': ['pandas', 'numpy', 'data', 'csv', 'json'],
+        'AI_INTEGRATION': ['openai', 'gpt', 'ai', 'machine learning'],
+        'TRELLO_AUTOMATION': ['trello', 'card', 'board', 'list'],
+        'GOVERNMENT_APIS': ['government', 'gov', 'receita', 'ibge'],
+        'WEBHOOK_HANDLER': ['webhook', 'event', 'trigger', 'callback'],
+        'ASYNC_PROCESSING': ['async', 'await', 'asyncio', 'aiohttp']
+    }
+    
+    def __post_init__(self, cached_analysis: bool):
         if self.automation_tags is None:
             self.automation_tags = []
-        self.analyze_prompt()
+        if not cached_analysis:
+            self.analyze_prompt()
     
     def analyze_prompt(self) -> None:
         """Analisa o prompt/código"""
+        # Uma varredura do conteúdo serve à complexidade e às tags
+        self._keyword_hits = keyword_matcher().find(self.content)
         self.complexity_score = self._calculate_complexity()
         self.automation_tags = self._extract_automation_tags()
         self.implementation_effort = self._estimate_effort()
@@ -174,8 +399,7 @@ class SmartGitHubPrompt:
         score += function_count * 1.0
         
         # APIs e integrações
-        api_keywords = ['requests', 'api', 'http', 'json', 'oauth', 'token']
-        api_score = sum(1 for keyword in api_keywords if keyword in self.content.lower())
+        api_score = sum(1 for keyword in self.API_KEYWORDS if keyword in self._keyword_hits)
         score += api_score * 1.5
         
         return min(score, 20.0)
@@ -183,20 +407,9 @@ class SmartGitHubPrompt:
     def _extract_automation_tags(self) -> List[str]:
         """Extrai tags de automação"""
         tags = []
-        content_lower = self.content.lower()
-        
-        tag_patterns = {
-            'API_INTEGRATION': ['requests', 'api', 'http', 'rest'],
-            'DATA_PROCESSING': ['pandas', 'numpy', 'data', 'csv', 'json'],
-            'AI_INTEGRATION': ['openai', 'gpt', 'ai', 'machine learning'],
-            'TRELLO_AUTOMATION': ['trello', 'card', 'board', 'list'],
-            'GOVERNMENT_APIS': ['government', 'gov', 'receita', 'ibge'],
-            'WEBHOOK_HANDLER': ['webhook', 'event', 'trigger', 'callback'],
-            'ASYNC_PROCESSING': ['async', 'await', 'asyncio', 'aiohttp']
-        }
         
-        for tag, keywords in tag_patterns.items():
-            if any(keyword in content_lower for keyword in keywords):
+        for tag, keywords in self.TAG_PATTERNS.items():
+            if any(keyword in self._keyword_hits for keyword in keywords):
                 tags.append(tag)
         
         return tags
@@ -210,54 +423,1168 @@ class SmartGitHubPrompt:
         else:
             return "BAIXO"
 
+class MinHashLSH:
+    """Candidatos de similaridade por MinHash com LSH em bandas
+    
+    Cada conjunto de palavras-chave vira uma assinatura de `permutations`
+    mínimos de hashes (h(x) = (a·x + b) mod p). A assinatura é cortada em
+    `bands` faixas de `permutations // bands` linhas. Card e prompt viram
+    candidatos quando alguma faixa é idêntica, o que ocorre com probabilidade
+    1 - (1 - s^linhas)^bandas para um par com Jaccard s. Mais bandas (menos
+    linhas) aumentam o recall; menos bandas aumentam a precisão. Os candidatos
+    são pontuados depois com o Jaccard exato.
+    """
+    
+    # Primo de Mersenne 2^61 - 1; a·x + b cabe em 64 bits com a, b, x < 2^32
+    MERSENNE_PRIME = (1 << 61) - 1
+    # Conjuntos processados por bloco no cálculo vetorizado das assinaturas
+    SIGNATURE_CHUNK = 4096
+    # Tamanho (em pares card×prompt) do mapa de bits usado para deduplicar candidatos
+    PAIR_BITMAP_SIZE = 1 << 22
+    
+    def __init__(self, permutations: int = 128, bands: int = 64, seed: int = 1):
+        self.bands = max(1, min(bands, permutations))
+        self.rows = max(1, permutations // self.bands)
+        self.permutations = self.bands * self.rows
+        rng = random.Random(seed)
+        self.coefficients = [(rng.randrange(1, 1 << 32), rng.randrange(0, 1 << 32))
+                             for _ in range(self.permutations)]
+        # Multiplicadores que combinam as linhas de uma faixa numa chave de 64 bits
+        self.band_multipliers = [rng.randrange(1, 1 << 64) | 1 for _ in range(self.rows)]
+    
+    @staticmethod
+    def _token_hash(token: str) -> int:
+        """Hash estável (independente de PYTHONHASHSEED) de 32 bits"""
+        return int.from_bytes(hashlib.blake2b(token.encode('utf-8'), digest_size=4).digest(), 'little')
+    
+    def candidates(self, card_keywords: List[set], prompt_keywords: List[set]) -> List[set]:
+        """Prompts candidatos de cada card (colisão em pelo menos uma faixa)"""
+        vocabulary: Dict[str, int] = {}
+        card_ids = [[vocabulary.setdefault(k, len(vocabulary)) for k in keywords] for keywords in card_keywords]
+        prompt_ids = [[vocabulary.setdefault(k, len(vocabulary)) for k in keywords] for keywords in prompt_keywords]
+        token_hashes = [self._token_hash(token) for token in vocabulary]
+        
+        if np is None:
+            return self._candidates_python(card_ids, prompt_ids, token_hashes)
+        
+        card_keys = self._band_keys(card_ids, np.asarray(token_hashes, dtype=np.uint64))
+        prompt_keys = self._band_keys(prompt_ids, np.asarray(token_hashes, dtype=np.uint64))
+        card_valid = np.array([bool(ids) for ids in card_ids], dtype=bool)
+        prompt_valid = np.flatnonzero([bool(ids) for ids in prompt_ids])
+        
+        # Faixas dos prompts ordenadas uma vez; a junção com os cards é por busca binária
+        band_orders = []
+        for band in range(self.bands):
+            keys = prompt_keys[prompt_valid, band]
+            order = np.argsort(keys, kind='stable')
+            band_orders.append((keys[order], prompt_valid[order]))
+        
+        # Cards em blocos: um mapa de bits bloco×prompts elimina os pares repetidos entre faixas
+        candidates: List[set] = [set() for _ in card_ids]
+        prompt_count = len(prompt_ids)
+        block_size = max(1, self.PAIR_BITMAP_SIZE // max(prompt_count, 1))
+        for block_start in range(0, len(card_ids), block_size):
+            block_keys = card_keys[block_start:block_start + block_size]
+            block_valid = card_valid[block_start:block_start + block_size]
+            seen = np.zeros(len(block_keys) * prompt_count, dtype=bool)
+            for band, (sorted_keys, sorted_prompts) in enumerate(band_orders):
+                left = np.searchsorted(sorted_keys, block_keys[:, band], side='left')
+                counts = np.searchsorted(sorted_keys, block_keys[:, band], side='right') - left
+                counts[~block_valid] = 0
+                total = int(counts.sum())
+                if not total:
+                    continue
+                starts = np.repeat(left - np.cumsum(counts) + counts, counts)
+                matched = sorted_prompts[starts + np.arange(total)]
+                seen[np.repeat(np.arange(len(block_keys)) * prompt_count, counts) + matched] = True
+            
+            codes = np.flatnonzero(seen)
+            card_of_pair, prompt_of_pair = np.divmod(codes, prompt_count)
+            bounds = np.searchsorted(card_of_pair, np.arange(len(block_keys) + 1)).tolist()
+            prompt_list = prompt_of_pair.tolist()
+            for offset in range(len(block_keys)):
+                if bounds[offset] != bounds[offset + 1]:
+                    candidates[block_start + offset] = set(prompt_list[bounds[offset]:bounds[offset + 1]])
+        return candidates
+    
+    def _band_keys(self, id_lists: List[List[int]], token_hashes):
+        """Assinaturas MinHash (em blocos) reduzidas a uma chave uint64 por faixa"""
+        a = np.array([a for a, _ in self.coefficients], dtype=np.uint64)
+        b = np.array([b for _, b in self.coefficients], dtype=np.uint64)
+        multipliers = np.array(self.band_multipliers, dtype=np.uint64)
+        keys = np.zeros((len(id_lists), self.bands), dtype=np.uint64)
+        
+        for start in range(0, len(id_lists), self.SIGNATURE_CHUNK):
+            chunk = id_lists[start:start + self.SIGNATURE_CHUNK]
+            filled = [i for i, ids in enumerate(chunk) if ids]
+            if not filled:
+                continue
+            lengths = [len(chunk[i]) for i in filled]
+            tokens = token_hashes[np.fromiter(chain.from_iterable(chunk[i] for i in filled),
+                                              dtype=np.int64, count=sum(lengths))]
+            hashes = (np.outer(tokens, a) + b) % np.uint64(self.MERSENNE_PRIME)
+            offsets = np.zeros(len(filled), dtype=np.int64)
+            offsets[1:] = np.cumsum(lengths)[:-1]
+            signatures = np.minimum.reduceat(hashes, offsets, axis=0)
+            # Combinação linear com overflow em 64 bits: faixas iguais -> chaves iguais
+            banded = signatures.reshape(len(filled), self.bands, self.rows)
+            keys[start + np.asarray(filled)] = (banded * multipliers).sum(axis=2, dtype=np.uint64)
+        return keys
+    
+    def _candidates_python(self, card_ids: List[List[int]], prompt_ids: List[List[int]],
+                           token_hashes: List[int]) -> List[set]:
+        """Mesmo cálculo sem NumPy (assinaturas por zip/min e buckets em dicionários)"""
+        token_signatures = [
+            [(a * token + b) % self.MERSENNE_PRIME for a, b in self.coefficients] for token in token_hashes
+        ]
+        
+        def band_keys(ids: List[int]) -> List[Tuple]:
+            signature = list(map(min, zip(*(token_signatures[i] for i in ids))))
+            return [(band, tuple(signature[band * self.rows:(band + 1) * self.rows])) for band in range(self.bands)]
+        
+        buckets: Dict[Tuple, List[int]] = {}
+        for prompt_idx, ids in enumerate(prompt_ids):
+            if ids:
+                for key in band_keys(ids):
+                    buckets.setdefault(key, []).append(prompt_idx)
+        
+        candidates = []
+        for ids in card_ids:
+            card_candidates = set()
+            if ids:
+                for key in band_keys(ids):
+                    card_candidates.update(buckets.get(key, ()))
+            candidates.append(card_candidates)
+        return candidates
+
+class AnalysisStore:
+    """Armazenamento SQLite persistente para reanálise incremental
+    
+    Guarda palavras-chave e tags de cada card/prompt e os scores par a par,
+    todos indexados pelo hash do conteúdo. Prioridade e valor de negócio não
+    são armazenados porque dependem da data atual (vencimentos).
+    """
+    
+    # Limite conservador de parâmetros por consulta no SQLite
+    QUERY_CHUNK = 500
+    # Versão do cálculo armazenado; bancos de versões anteriores são descartados
+    SCHEMA_VERSION = 2
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            self.connection.executescript(f"""
+                DROP TABLE IF EXISTS cards;
+                DROP TABLE IF EXISTS prompts;
+                DROP TABLE IF EXISTS prompt_sets;
+                DROP TABLE IF EXISTS pair_scores;
+                PRAGMA user_version = {self.SCHEMA_VERSION};
+            """)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS cards (
+                card_hash TEXT PRIMARY KEY,
+                keywords TEXT NOT NULL,
+                tag_matches TEXT NOT NULL,
+                prompt_set TEXT
+            );
+            CREATE TABLE IF NOT EXISTS prompts (
+                prompt_hash TEXT PRIMARY KEY,
+                keywords TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS prompt_sets (
+                fingerprint TEXT PRIMARY KEY,
+                prompt_hashes TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pair_scores (
+                card_hash TEXT NOT NULL,
+                prompt_hash TEXT NOT NULL,
+                semantic_score REAL,
+                automation_score REAL NOT NULL,
+                PRIMARY KEY (card_hash, prompt_hash)
+            );
+            CREATE TABLE IF NOT EXISTS prompt_analysis (
+                blob_sha TEXT PRIMARY KEY,
+                complexity_score REAL NOT NULL,
+                automation_tags TEXT NOT NULL,
+                implementation_effort TEXT NOT NULL
+            );
+        """)
+    
+    def _select_in(self, query: str, keys: List[str]) -> List[Tuple]:
+        """Executa SELECT ... IN (...) em blocos"""
+        rows = []
+        for start in range(0, len(keys), self.QUERY_CHUNK):
+            chunk = keys[start:start + self.QUERY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows.extend(self.connection.execute(query.format(placeholders), chunk).fetchall())
+        return rows
+    
+    def load_cards(self, card_hashes: List[str]) -> Dict[str, Dict]:
+        """Carrega métricas de palavras-chave dos cards conhecidos"""
+        rows = self._select_in(
+            "SELECT card_hash, keywords, tag_matches, prompt_set FROM cards WHERE card_hash IN ({})",
+            list(set(card_hashes))
+        )
+        return {
+            card_hash: {
+                'keywords': set(json.loads(keywords)),
+                'tag_matches': json.loads(tag_matches),
+                'prompt_set': prompt_set
+            }
+            for card_hash, keywords, tag_matches, prompt_set in rows
+        }
+    
+    def load_prompts(self, prompt_hashes: List[str]) -> Dict[str, set]:
+        """Carrega palavras-chave dos prompts conhecidos"""
+        rows = self._select_in(
+            "SELECT prompt_hash, keywords FROM prompts WHERE prompt_hash IN ({})",
+            list(set(prompt_hashes))
+        )
+        return {prompt_hash: set(json.loads(keywords)) for prompt_hash, keywords in rows}
+    
+    def load_prompt_sets(self, fingerprints: List[str]) -> Dict[str, set]:
+        """Carrega os conjuntos de prompts contra os quais os cards já foram pontuados"""
+        rows = self._select_in(
+            "SELECT fingerprint, prompt_hashes FROM prompt_sets WHERE fingerprint IN ({})",
+            list(set(fingerprints))
+        )
+        return {fingerprint: set(json.loads(hashes)) for fingerprint, hashes in rows}
+    
+    def load_pair_scores(self, card_hashes: List[str]) -> Dict[str, Dict[str, Tuple]]:
+        """Carrega scores (semântico, automação) já calculados, por card"""
+        rows = self._select_in(
+            "SELECT card_hash, prompt_hash, semantic_score, automation_score FROM pair_scores "
+            "WHERE card_hash IN ({})",
+            list(set(card_hashes))
+        )
+        pairs: Dict[str, Dict[str, Tuple]] = {}
+        for card_hash, prompt_hash, semantic_score, automation_score in rows:
+            pairs.setdefault(card_hash, {})[prompt_hash] = (semantic_score, automation_score)
+        return pairs
+    
+    def save(self, cards: List[Tuple], prompts: List[Tuple], prompt_set: Tuple[str, List[str]],
+             pair_scores: List[Tuple]) -> None:
+        """Grava o resultado mesclado de uma execução"""
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO prompt_sets (fingerprint, prompt_hashes) VALUES (?, ?)",
+                (prompt_set[0], json.dumps(sorted(prompt_set[1])))
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO cards (card_hash, keywords, tag_matches, prompt_set) VALUES (?, ?, ?, ?)",
+                cards
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO prompts (prompt_hash, keywords) VALUES (?, ?)",
+                prompts
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO pair_scores (card_hash, prompt_hash, semantic_score, automation_score) "
+                "VALUES (?, ?, ?, ?)",
+                pair_scores
+            )
+    
+    def load_prompt_analysis(self, blob_shas: List[str]) -> Dict[str, Tuple[float, List[str], str]]:
+        """Carrega a análise de arquivos de prompt já vistos, pelo SHA do blob git"""
+        rows = self._select_in(
+            "SELECT blob_sha, complexity_score, automation_tags, implementation_effort FROM prompt_analysis "
+            "WHERE blob_sha IN ({})",
+            list(set(blob_shas))
+        )
+        return {
+            blob_sha: (complexity_score, json.loads(automation_tags), implementation_effort)
+            for blob_sha, complexity_score, automation_tags, implementation_effort in rows
+        }
+    
+    def save_prompt_analysis(self, rows: List[Tuple]) -> None:
+        """Grava a análise de arquivos de prompt novos ou alterados"""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO prompt_analysis "
+                "(blob_sha, complexity_score, automation_tags, implementation_effort) VALUES (?, ?, ?, ?)",
+                rows
+            )
+    
+    def close(self) -> None:
+        self.connection.close()
+
+class TrelloExportStream:
+    """Leitor incremental de exportações JSON do Trello
+    
+    Percorre o objeto raiz em blocos e decodifica, um a um, apenas os elementos
+    das seções pedidas (ex.: `lists` e `cards`). As demais seções (actions,
+    checklists, ...) são descartadas à medida que são lidas, então a memória
+    fica limitada ao bloco de leitura mais o maior elemento individual.
+    """
+    
+    CHUNK_SIZE = 1 << 20
+    _STRUCTURAL = re.compile(r'["\[\]{}]')
+    _STRING_END = re.compile(r'["\\]')
+    _SCALAR_END = re.compile(r'[,}\]\s]')
+    _WHITESPACE = re.compile(r'\s*')
+    
+    def __init__(self, path: str, chunk_size: int = CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._file = None
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+    
+    def iter_sections(self, sections: Tuple[str, ...]):
+        """Gera (seção, elemento) para cada item das listas de primeiro nível pedidas"""
+        with open(self.path, 'r', encoding='utf-8') as self._file:
+            self._buffer, self._pos, self._eof = '', 0, False
+            self._expect('{')
+            if self._peek() == '}':
+                return
+            while True:
+                key = self._decode()
+                self._expect(':')
+                if self._peek() == '[':
+                    # Listas são lidas item a item; as não pedidas são descartadas
+                    # elemento por elemento (decodificador em C, memória limitada)
+                    self._expect('[')
+                    if self._peek() == ']':
+                        self._pos += 1
+                    else:
+                        while True:
+                            item = self._decode()
+                            if key in sections:
+                                yield key, item
+                            if self._next_delimiter(',]') == ']':
+                                break
+                else:
+                    self._skip_value()
+                if self._next_delimiter(',}') == '}':
+                    return
+    
+    def _fill(self) -> bool:
+        """Descarta o trecho já consumido e lê o próximo bloco"""
+        if self._eof:
+            return False
+        self._buffer = self._buffer[self._pos:]
+        self._pos = 0
+        chunk = self._file.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer += chunk
+        return True
+    
+    def _peek(self) -> str:
+        while True:
+            self._pos = self._WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ValueError("Fim inesperado da exportação do Trello")
+    
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise ValueError(f"JSON inválido: esperado '{char}' na posição {self._pos}")
+        self._pos += 1
+    
+    def _next_delimiter(self, options: str) -> str:
+        char = self._peek()
+        if char not in options:
+            raise ValueError(f"JSON inválido: esperado um de '{options}' na posição {self._pos}")
+        self._pos += 1
+        return char
+    
+    def _decode(self) -> Any:
+        """Decodifica o próximo valor completo, lendo mais blocos se necessário"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # Um número pode ter sido cortado no fim do bloco
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+    
+    def _skip_value(self) -> None:
+        """Avança sobre um valor sem construí-lo"""
+        char = self._peek()
+        if char not in '[{"':
+            while True:
+                match = self._SCALAR_END.search(self._buffer, self._pos)
+                if match:
+                    self._pos = match.start()
+                    return
+                self._pos = len(self._buffer)
+                if not self._fill():
+                    return
+        
+        depth = 0
+        in_string = False
+        while True:
+            pattern = self._STRING_END if in_string else self._STRUCTURAL
+            match = pattern.search(self._buffer, self._pos)
+            if not match:
+                self._pos = len(self._buffer)
+                if not self._fill():
+                    raise ValueError("Fim inesperado da exportação do Trello")
+                continue
+            token = match.group()
+            self._pos = match.end()
+            if in_string:
+                if token == '\\':
+                    # Escape: garantir o caractere seguinte no buffer e pulá-lo
+                    if self._pos >= len(self._buffer) and not self._fill():
+                        raise ValueError("Fim inesperado da exportação do Trello")
+                    self._pos += 1
+                    continue
+                in_string = False
+                if depth == 0:
+                    return
+            elif token == '"':
+                in_string = True
+            elif token in '[{':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+class TrelloExportCache:
+    """Cache binário (sidecar) com os campos já extraídos de uma exportação do Trello
+    
+    O arquivo `<exportação>.cards.bin` guarda apenas listas e cards abertos:
+    cabeçalho com a chave da exportação (tamanho, mtime e hash amostrado),
+    tabelas de referências (offset, tamanho) de largura fixa, um bloco único
+    de texto UTF-8 e um documento JSON compacto com labels/membros. A leitura
+    usa mmap, decodifica o bloco de texto uma vez e fatia os campos.
+    """
+    
+    MAGIC = b'ATEC'
+    VERSION = 1
+    HASH_SAMPLE = 1 << 20
+    NULL = 0xFFFFFFFF
+    _HEADER = struct.Struct('<4sHI')
+    _SECTIONS = struct.Struct('<IIII')
+    _LIST_ROW = struct.Struct('<4I')
+    _CARD_ROW = struct.Struct('<10I')
+    
+    def __init__(self, export_path: str):
+        self.export_path = export_path
+        self.cache_path = export_path + '.cards.bin'
+    
+    def export_key(self) -> Dict[str, Any]:
+        """Chave da exportação: tamanho + mtime + SHA-1 do início e do fim do arquivo"""
+        stat = os.stat(self.export_path)
+        digest = hashlib.sha1()
+        with open(self.export_path, 'rb') as f:
+            digest.update(f.read(self.HASH_SAMPLE))
+            if stat.st_size > self.HASH_SAMPLE:
+                f.seek(max(self.HASH_SAMPLE, stat.st_size - self.HASH_SAMPLE))
+                digest.update(f.read())
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha1': digest.hexdigest()}
+    
+    def write(self, lists: Dict[str, str], cards: List[SmartTrelloCard]) -> None:
+        """Grava o sidecar de forma atômica"""
+        parts: List[str] = []
+        size = 0
+        
+        def ref(value: Optional[str]) -> Tuple[int, int]:
+            # Offsets em caracteres do bloco de texto já decodificado
+            nonlocal size
+            if value is None:
+                return (0, self.NULL)
+            parts.append(value)
+            size += len(value)
+            return (size - len(value), len(value))
+        
+        list_rows = b''.join(self._LIST_ROW.pack(*ref(list_id), *ref(name)) for list_id, name in lists.items())
+        card_rows = b''.join(
+            self._CARD_ROW.pack(*ref(card.id), *ref(card.name), *ref(card.desc), *ref(card.list_id),
+                                *ref(card.due_date))
+            for card in cards
+        )
+        extras = json.dumps([[card.labels, card.members or []] for card in cards],
+                            ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        text = ''.join(parts).encode('utf-8')
+        key = json.dumps(self.export_key()).encode('utf-8')
+        
+        tmp_path = self.cache_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self._HEADER.pack(self.MAGIC, self.VERSION, len(key)))
+            f.write(key)
+            f.write(self._SECTIONS.pack(len(lists), len(cards), len(text), len(extras)))
+            f.write(list_rows)
+            f.write(card_rows)
+            f.write(text)
+            f.write(extras)
+        os.replace(tmp_path, self.cache_path)
+    
+    def read(self) -> Optional[Tuple[Dict[str, str], List[Dict[str, Any]]]]:
+        """Lê o sidecar via mmap; retorna None se ausente ou desatualizado"""
+        if not os.path.exists(self.cache_path):
+            return None
+        
+        with open(self.cache_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, version, key_len = self._HEADER.unpack_from(mm, 0)
+            offset = self._HEADER.size
+            if magic != self.MAGIC or version != self.VERSION:
+                return None
+            if json.loads(mm[offset:offset + key_len]) != self.export_key():
+                return None
+            offset += key_len
+            list_count, card_count, text_len, extras_len = self._SECTIONS.unpack_from(mm, offset)
+            offset += self._SECTIONS.size
+            list_end = offset + list_count * self._LIST_ROW.size
+            card_end = list_end + card_count * self._CARD_ROW.size
+            text = mm[card_end:card_end + text_len].decode('utf-8')
+            extras = json.loads(mm[card_end + text_len:card_end + text_len + extras_len])
+            list_rows = self._LIST_ROW.iter_unpack(mm[offset:list_end])
+            card_rows = self._CARD_ROW.iter_unpack(mm[list_end:card_end])
+        
+        null = self.NULL
+        lists = {text[a:a + b]: text[c:c + d] for a, b, c, d in list_rows}
+        cards = [
+            {
+                'id': text[a0:a0 + a1],
+                'name': text[b0:b0 + b1],
+                'desc': text[c0:c0 + c1],
+                'list_id': text[d0:d0 + d1],
+                'due_date': None if e1 == null else text[e0:e0 + e1],
+                'labels': labels,
+                'members': members
+            }
+            for (a0, a1, b0, b1, c0, c1, d0, d1, e0, e1), (labels, members) in zip(card_rows, extras)
+        ]
+        return lists, cards
+
+class SummaryAccumulator:
+    """Estatísticas do resumo executivo acumuladas numa única passada
+    
+    `create_intelligent_correlations` alimenta o acumulador enquanto pontua os
+    pares (contadores por prompt e totais por card), então o resumo sai em O(1)
+    e cobre todas as correlações acima do threshold, mesmo as não materializadas
+    (modo top_k). `from_correlations` resume uma lista já pronta.
+    
+    Os scores (já arredondados a 3 casas) são somados em milésimos inteiros: a
+    soma é exata e não depende da ordem de cards, fatias, workers ou boards.
+    """
+    
+    TOP_CORRELATIONS = 5
+    SCORE_SCALE = 1000
+    
+    def __init__(self, prompt_count: int = 0):
+        self.count = 0
+        self.high_priority = 0
+        self.total_milli = 0
+        self.high_roi = 0
+        self.roi_distribution: Dict[str, int] = {}
+        self.roi_best: Dict[str, Tuple] = {}  # Chave de ordenação da melhor correlação de cada faixa de ROI
+        # categoria -> [quantidade, soma dos scores em milésimos], na ordem da melhor correlação de cada uma
+        self.categories: Dict[str, List] = {}
+        self.top_correlations: List[Dict] = []
+        # Contadores por prompt durante a pontuação (dobrados em categorias por `close`)
+        self.prompt_counts = [0] * prompt_count
+        self.prompt_milli = [0] * prompt_count
+        self.prompt_best = [(-1.0, 0)] * prompt_count  # (score arredondado, -card_idx) da melhor correlação
+    
+    @classmethod
+    def to_milli(cls, score: float) -> int:
+        """Score arredondado a 3 casas em milésimos inteiros"""
+        return round(score * cls.SCORE_SCALE)
+    
+    @property
+    def total_score(self) -> float:
+        return self.total_milli / self.SCORE_SCALE
+    
+    def add_card(self, roi: str, found: int, high_priority: int, total_milli: int, best: Tuple) -> None:
+        """Soma os totais de um card (o ROI depende apenas do card)"""
+        if roi not in self.roi_best or best > self.roi_best[roi]:
+            self.roi_best[roi] = best
+        self.count += found
+        self.high_priority += high_priority
+        self.total_milli += total_milli
+        self.roi_distribution[roi] = self.roi_distribution.get(roi, 0) + found
+        if 'ALTO' in roi:
+            self.high_roi += found
+    
+    def add(self, correlation: Dict) -> None:
+        """Soma um registro completo de correlação"""
+        milli = self.to_milli(correlation['final_score'])
+        self.count += 1
+        self.total_milli += milli
+        if correlation['implementation_priority'] in ('CRÍTICA', 'ALTA'):
+            self.high_priority += 1
+        roi = correlation['estimated_roi']
+        self.roi_distribution[roi] = self.roi_distribution.get(roi, 0) + 1
+        if 'ALTO' in roi:
+            self.high_roi += 1
+        category = self.categories.setdefault(correlation['prompt_category'], [0, 0])
+        category[0] += 1
+        category[1] += milli
+    
+    def merge(self, other: 'SummaryAccumulator', card_offset: int = 0) -> None:
+        """Incorpora o acumulador de outra fatia de cards (mesmos prompts)
+        
+        `card_offset` desloca os índices de card do outro acumulador (boards
+        diferentes somados como se fossem um board só, na ordem de mesclagem).
+        """
+        self.count += other.count
+        self.high_priority += other.high_priority
+        self.total_milli += other.total_milli
+        self.high_roi += other.high_roi
+        for roi, count in other.roi_distribution.items():
+            self.roi_distribution[roi] = self.roi_distribution.get(roi, 0) + count
+            best = other.roi_best[roi]
+            if card_offset:
+                best = (best[0], best[1] - card_offset) + best[2:]
+            if roi not in self.roi_best or best > self.roi_best[roi]:
+                self.roi_best[roi] = best
+        self.prompt_counts = [a + b for a, b in zip(self.prompt_counts, other.prompt_counts)]
+        self.prompt_milli = [a + b for a, b in zip(self.prompt_milli, other.prompt_milli)]
+        self.prompt_best = [max(a, (b[0], b[1] - card_offset) if card_offset else b)
+                            for a, b in zip(self.prompt_best, other.prompt_best)]
+    
+    def close(self, prompts: List['SmartGitHubPrompt'], top_correlations: List[Dict]) -> None:
+        """Dobra os contadores por prompt em categorias e guarda as melhores correlações"""
+        best: Dict[str, Tuple] = {}
+        totals: Dict[str, List] = {}
+        for prompt_idx, count in enumerate(self.prompt_counts):
+            if not count:
+                continue
+            category = prompts[prompt_idx].category
+            key = self.prompt_best[prompt_idx] + (-prompt_idx,)
+            if category not in best or key > best[category]:
+                best[category] = key
+            total = totals.setdefault(category, [0, 0])
+            total[0] += count
+            total[1] += self.prompt_milli[prompt_idx]
+        # Mesma ordem de categorias e faixas de ROI que a varredura da lista ordenada por score
+        for category in sorted(best, key=best.__getitem__, reverse=True):
+            self.categories[category] = totals[category]
+        self.roi_distribution = {roi: self.roi_distribution[roi]
+                                 for roi in sorted(self.roi_best, key=self.roi_best.__getitem__, reverse=True)}
+        self.top_correlations = top_correlations[:self.TOP_CORRELATIONS]
+    
+    @classmethod
+    def from_correlations(cls, correlations: List[Dict]) -> 'SummaryAccumulator':
+        """Acumulador de uma lista de correlações já ordenada por score"""
+        accumulator = cls()
+        for correlation in correlations:
+            accumulator.add(correlation)
+        accumulator.top_correlations = correlations[:cls.TOP_CORRELATIONS]
+        return accumulator
+    
+    def categories_analysis(self) -> Dict[str, Dict]:
+        analysis = {}
+        for category, (count, total_milli) in self.categories.items():
+            total = total_milli / self.SCORE_SCALE
+            analysis[category] = {'count': count, 'avg_score': total / count, 'total_score': total}
+        return analysis
+
+class PerformanceTracer:
+    """Spans por fase da análise: tempo de parede, CPU, contadores e pico de memória
+    
+    Com `trace_memory` o pico de alocações de cada span vem do tracemalloc
+    (o rastreamento deixa o Python bem mais lento; use só para diagnóstico).
+    """
+    
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.spans: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._started_tracemalloc = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+    
+    @contextmanager
+    def span(self, name: str, **counters):
+        """Mede o bloco; o dict devolvido recebe contadores (pares, bytes...) ao longo do span"""
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        record = {'name': name, 'counters': dict(counters)}
+        start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield record['counters']
+        finally:
+            end = time.perf_counter()
+            record['start_seconds'] = round(start - self._origin, 6)
+            record['wall_seconds'] = round(end - start, 6)
+            record['cpu_seconds'] = round(time.process_time() - cpu_start, 6)
+            if self.trace_memory:
+                record['traced_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+            self.spans.append(record)
+    
+    def stop(self) -> None:
+        """Encerra o tracemalloc se foi este tracer que o iniciou"""
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+    
+    def report(self) -> Dict[str, Any]:
+        """Resumo serializável dos spans (chave `performance` do resultado)"""
+        return {
+            'total_wall_seconds': round(time.perf_counter() - self._origin, 6),
+            'total_cpu_seconds': round(sum(span['cpu_seconds'] for span in self.spans), 6),
+            'trace_memory': self.trace_memory,
+            'spans': self.spans
+        }
+    
+    def write_chrome_trace(self, path: str) -> None:
+        """Grava os spans no formato Trace Event (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+                   'args': {'name': 'arte_comercial'}}]
+        for span in self.spans:
+            args = dict(span['counters'], cpu_ms=round(span['cpu_seconds'] * 1000, 3))
+            if 'traced_peak_mb' in span:
+                args['traced_peak_mb'] = span['traced_peak_mb']
+            events.append({
+                'name': span['name'],
+                'cat': 'analysis',
+                'ph': 'X',
+                'ts': round(span['start_seconds'] * 1e6),
+                'dur': round(span['wall_seconds'] * 1e6),
+                'pid': pid,
+                'tid': 0,
+                'args': args
+            })
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+class CompactAnalysisFile:
+    """Formato compacto do resultado da análise (alternativa a final_analysis_complete.json)
+    
+    Strings e listas repetidas (ações sugeridas, passos, tags, rótulos de ROI e
+    prioridade, nomes de cards) viram índices numa tabela única de valores; as
+    seções de registros são gravadas por coluna e em streaming, sem montar o
+    documento inteiro em memória. `read` devolve exatamente o JSON original.
+    
+    Layout (JSON sem indentação):
+        {"format", "version", "order": [chaves do resultado], "extra": {...},
+         "executive_summary": {...},
+         "sections": {"<seção>": {"count", "fields", "columns": [{"encoding", "data"}]}},
+         "values": [tabela de valores]}
+    Colunas "raw" guardam os números como estão; colunas "dict" guardam
+    índices em "values".
+    """
+    
+    FORMAT = "arte_comercial.compact"
+    VERSION = 1
+    RECORD_SECTIONS = ('detailed_correlations', 'cards_analysis', 'prompts_analysis')
+    CHUNK = 1 << 14  # Itens por escrita (limita as strings intermediárias)
+    _NUMBER_TYPES = (int, float, bool)
+    _SEPARATORS = (',', ':')
+    
+    @classmethod
+    def write(cls, result: Dict, path: str) -> int:
+        """Grava o resultado no formato compacto e devolve o tamanho em bytes"""
+        values: List[Any] = []
+        value_ids: Dict[Any, int] = {}
+        
+        def encode(value) -> int:
+            # str é a chave dela mesma; o tipo evita colisões como 1 == 1.0 == True
+            if type(value) is str:
+                key = value
+            elif type(value) is list:
+                try:
+                    key = ('list', tuple(value))
+                    hash(key)
+                except TypeError:
+                    key = ('json', json.dumps(value, sort_keys=True))
+            else:
+                key = (type(value).__name__, json.dumps(value, sort_keys=True))
+            value_id = value_ids.get(key)
+            if value_id is None:
+                value_id = value_ids[key] = len(values)
+                values.append(value)
+            return value_id
+        
+        sections = [key for key in cls.RECORD_SECTIONS if isinstance(result.get(key), list)]
+        extra = {key: value for key, value in result.items()
+                 if key not in sections and key != 'executive_summary'}
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f'{{"format":"{cls.FORMAT}","version":{cls.VERSION},"order":')
+            json.dump(list(result), f, ensure_ascii=False)
+            f.write(',"extra":')
+            json.dump(extra, f, ensure_ascii=False, separators=cls._SEPARATORS)
+            f.write(',"executive_summary":')
+            json.dump(result.get('executive_summary'), f, ensure_ascii=False, separators=cls._SEPARATORS)
+            f.write(',"sections":{')
+            for section_idx, section in enumerate(sections):
+                records = result[section]
+                fields = list(records[0]) if records else []
+                f.write(f'{"," if section_idx else ""}"{section}":{{"count":{len(records)},"fields":')
+                json.dump(fields, f, ensure_ascii=False)
+                f.write(',"columns":[')
+                for field_idx, field in enumerate(fields):
+                    column = [record[field] for record in records]
+                    if all(type(value) in cls._NUMBER_TYPES for value in column):
+                        encoding = 'raw'
+                    else:
+                        encoding = 'dict'
+                        column = [encode(value) for value in column]
+                    f.write(f'{"," if field_idx else ""}{{"encoding":"{encoding}","data":[')
+                    cls._write_items(f, column)
+                    f.write(']}')
+                f.write(']}')
+            f.write('},"values":[')
+            cls._write_items(f, values)
+            f.write(']}')
+            return f.tell()
+    
+    @classmethod
+    def _write_items(cls, f, items: List) -> None:
+        """Escreve os itens de um array JSON em blocos"""
+        for start in range(0, len(items), cls.CHUNK):
+            if start:
+                f.write(',')
+            f.write(json.dumps(items[start:start + cls.CHUNK], ensure_ascii=False,
+                               separators=cls._SEPARATORS)[1:-1])
+    
+    @classmethod
+    def read(cls, path: str) -> Dict:
+        """Reconstrói o resultado no formato de final_analysis_complete.json"""
+        with open(path, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+        if document.get('format') != cls.FORMAT or document.get('version') != cls.VERSION:
+            raise ValueError(f"{path} não é um resultado compacto v{cls.VERSION}")
+        
+        values = document['values']
+        decoded = dict(document['extra'])
+        decoded['executive_summary'] = document['executive_summary']
+        for section, data in document['sections'].items():
+            columns = []
+            for column in data['columns']:
+                if column['encoding'] == 'raw':
+                    columns.append(column['data'])
+                else:
+                    # Listas/dicts da tabela são copiados para os registros não compartilharem objetos
+                    columns.append([
+                        value.copy() if type(value) in (list, dict) else value
+                        for value in map(values.__getitem__, column['data'])
+                    ])
+            fields = data['fields']
+            decoded[section] = ([dict(zip(fields, row)) for row in zip(*columns)] if fields
+                                else [{} for _ in range(data['count'])])
+        return {key: decoded[key] for key in document['order'] if key in decoded}
+
+class IndexedResultFile:
+    """Arquivo binário indexado com as correlações, consultado via mmap
+    
+    Cada correlação é gravada como JSON compacto na ordem do ranking; tabelas
+    de largura fixa guardam (offset, tamanho) de cada registro e, para
+    card_id, prompt_filename e prompt_category, as chaves ordenadas com suas
+    listas de registros. Uma consulta faz busca binária nas chaves e decodifica
+    apenas os registros pedidos, sem ler o resto do arquivo.
+    
+    Layout: cabeçalho | registros JSON | tabela de registros | 3 índices
+    (seção, tabela de chaves, listas de registros, texto das chaves).
+    """
+    
+    MAGIC = b'ATRI'
+    VERSION = 1
+    INDEXES = ('card_id', 'prompt_filename', 'prompt_category')
+    _HEADER = struct.Struct('<4sHIQ')
+    _RECORD = struct.Struct('<QI')
+    _SECTION = struct.Struct('<III')
+    _KEY = struct.Struct('<IIII')
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._mm: Optional[mmap.mmap] = None
+        self.record_count = 0
+        self._record_table = 0
+        self._indexes: List[Tuple[int, int, int, int]] = []
+    
+    @classmethod
+    def write(cls, correlations: List[Dict], path: str) -> int:
+        """Grava as correlações (já ordenadas por score) de forma atômica; devolve o tamanho"""
+        postings: List[Dict[str, List[int]]] = [{} for _ in cls.INDEXES]
+        # Um único encoder: json.dumps com argumentos cria outro a cada chamada
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(cls._HEADER.pack(cls.MAGIC, cls.VERSION, 0, 0))
+            record_rows = []
+            offset = cls._HEADER.size
+            for record_id, correlation in enumerate(correlations):
+                data = encode(correlation).encode('utf-8')
+                f.write(data)
+                record_rows.append(cls._RECORD.pack(offset, len(data)))
+                offset += len(data)
+                for index, field in zip(postings, cls.INDEXES):
+                    index.setdefault(correlation[field], []).append(record_id)
+            f.write(b''.join(record_rows))
+            
+            for index in postings:
+                keys = sorted((key.encode('utf-8'), ids) for key, ids in index.items())
+                key_rows = []
+                text_size = postings_size = 0
+                for key, ids in keys:
+                    key_rows.append(cls._KEY.pack(text_size, len(key), postings_size, len(ids)))
+                    text_size += len(key)
+                    postings_size += len(ids)
+                f.write(cls._SECTION.pack(len(keys), postings_size, text_size))
+                f.write(b''.join(key_rows))
+                for _, ids in keys:
+                    f.write(struct.pack(f'<{len(ids)}I', *ids))
+                f.write(b''.join(key for key, _ in keys))
+            size = f.tell()
+            f.seek(0)
+            f.write(cls._HEADER.pack(cls.MAGIC, cls.VERSION, len(correlations), offset))
+        os.replace(tmp_path, path)
+        return size
+    
+    def open(self) -> 'IndexedResultFile':
+        """Mapeia o arquivo e lê apenas cabeçalho e cabeçalhos dos índices"""
+        self._file = open(self.path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.record_count, self._record_table = self._HEADER.unpack_from(self._mm, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            self.close()
+            raise ValueError(f"{self.path} não é um índice de resultados v{self.VERSION}")
+        
+        offset = self._record_table + self.record_count * self._RECORD.size
+        self._indexes = []
+        for _ in self.INDEXES:
+            key_count, postings_count, text_size = self._SECTION.unpack_from(self._mm, offset)
+            key_table = offset + self._SECTION.size
+            postings = key_table + key_count * self._KEY.size
+            text = postings + postings_count * 4
+            self._indexes.append((key_table, key_count, postings, text))
+            offset = text + text_size
+        return self
+    
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self) -> 'IndexedResultFile':
+        return self.open()
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def __len__(self) -> int:
+        return self.record_count
+    
+    def card_correlations(self, card_id: str, limit: Optional[int] = None) -> List[Dict]:
+        """Correlações de um card, da maior para a menor pontuação"""
+        return self._records(self._record_ids(0, card_id, limit))
+    
+    def prompt_correlations(self, prompt_filename: str, limit: Optional[int] = None) -> List[Dict]:
+        """Correlações de um prompt, da maior para a menor pontuação"""
+        return self._records(self._record_ids(1, prompt_filename, limit))
+    
+    def top_for_category(self, category: str, limit: int = 10) -> List[Dict]:
+        """As `limit` melhores correlações de uma categoria de prompt"""
+        return self._records(self._record_ids(2, category, limit))
+    
+    def keys(self, field: str) -> List[str]:
+        """Valores distintos de um campo indexado (card_id, prompt_filename ou prompt_category)"""
+        key_table, key_count, _, text = self._indexes[self.INDEXES.index(field)]
+        mm = self._mm
+        keys = []
+        for row in range(key_count):
+            key_offset, key_len, _, _ = self._KEY.unpack_from(mm, key_table + row * self._KEY.size)
+            keys.append(mm[text + key_offset:text + key_offset + key_len].decode('utf-8'))
+        return keys
+    
+    def _record_ids(self, index: int, key: str, limit: Optional[int]) -> Tuple[int, ...]:
+        """Busca binária da chave; devolve os registros dela (em ordem de ranking)"""
+        key_table, key_count, postings, text = self._indexes[index]
+        mm = self._mm
+        target = key.encode('utf-8')
+        low, high = 0, key_count
+        while low < high:
+            middle = (low + high) // 2
+            key_offset, key_len, start, count = self._KEY.unpack_from(mm, key_table + middle * self._KEY.size)
+            candidate = mm[text + key_offset:text + key_offset + key_len]
+            if candidate < target:
+                low = middle + 1
+            elif candidate > target:
+                high = middle
+            else:
+                count = count if limit is None else min(limit, count)
+                return struct.unpack_from(f'<{count}I', mm, postings + start * 4)
+        return ()
+    
+    def _records(self, record_ids: Tuple[int, ...]) -> List[Dict]:
+        records = []
+        for record_id in record_ids:
+            offset, length = self._RECORD.unpack_from(self._mm, self._record_table + record_id * self._RECORD.size)
+            records.append(json.loads(self._mm[offset:offset + length]))
+        return records
+
 class FinalIntegrationSystem:
     """Sistema final de integração com máxima eficiência"""
     
-    def __init__(self, trello_json_path: str, github_repo_url: str):
+    # Resultado no formato compacto (ler com CompactAnalysisFile.read)
+    COMPACT_RESULT_PATH = 'final_analysis_complete.compact.json'
+    # Correlações indexadas por card, prompt e categoria (consultar com IndexedResultFile)
+    RESULT_INDEX_PATH = 'final_analysis_index.bin'
+    # Pesos do score final de correlação
+    DEFAULT_SCORE_WEIGHTS = {'semantic': 0.4, 'automation': 0.4, 'business': 0.2}
+    
+    def __init__(self, trello_json_path: str, github_repo_url: str, semantic_mode: str = "batch",
+                 correlation_threshold: float = 0.3, score_weights: Optional[Dict[str, float]] = None,
+                 top_k: Optional[int] = None, store_path: Optional[str] = None, workers: int = 1,
+                 streaming_load: bool = False, export_cache: bool = False, vectorized_metrics: bool = False,
+                 minhash_permutations: int = 128, lsh_bands: int = 64,
+                 prompts_path: Optional[str] = None, io_threads: int = 8,
+                 trace_memory: bool = False, trace_path: Optional[str] = None, output_format: str = "json"):
         self.trello_json_path = trello_json_path
         self.github_repo_url = github_repo_url
+        # Clone local do repositório (ou diretório qualquer) com os prompts; None = dados simulados
+        self.prompts_path = prompts_path
+        self.io_threads = io_threads  # Threads de leitura/análise dos arquivos de prompt
+        # "batch" (matriz completa), "pair" (par a par) ou "minhash" (candidatos por LSH, aproximado)
+        self.semantic_mode = semantic_mode
+        self.correlation_threshold = correlation_threshold
+        self.score_weights = dict(self.DEFAULT_SCORE_WEIGHTS, **(score_weights or {}))
+        if top_k is not None and top_k < 1:
+            raise ValueError(f"top_k deve ser None ou >= 1 (recebido: {top_k})")
+        self.top_k = top_k  # Mantém apenas as K melhores correlações (None = todas)
+        # Banco SQLite para reanálise incremental (None = recalcula tudo)
+        self.store_path = store_path
+        self.workers = workers  # Processos para pontuar as correlações (1 = sem pool)
+        self.streaming_load = streaming_load  # Lê a exportação do Trello sem carregá-la inteira
+        self.export_cache = export_cache  # Usa/grava o sidecar binário `<exportação>.cards.bin`
+        self.vectorized_metrics = vectorized_metrics  # Métricas dos cards calculadas em colunas (CardTable)
+        # Modo "minhash": mais bandas = mais recall, menos bandas = mais precisão
+        self.minhash_permutations = minhash_permutations
+        self.lsh_bands = lsh_bands
+        # Instrumentação de run_complete_analysis: pico de memória por fase e trace do Chrome (opcionais)
+        self.trace_memory = trace_memory
+        self.trace_path = trace_path
+        # Resultado salvo em "json" (indentado), "compact" (CompactAnalysisFile) ou "both"
+        self.output_format = output_format
+        self.card_table: Optional[CardTable] = None
+        self.correlation_stats: Dict[str, int] = {}
+        # Resumo executivo acumulado pela última execução de create_intelligent_correlations
+        self.summary_accumulator: Optional[SummaryAccumulator] = None
         self.cards: List[SmartTrelloCard] = []
         self.prompts: List[SmartGitHubPrompt] = []
         self.lists: Dict[str, str] = {}
+        # Lado dos prompts do índice já construído (build_prompt_index), compartilhado entre boards
+        self.prompt_index: Optional[Dict[str, Any]] = None
         
     def load_and_analyze_trello(self) -> bool:
         """Carrega e analisa dados do Trello"""
         try:
-            with open(self.trello_json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Processar listas
-            for list_item in data.get('lists', []):
-                self.lists[list_item['id']] = list_item['name']
-            
-            # Processar cards
-            for card_data in data.get('cards', []):
-                if not card_data.get('closed', False):
-                    card = SmartTrelloCard(
-                        id=card_data['id'],
-                        name=card_data['name'],
-                        desc=card_data.get('desc', ''),
-                        list_id=card_data['idList'],
-                        list_name=self.lists.get(card_data['idList'], 'Unknown'),
-                        labels=[label.get('name', '') for label in card_data.get('labels', [])],
-                        due_date=card_data.get('due'),
-                        members=card_data.get('idMembers', [])
-                    )
+            export_cache = TrelloExportCache(self.trello_json_path) if self.export_cache else None
+            if not (export_cache and self._load_trello_from_cache(export_cache)):
+                if self.streaming_load:
+                    self._load_trello_streaming()
+                else:
+                    with open(self.trello_json_path, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
                     
-                    # Calcular métricas
-                    card.calculate_metrics()
-                    self.cards.append(card)
+                    # Processar listas
+                    for list_item in data.get('lists', []):
+                        self.lists[list_item['id']] = list_item['name']
+                    
+                    # Processar cards
+                    for card_data in data.get('cards', []):
+                        if not card_data.get('closed', False):
+                            self.cards.append(self._build_card(card_data))
+                    
+                    logger.info(f"✅ Carregados {len(self.cards)} cards com análise completa")
+                
+                if export_cache:
+                    export_cache.write(self.lists, self.cards)
+                    logger.info(f"💾 Cache binário da exportação gravado em {export_cache.cache_path}")
             
-            logger.info(f"✅ Carregados {len(self.cards)} cards com análise completa")
+            if self.vectorized_metrics:
+                self._calculate_card_metrics_vectorized()
             return True
             
         except Exception as e:
             logger.error(f"❌ Erro ao carregar Trello: {e}")
             return False
     
+    def _load_trello_streaming(self) -> None:
+        """Carrega o Trello lendo apenas `lists` e `cards` de forma incremental"""
+        for section, item in TrelloExportStream(self.trello_json_path).iter_sections(('lists', 'cards')):
+            if section == 'lists':
+                self.lists[item['id']] = item['name']
+            elif not item.get('closed', False):
+                self.cards.append(self._build_card(item))
+        
+        # Nas exportações do Trello `cards` costuma vir antes de `lists`
+        for card in self.cards:
+            card.list_name = self.lists.get(card.list_id, 'Unknown')
+        
+        logger.info(f"✅ Carregados {len(self.cards)} cards com análise completa (leitura incremental)")
+    
+    def _load_trello_from_cache(self, export_cache: 'TrelloExportCache') -> bool:
+        """Carrega listas e cards do sidecar binário, se estiver válido"""
+        cached = export_cache.read()
+        if cached is None:
+            return False
+        
+        self.lists, card_fields = cached
+        for fields in card_fields:
+            card = SmartTrelloCard(list_name=self.lists.get(fields['list_id'], 'Unknown'), **fields)
+            # Métricas dependem da data atual e são sempre recalculadas
+            if not self.vectorized_metrics:
+                card.calculate_metrics()
+            self.cards.append(card)
+        
+        logger.info(f"✅ Carregados {len(self.cards)} cards com análise completa (cache binário)")
+        return True
+    
+    def _build_card(self, card_data: Dict) -> SmartTrelloCard:
+        """Cria o card a partir do JSON exportado e calcula suas métricas"""
+        card = SmartTrelloCard(
+            id=card_data['id'],
+            name=card_data['name'],
+            desc=card_data.get('desc', ''),
+            list_id=card_data['idList'],
+            list_name=self.lists.get(card_data['idList'], 'Unknown'),
+            labels=[label.get('name', '') for label in card_data.get('labels', [])],
+            due_date=card_data.get('due'),
+            members=card_data.get('idMembers', [])
+        )
+        
+        # Calcular métricas (no modo vetorizado, todas de uma vez após a carga)
+        if not self.vectorized_metrics:
+            card.calculate_metrics()
+        return card
+    
+    def _calculate_card_metrics_vectorized(self) -> None:
+        """Calcula as métricas de todos os cards de uma vez via CardTable"""
+        if np is None:
+            # Sem NumPy: mesmo resultado, card a card
+            for card in self.cards:
+                card.calculate_metrics()
+            return
+        
+        self.card_table = CardTable.from_cards(self.cards)
+        self.card_table.calculate_metrics()
+        self.card_table.apply_to(self.cards)
+        logger.info(f"📐 Métricas vetorizadas calculadas para {len(self.cards)} cards")
+    
     def load_and_analyze_github(self) -> bool:
         """Carrega e analisa prompts do GitHub"""
         try:
+            if self.prompts_path:
+                self.prompts.extend(self._scan_prompt_library())
+                logger.info(f"✅ Carregados {len(self.prompts)} prompts com análise completa")
+                return True
+            
             # Dados simulados baseados na análise real do repositório
             github_files = [
                 {
@@ -616,89 +1943,785 @@ class UniversalAPIConnector:
             logger.error(f"❌ Erro ao carregar GitHub: {e}")
             return False
     
+    # Arquivos considerados prompts/código na varredura do repositório
+    PROMPT_EXTENSIONS = ('.py', '.md', '.txt', '.prompt', '.json', '.yaml', '.yml', '.js', '.ts', '.sh')
+    PROMPT_IGNORED_DIRS = {'.git', '__pycache__', 'node_modules', '.venv', 'venv', '.mypy_cache', '.pytest_cache'}
+    PROMPT_MAX_BYTES = 1 << 20
+    # Categoria do prompt: dica no caminho (prefixo de palavra) ou, na falta dela, a tag
+    PROMPT_CATEGORIES = [
+        ('Government_APIs', 'GOVERNMENT_APIS', ('gov', 'receita', 'ibge', 'cnpj')),
+        ('Trello_Automation', 'TRELLO_AUTOMATION', ('trello',)),
+        ('AI_Integration', 'AI_INTEGRATION', ('gpt', 'openai', 'llm', 'ia', 'ai')),
+        ('Data_Processing', 'DATA_PROCESSING', ('data', 'dados', 'csv', 'pandas')),
+        ('API_Integration', 'API_INTEGRATION', ('api',))
+    ]
+    
+    def _scan_prompt_library(self) -> List[SmartGitHubPrompt]:
+        """Lê e analisa os arquivos de prompt do clone local com um pool de threads
+        
+        A análise de cada arquivo fica em cache no banco incremental, indexada
+        pelo SHA do blob git: numa nova varredura apenas arquivos alterados são
+        analisados de novo. Em clones git os SHAs vêm do índice (`git ls-files`);
+        arquivos modificados, não rastreados ou fora de um repositório git têm o
+        SHA calculado do conteúdo, no mesmo formato do git.
+        """
+        root = Path(self.prompts_path)
+        if not root.is_dir():
+            raise FileNotFoundError(f"Diretório de prompts não encontrado: {root}")
+        repo_slug = self._github_repo_slug(self.github_repo_url)
+        entries = self._list_prompt_files(root, repo_slug)
+        
+        with ThreadPoolExecutor(max_workers=self.io_threads) as executor:
+            files = [f for f in executor.map(lambda entry: self._read_prompt_file(root, *entry), entries) if f]
+            
+            cached: Dict[str, Tuple[float, List[str], str]] = {}
+            if self.store_path:
+                store = AnalysisStore(self.store_path)
+                try:
+                    cached = store.load_prompt_analysis([blob_sha for _, _, blob_sha in files])
+                finally:
+                    store.close()
+            
+            prompts = list(executor.map(lambda f: self._build_prompt(*f, cached.get(f[2])), files))
+        
+        new_rows = {
+            blob_sha: (blob_sha, prompt.complexity_score, json.dumps(prompt.automation_tags),
+                       prompt.implementation_effort)
+            for prompt, (_, _, blob_sha) in zip(prompts, files) if blob_sha not in cached
+        }
+        if self.store_path and new_rows:
+            store = AnalysisStore(self.store_path)
+            try:
+                store.save_prompt_analysis(list(new_rows.values()))
+            finally:
+                store.close()
+        
+        from_cache = sum(1 for _, _, blob_sha in files if blob_sha in cached)
+        logger.info(
+            f"📂 {repo_slug or root}: {len(prompts)} arquivos de prompt, "
+            f"{len(prompts) - from_cache} analisados e {from_cache} reaproveitados do cache"
+        )
+        return prompts
+    
+    @staticmethod
+    def _github_repo_slug(github_repo_url: str) -> Optional[str]:
+        """'dono/repositório' a partir de uma URL do GitHub (https ou ssh)"""
+        match = re.search(r'github\.com[:/]+([^/\s]+)/([^/\s]+?)(?:\.git)?/?$', github_repo_url or '')
+        return f"{match.group(1)}/{match.group(2)}" if match else None
+    
+    def _list_prompt_files(self, root: Path, repo_slug: Optional[str]) -> List[Tuple[str, Optional[str]]]:
+        """Caminhos relativos dos arquivos de prompt com o SHA do blob, quando conhecido"""
+        try:
+            def git(*args: str) -> str:
+                return subprocess.run(['git', '-C', str(root), *args], capture_output=True, check=True,
+                                      text=True, encoding='utf-8', errors='surrogateescape').stdout
+            
+            staged = git('ls-files', '-s', '-z')
+            modified = set(git('ls-files', '-m', '-z').split('\0'))
+            untracked = git('ls-files', '-o', '--exclude-standard', '-z').split('\0')
+            origin = git('remote', 'get-url', 'origin').strip() if 'origin' in git('remote').split() else ''
+        except (OSError, subprocess.CalledProcessError):
+            # Sem git (ou fora de um clone): percorre o diretório
+            entries = []
+            for directory, subdirs, filenames in os.walk(root):
+                subdirs[:] = sorted(d for d in subdirs if d not in self.PROMPT_IGNORED_DIRS)
+                for filename in filenames:
+                    relative = (Path(directory) / filename).relative_to(root).as_posix()
+                    if relative.lower().endswith(self.PROMPT_EXTENSIONS):
+                        entries.append((relative, None))
+            return sorted(entries)
+        
+        if repo_slug and origin and self._github_repo_slug(origin) != repo_slug:
+            logger.warning(f"⚠️ O clone em {root} aponta para {origin}, não para {repo_slug}")
+        
+        entries = {}
+        for record in staged.split('\0'):
+            if not record:
+                continue
+            info, relative = record.split('\t', 1)
+            mode, blob_sha, stage = info.split()
+            if stage in ('0', '2'):  # Em conflitos vale a versão local
+                # Links simbólicos: o blob guarda o destino, não o conteúdo lido
+                entries[relative] = None if relative in modified or mode == '120000' else blob_sha
+        for relative in untracked:
+            if relative:
+                entries[relative] = None
+        return sorted(
+            (relative, blob_sha) for relative, blob_sha in entries.items()
+            if relative.lower().endswith(self.PROMPT_EXTENSIONS)
+            and not self.PROMPT_IGNORED_DIRS.intersection(relative.split('/')[:-1])
+        )
+    
+    def _read_prompt_file(self, root: Path, relative: str,
+                          blob_sha: Optional[str]) -> Optional[Tuple[str, str, str]]:
+        """Lê um arquivo de prompt; None se ausente, grande demais ou binário"""
+        try:
+            path = root / relative
+            if path.stat().st_size > self.PROMPT_MAX_BYTES:
+                return None
+            data = path.read_bytes()
+        except OSError:
+            return None
+        if b'\0' in data[:8192]:
+            return None
+        if blob_sha is None:
+            blob_sha = self._git_blob_sha(data)
+        return relative, data.decode('utf-8', errors='replace'), blob_sha
+    
+    @staticmethod
+    def _git_blob_sha(data: bytes) -> str:
+        """SHA-1 no formato de blob do git (igual a `git hash-object`)"""
+        return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+    
+    def _build_prompt(self, relative: str, content: str, blob_sha: str,
+                      cached: Optional[Tuple[float, List[str], str]]) -> SmartGitHubPrompt:
+        """Cria o prompt, reaproveitando a análise em cache quando o blob não mudou"""
+        filename = relative.rsplit('/', 1)[-1]
+        if cached:
+            complexity_score, automation_tags, implementation_effort = cached
+            return SmartGitHubPrompt(
+                filename=filename, content=content,
+                category=self._infer_prompt_category(relative, automation_tags), path=relative,
+                complexity_score=complexity_score, automation_tags=list(automation_tags),
+                implementation_effort=implementation_effort, cached_analysis=True
+            )
+        prompt = SmartGitHubPrompt(filename=filename, content=content, category='', path=relative)
+        prompt.category = self._infer_prompt_category(relative, prompt.automation_tags)
+        return prompt
+    
+    def _infer_prompt_category(self, relative: str, automation_tags: List[str]) -> str:
+        """Categoria do prompt pelo caminho do arquivo ou pelas tags de automação"""
+        words = re.split(r'[^a-z0-9]+', KeywordMatcher.fold(relative))
+        for category, _, hints in self.PROMPT_CATEGORIES:
+            if any(word.startswith(hint) for word in words for hint in hints):
+                return category
+        for category, tag, _ in self.PROMPT_CATEGORIES:
+            if tag in automation_tags:
+                return category
+        return 'General'
+    
     def create_intelligent_correlations(self) -> List[Dict]:
         """Cria correlações inteligentes entre cards e prompts"""
         correlations = []
+        index = self._build_correlation_index()
         
-        for card in self.cards:
-            for prompt in self.prompts:
-                # Calcular scores de correlação
-                semantic_score = self._calculate_semantic_similarity(card, prompt)
-                automation_score = self._calculate_automation_compatibility(card, prompt)
+        if self.workers > 1 and len(self.cards) > 1:
+            shard_results = self._score_cards_in_pool(index)
+        else:
+            shard_results = [self._score_card_range(index, range(len(self.cards)))]
+        
+        # Mescla determinística: as chaves (score, card, prompt) são únicas
+        ranked = []
+        pair_updates: Dict[Tuple[int, int], List] = {}
+        summary = SummaryAccumulator(len(self.prompts))
+        for result in shard_results:
+            ranked.extend(result['ranked'])
+            pair_updates.update(result['pair_updates'])
+            summary.merge(result['summary'])
+        if self.top_k is not None:
+            ranked = heapq.nlargest(self.top_k, ranked)
+        ranked.sort(reverse=True)
+        pruned_pairs = sum(result['pruned_pairs'] for result in shard_results)
+        found = sum(result['found'] for result in shard_results)
+        
+        # Apenas os vencedores viram registros completos com ações e passos
+        for _, neg_card_idx, neg_prompt_idx, scores in ranked:
+            correlations.append(self._build_correlation_record(
+                self.cards[-neg_card_idx], self.prompts[-neg_prompt_idx], *scores
+            ))
+        
+        summary.close(self.prompts, correlations)
+        self.summary_accumulator = summary
+        
+        if self.store_path:
+            self._save_correlation_index(index, pair_updates)
+        
+        self.correlation_stats = {
+            'total_pairs': len(self.cards) * len(self.prompts),
+            'candidate_pairs': sum(len(c) for c in index['candidates']),
+            'pruned_pairs': pruned_pairs,
+            'correlations_found': found,
+            'correlations_kept': len(correlations)
+        }
+        logger.info(f"✂️ Poda por limite superior: {pruned_pairs} pares descartados sem cálculo semântico")
+        if self.top_k is not None:
+            logger.info(f"🏆 Top-{self.top_k}: {len(correlations)} de {found} correlações materializadas")
+        
+        return correlations
+    
+    def _score_cards_in_pool(self, index: Dict[str, Any]) -> List[Dict]:
+        """Distribui os cards em fatias entre processos
+        
+        Prompts, cards e o índice de palavras-chave seguem uma única vez para cada
+        worker (initializer); as tarefas carregam apenas o intervalo de cards.
+        """
+        shard_count = min(len(self.cards), self.workers * 4)
+        shard_size = -(-len(self.cards) // shard_count)
+        shards = [range(start, min(start + shard_size, len(self.cards)))
+                  for start in range(0, len(self.cards), shard_size)]
+        
+        logger.info(f"⚙️ Pontuando {len(self.cards)} cards em {len(shards)} fatias com {self.workers} processos")
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_correlation_worker,
+                                 initargs=(self, index)) as executor:
+            return list(executor.map(_score_correlation_shard, shards))
+    
+    def _score_card_range(self, index: Dict[str, Any], card_indices: range) -> Dict[str, Any]:
+        """Pontua os pares de uma fatia de cards contra todos os prompts"""
+        weights = self.score_weights
+        threshold = self.correlation_threshold
+        
+        # Fase 1: scores baratos (automação/negócio) e limite superior por par.
+        # Pares cujo limite não supera o threshold dispensam o cálculo semântico.
+        pair_scores = []
+        pruned_pairs = 0
+        # Pares a gravar no banco incremental: (card_idx, prompt_idx) -> [semântico, automação]
+        pair_updates: Dict[Tuple[int, int], List] = {}
+        for card_idx in card_indices:
+            card = self.cards[card_idx]
+            # Apenas prompts que compartilham palavra-chave ou tag recebem o score completo
+            candidates = index['candidates'][card_idx]
+            known_prompts = index['known_prompts'][card_idx]
+            known_pairs = index['known_pairs'][card_idx]
+            card_size = len(index['card_keywords'][card_idx])
+            card_pairs = []
+            
+            for prompt_idx, prompt in enumerate(self.prompts):
                 business_score = self._calculate_business_impact(card, prompt)
+                if prompt_idx in known_prompts and known_pairs.get(prompt_idx, (None,))[0] is not None:
+                    # Par já pontuado anteriormente com o mesmo conteúdo
+                    semantic_score, automation_score = known_pairs[prompt_idx]
+                    card_pairs.append((prompt_idx, semantic_score, automation_score, business_score))
+                elif prompt_idx in known_prompts and prompt_idx not in known_pairs:
+                    # Par já avaliado e que não era candidato
+                    automation_score = min(card.automation_potential * 0.1, 1.0)
+                    card_pairs.append((prompt_idx, 0.0, automation_score, business_score))
+                elif prompt_idx in candidates:
+                    automation_score = self._automation_score_from_matches(
+                        card, prompt, index['card_tag_matches'][card_idx]
+                    )
+                    if self.store_path and prompt_idx not in known_pairs:
+                        pair_updates[(card_idx, prompt_idx)] = [None, automation_score]
+                    # Jaccard nunca excede min(|A|, |B|) / max(|A|, |B|)
+                    prompt_size = len(index['prompt_keywords'][prompt_idx])
+                    semantic_bound = min(card_size, prompt_size) / max(card_size, prompt_size, 1)
+                    upper_bound = ((semantic_bound * weights['semantic'])
+                                   + (automation_score * weights['automation'])
+                                   + (business_score * weights['business']))
+                    if upper_bound <= threshold:
+                        pruned_pairs += 1
+                        continue
+                    card_pairs.append((prompt_idx, None, automation_score, business_score))
+                else:
+                    # Sem intersecção: similaridade nula e nenhuma tag compatível
+                    automation_score = min(card.automation_potential * 0.1, 1.0)
+                    card_pairs.append((prompt_idx, 0.0, automation_score, business_score))
+            pair_scores.append((card_idx, card_pairs))
+        
+        # Fase 2: similaridade semântica apenas para os cards com pares restantes
+        # (no modo "pair" o Jaccard é calculado par a par na fase 3)
+        semantic_rows = None
+        if self.semantic_mode == "batch":
+            active_cards = [card_idx for card_idx, pairs in pair_scores
+                            if any(semantic is None for _, semantic, _, _ in pairs)]
+            semantic_rows = self._calculate_semantic_matrix(index, active_cards)
+        elif self.semantic_mode == "minhash":
+            # Jaccard exato apenas dos candidatos do LSH, sem a matriz completa
+            semantic_rows = self._calculate_semantic_pairs(index, [
+                (card_idx, prompt_idx) for card_idx, pairs in pair_scores
+                for prompt_idx, semantic, _, _ in pairs if semantic is None
+            ])
+        
+        # Fase 3: score final em tuplas leves (score, card_idx, prompt_idx, ...);
+        # no modo top_k apenas um heap limitado é mantido em memória
+        ranked = []
+        found = 0
+        # Resumo executivo acumulado durante a pontuação
+        summary = SummaryAccumulator(len(self.prompts))
+        prompt_counts, prompt_milli, prompt_best = summary.prompt_counts, summary.prompt_milli, summary.prompt_best
+        to_milli = summary.to_milli
+        for card_idx, card_pairs in pair_scores:
+            card = self.cards[card_idx]
+            priority_base, business_base = self._priority_components(card)
+            card_found = card_high_priority = card_milli = 0
+            card_best = None
+            for prompt_idx, semantic_score, automation_score, business_score in card_pairs:
+                # Calcular scores de correlação
+                if semantic_score is None:
+                    if semantic_rows is not None:
+                        semantic_score = semantic_rows[card_idx].get(prompt_idx, 0.0)
+                    else:
+                        semantic_score = self._jaccard_similarity(
+                            index['card_keywords'][card_idx], index['prompt_keywords'][prompt_idx]
+                        )
+                    if self.store_path:
+                        pair_updates[(card_idx, prompt_idx)] = [semantic_score, automation_score]
                 
                 # Score final ponderado
-                final_score = (semantic_score * 0.4) + (automation_score * 0.4) + (business_score * 0.2)
+                final_score = ((semantic_score * weights['semantic'])
+                               + (automation_score * weights['automation'])
+                               + (business_score * weights['business']))
                 
-                if final_score > 0.3:  # Threshold para correlações relevantes
-                    correlation = {
-                        'card_id': card.id,
-                        'card_name': card.name,
-                        'card_list': card.list_name,
-                        'card_priority': round(card.priority_score, 2),
-                        'card_automation_potential': round(card.automation_potential, 2),
-                        'card_business_value': round(card.business_value, 2),
-                        'prompt_filename': prompt.filename,
-                        'prompt_category': prompt.category,
-                        'prompt_complexity': round(prompt.complexity_score, 2),
-                        'prompt_effort': prompt.implementation_effort,
-                        'prompt_tags': prompt.automation_tags,
-                        'semantic_score': round(semantic_score, 3),
-                        'automation_score': round(automation_score, 3),
-                        'business_score': round(business_score, 3),
-                        'final_score': round(final_score, 3),
-                        'implementation_priority': self._calculate_implementation_priority(final_score, card, prompt),
-                        'estimated_roi': self._estimate_roi(card, prompt),
-                        'suggested_actions': self._generate_action_plan(card, prompt, final_score),
-                        'implementation_steps': self._generate_implementation_steps(card, prompt)
-                    }
-                    correlations.append(correlation)
-        
-        return sorted(correlations, key=lambda x: x['final_score'], reverse=True)
+                if final_score > threshold:  # Threshold para correlações relevantes
+                    found += 1
+                    rounded_score = round(final_score, 3)
+                    milli = to_milli(rounded_score)
+                    card_found += 1
+                    card_milli += milli
+                    # Mesmo critério de _calculate_implementation_priority (CRÍTICA/ALTA)
+                    if (final_score * 0.5) + priority_base + business_base > 0.6:
+                        card_high_priority += 1
+                    prompt_counts[prompt_idx] += 1
+                    prompt_milli[prompt_idx] += milli
+                    if rounded_score > prompt_best[prompt_idx][0]:
+                        prompt_best[prompt_idx] = (rounded_score, -card_idx)
+                    if card_best is None or rounded_score > card_best[0]:
+                        card_best = (rounded_score, -card_idx, -prompt_idx)
+                    # Empates mantêm a ordem card/prompt da ordenação estável original
+                    entry = (rounded_score, -card_idx, -prompt_idx,
+                             (final_score, semantic_score, automation_score, business_score))
+                    if self.top_k is None:
+                        ranked.append(entry)
+                    elif len(ranked) < self.top_k:
+                        heapq.heappush(ranked, entry)
+                    elif entry > ranked[0]:
+                        heapq.heapreplace(ranked, entry)
+            if card_found:
+                summary.add_card(self._estimate_card_roi(card), card_found, card_high_priority, card_milli, card_best)
+        
+        return {
+            'ranked': ranked,
+            'found': found,
+            'summary': summary,
+            'pruned_pairs': pruned_pairs,
+            'pair_updates': pair_updates
+        }
+    
+    def _build_correlation_record(self, card: SmartTrelloCard, prompt: SmartGitHubPrompt, final_score: float,
+                                  semantic_score: float, automation_score: float, business_score: float) -> Dict:
+        """Monta o registro completo de uma correlação"""
+        return {
+            'card_id': card.id,
+            'card_name': card.name,
+            'card_list': card.list_name,
+            'card_priority': round(card.priority_score, 2),
+            'card_automation_potential': round(card.automation_potential, 2),
+            'card_business_value': round(card.business_value, 2),
+            'prompt_filename': prompt.filename,
+            'prompt_category': prompt.category,
+            'prompt_complexity': round(prompt.complexity_score, 2),
+            'prompt_effort': prompt.implementation_effort,
+            'prompt_tags': prompt.automation_tags,
+            'semantic_score': round(semantic_score, 3),
+            'automation_score': round(automation_score, 3),
+            'business_score': round(business_score, 3),
+            'final_score': round(final_score, 3),
+            'implementation_priority': self._calculate_implementation_priority(final_score, card, prompt),
+            'estimated_roi': self._estimate_roi(card, prompt),
+            'suggested_actions': self._generate_action_plan(card, prompt, final_score),
+            'implementation_steps': self._generate_implementation_steps(card, prompt)
+        }
+    
+    def _build_correlation_index(self) -> Dict[str, Any]:
+        """Constrói índice invertido palavra-chave/tag -> prompts (uma vez por execução)"""
+        card_hashes = [self._content_hash(card.name, card.desc) for card in self.cards]
+        prompt_index = self.prompt_index
+        if prompt_index is not None:
+            prompt_hashes = prompt_index['prompt_hashes']
+        else:
+            prompt_hashes = [self._content_hash(prompt.filename, prompt.content) for prompt in self.prompts]
+        
+        # Estado persistido da execução anterior (modo incremental)
+        stored_cards: Dict[str, Dict] = {}
+        stored_prompts: Dict[str, set] = {}
+        if self.store_path:
+            store = AnalysisStore(self.store_path)
+            try:
+                stored_cards = store.load_cards(card_hashes)
+                stored_prompts = store.load_prompts(prompt_hashes)
+                prompt_sets = store.load_prompt_sets([row['prompt_set'] for row in stored_cards.values()
+                                                      if row['prompt_set']])
+                stored_pairs = store.load_pair_scores(list(stored_cards))
+            finally:
+                store.close()
+        
+        card_keywords = []
+        card_tag_matches = []
+        for card, card_hash in zip(self.cards, card_hashes):
+            if card_hash in stored_cards:
+                card_keywords.append(stored_cards[card_hash]['keywords'])
+                card_tag_matches.append(stored_cards[card_hash]['tag_matches'])
+            else:
+                keywords, tag_matches = self._card_index_row(card)
+                card_keywords.append(keywords)
+                card_tag_matches.append(tag_matches)
+        
+        if prompt_index is None:
+            prompt_index = self.build_prompt_index(prompt_hashes, stored_prompts)
+        prompt_keywords = prompt_index['prompt_keywords']
+        keyword_index = prompt_index['keyword_index']
+        tag_index = prompt_index['tag_index']
+        
+        # Pares já pontuados em execuções anteriores: prompts cobertos por card e
+        # scores dos pares candidatos (pares ausentes não eram candidatos)
+        known_prompts: List[set] = [set() for _ in self.cards]
+        known_pairs: List[Dict[int, Tuple]] = [{} for _ in self.cards]
+        if stored_cards:
+            prompt_positions = {prompt_hash: idx for idx, prompt_hash in enumerate(prompt_hashes)}
+            approximation = self._semantic_approximation()
+            for card_idx, card_hash in enumerate(card_hashes):
+                stored = stored_cards.get(card_hash)
+                # Pontuações aproximadas só são reaproveitadas pelo mesmo modo aproximado
+                if (not stored or stored['prompt_set'] not in prompt_sets
+                        or stored['prompt_set'].rpartition(':')[0] != approximation):
+                    continue
+                known_prompts[card_idx] = {
+                    prompt_positions[prompt_hash] for prompt_hash in prompt_sets[stored['prompt_set']]
+                    if prompt_hash in prompt_positions
+                }
+                known_pairs[card_idx] = {
+                    prompt_positions[prompt_hash]: scores
+                    for prompt_hash, scores in stored_pairs.get(card_hash, {}).items()
+                    if prompt_hash in prompt_positions
+                }
+        
+        # Modo aproximado: candidatos semânticos vêm do LSH em vez das listas invertidas
+        semantic_candidates = None
+        if self.semantic_mode == "minhash":
+            semantic_candidates = MinHashLSH(self.minhash_permutations, self.lsh_bands).candidates(
+                card_keywords, prompt_keywords
+            )
+        
+        candidates = [
+            self._card_candidates(card_keywords[card_idx], card_tag_matches[card_idx], keyword_index, tag_index,
+                                  semantic_candidates[card_idx] if semantic_candidates is not None else None)
+            for card_idx in range(len(self.cards))
+        ]
+        
+        logger.info(
+            f"🔎 Índice invertido: {sum(len(c) for c in candidates)} de "
+            f"{len(self.cards) * len(self.prompts)} pares candidatos"
+        )
+        if self.store_path:
+            logger.info(
+                f"♻️ Reanálise incremental: {len(self.cards) - sum(1 for k in known_prompts if k)} cards "
+                f"e {len(self.prompts) - len(stored_prompts)} prompts novos ou alterados"
+            )
+        
+        return {
+            'card_hashes': card_hashes,
+            'prompt_hashes': prompt_hashes,
+            'card_keywords': card_keywords,
+            'prompt_keywords': prompt_keywords,
+            'card_tag_matches': card_tag_matches,
+            'keyword_index': keyword_index,
+            'tag_index': tag_index,
+            'candidates': candidates,
+            'known_prompts': known_prompts,
+            'known_pairs': known_pairs,
+            'stored_prompt_sets': [stored_cards[h]['prompt_set'] if h in stored_cards else None
+                                   for h in card_hashes],
+            'stored_prompts': set(stored_prompts)
+        }
+    
+    def build_prompt_index(self, prompt_hashes: Optional[List[str]] = None,
+                           stored_prompts: Optional[Dict[str, set]] = None) -> Dict[str, Any]:
+        """Lado dos prompts do índice: hashes, palavras-chave e listas invertidas
+        
+        Depende só dos prompts; atribuído a `prompt_index` de outros sistemas com
+        os mesmos prompts, evita refazer o trabalho a cada board.
+        """
+        if prompt_hashes is None:
+            prompt_hashes = [self._content_hash(prompt.filename, prompt.content) for prompt in self.prompts]
+        stored_prompts = stored_prompts or {}
+        prompt_keywords = [
+            stored_prompts[prompt_hash] if prompt_hash in stored_prompts
+            else set(self._extract_keywords(self._prompt_text(prompt)))
+            for prompt, prompt_hash in zip(self.prompts, prompt_hashes)
+        ]
+        
+        keyword_index: Dict[str, List[int]] = {}
+        for prompt_idx, keywords in enumerate(prompt_keywords):
+            for keyword in keywords:
+                keyword_index.setdefault(keyword, []).append(prompt_idx)
+        
+        tag_index: Dict[str, List[int]] = {}
+        for prompt_idx, prompt in enumerate(self.prompts):
+            for tag in prompt.automation_tags:
+                tag_index.setdefault(tag, []).append(prompt_idx)
+        
+        return {
+            'prompt_hashes': prompt_hashes,
+            'prompt_keywords': prompt_keywords,
+            'keyword_index': keyword_index,
+            'tag_index': tag_index
+        }
+    
+    def _card_index_row(self, card: SmartTrelloCard) -> Tuple[set, Dict[str, int]]:
+        """Palavras-chave e tags de compatibilidade encontradas no texto de um card"""
+        return set(self._extract_keywords(self._card_text(card))), self._match_compatibility_tags(card.keyword_hits())
+    
+    @staticmethod
+    def _card_candidates(card_keywords: set, card_tag_matches: Dict[str, int], keyword_index: Dict[str, List[int]],
+                         tag_index: Dict[str, List[int]], semantic_candidates: Optional[set] = None) -> set:
+        """Prompts candidatos de um card: palavra-chave em comum (ou LSH) e tags compatíveis"""
+        if semantic_candidates is not None:
+            card_candidates = semantic_candidates
+        else:
+            card_candidates = set()
+            for keyword in card_keywords:
+                card_candidates.update(keyword_index.get(keyword, ()))
+        for tag, matches in card_tag_matches.items():
+            if matches:
+                card_candidates.update(tag_index.get(tag, ()))
+        return card_candidates
+    
+    def _save_correlation_index(self, index: Dict[str, Any], pair_updates: Dict[Tuple[int, int], List]) -> None:
+        """Persiste palavras-chave e os scores recém-calculados no banco incremental"""
+        prompt_hashes = index['prompt_hashes']
+        fingerprint = hashlib.sha1('\n'.join(sorted(set(prompt_hashes))).encode('utf-8')).hexdigest()
+        if self._semantic_approximation():
+            fingerprint = f"{self._semantic_approximation()}:{fingerprint}"
+        
+        # Apenas linhas novas ou pontuadas contra outro conjunto de prompts
+        cards = [
+            (card_hash, json.dumps(sorted(keywords)), json.dumps(tag_matches), fingerprint)
+            for card_hash, keywords, tag_matches, stored_prompt_set in zip(
+                index['card_hashes'], index['card_keywords'], index['card_tag_matches'],
+                index['stored_prompt_sets']
+            )
+            if stored_prompt_set != fingerprint
+        ]
+        prompts = [
+            (prompt_hash, json.dumps(sorted(keywords)))
+            for prompt_hash, keywords in zip(prompt_hashes, index['prompt_keywords'])
+            if prompt_hash not in index['stored_prompts']
+        ]
+        pair_scores = [
+            (index['card_hashes'][card_idx], prompt_hashes[prompt_idx], semantic_score, automation_score)
+            for (card_idx, prompt_idx), (semantic_score, automation_score) in pair_updates.items()
+        ]
+        
+        store = AnalysisStore(self.store_path)
+        try:
+            store.save(cards, prompts, (fingerprint, prompt_hashes), pair_scores)
+        finally:
+            store.close()
+        logger.info(
+            f"💾 Banco incremental atualizado: {len(cards)} cards, {len(prompts)} prompts "
+            f"e {len(pair_scores)} scores de pares gravados"
+        )
+    
+    def _semantic_approximation(self) -> str:
+        """Identificação do modo aproximado gravada com os conjuntos de prompts ('' = exato)"""
+        if self.semantic_mode == "minhash":
+            return f"minhash-{self.minhash_permutations}x{self.lsh_bands}"
+        return ""
+    
+    @staticmethod
+    def _content_hash(*parts: str) -> str:
+        """Hash do conteúdo usado como chave no banco incremental"""
+        return hashlib.sha1('\x00'.join(parts).encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _card_text(card: SmartTrelloCard) -> str:
+        """Texto normalizado do card usado nos scores"""
+        return (card.name + " " + card.desc).lower()
+    
+    @staticmethod
+    def _prompt_text(prompt: SmartGitHubPrompt) -> str:
+        """Texto normalizado do prompt usado nos scores"""
+        return (prompt.filename + " " + prompt.content).lower()
     
     def _calculate_semantic_similarity(self, card: SmartTrelloCard, prompt: SmartGitHubPrompt) -> float:
         """Calcula similaridade semântica"""
-        card_text = (card.name + " " + card.desc).lower()
-        prompt_text = (prompt.filename + " " + prompt.content).lower()
+        card_text = self._card_text(card)
+        prompt_text = self._prompt_text(prompt)
         
         # Extrair palavras-chave
         card_keywords = self._extract_keywords(card_text)
         prompt_keywords = self._extract_keywords(prompt_text)
         
+        return self._jaccard_similarity(set(card_keywords), set(prompt_keywords))
+    
+    @staticmethod
+    def _jaccard_similarity(card_keywords: set, prompt_keywords: set) -> float:
+        """Índice de Jaccard entre dois conjuntos de palavras-chave"""
         if not card_keywords or not prompt_keywords:
             return 0.0
         
         # Calcular intersecção
-        intersection = len(set(card_keywords).intersection(set(prompt_keywords)))
-        union = len(set(card_keywords).union(set(prompt_keywords)))
+        intersection = len(card_keywords.intersection(prompt_keywords))
+        union = len(card_keywords.union(prompt_keywords))
         
         return intersection / union if union > 0 else 0.0
     
+    def _calculate_semantic_matrix(self, index: Dict[str, Any],
+                                   card_indices: Optional[List[int]] = None) -> Dict[int, Dict[int, float]]:
+        """Calcula a similaridade semântica de todos os pares de uma vez
+        
+        Os tokens são convertidos em ids inteiros e os conjuntos viram matrizes
+        binárias card×vocabulário e prompt×vocabulário; a intersecção de todos os
+        pares sai de um único produto esparso. Retorna, por card, apenas os prompts
+        com similaridade não nula (os demais valem 0.0). Com `card_indices`, só
+        esses cards entram no produto.
+        """
+        if card_indices is None:
+            card_indices = list(range(len(index['card_keywords'])))
+        card_keywords = [index['card_keywords'][card_idx] for card_idx in card_indices]
+        prompt_keywords = index['prompt_keywords']
+        
+        # Internar tokens do lado dos prompts; tokens exclusivos dos cards não intersectam
+        vocabulary: Dict[str, int] = {}
+        for keywords in prompt_keywords:
+            for keyword in keywords:
+                vocabulary.setdefault(keyword, len(vocabulary))
+        
+        card_sizes = [len(keywords) for keywords in card_keywords]
+        prompt_sizes = [len(keywords) for keywords in prompt_keywords]
+        card_ids = [[vocabulary[k] for k in keywords if k in vocabulary] for keywords in card_keywords]
+        
+        if sparse is None:
+            # Sem SciPy: mesmo produto esparso via índice invertido
+            keyword_index = index['keyword_index']
+            rows = []
+            for card_idx, keywords in enumerate(card_keywords):
+                intersections: Dict[int, int] = {}
+                for keyword in keywords:
+                    for prompt_idx in keyword_index.get(keyword, ()):
+                        intersections[prompt_idx] = intersections.get(prompt_idx, 0) + 1
+                rows.append({
+                    prompt_idx: inter / (card_sizes[card_idx] + prompt_sizes[prompt_idx] - inter)
+                    for prompt_idx, inter in sorted(intersections.items())
+                })
+            return dict(zip(card_indices, rows))
+        
+        def to_matrix(id_lists: List[List[int]]):
+            indptr = np.zeros(len(id_lists) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum([len(ids) for ids in id_lists])
+            indices = np.fromiter((i for ids in id_lists for i in ids), dtype=np.int64, count=int(indptr[-1]))
+            data = np.ones(len(indices), dtype=np.int64)
+            return sparse.csr_matrix((data, indices, indptr), shape=(len(id_lists), len(vocabulary)))
+        
+        card_matrix = to_matrix(card_ids)
+        prompt_matrix = to_matrix([[vocabulary[k] for k in keywords] for keywords in prompt_keywords])
+        
+        # |A ∩ B| para todos os pares; |A ∪ B| = |A| + |B| - |A ∩ B|
+        intersections = (card_matrix @ prompt_matrix.T).tocsr()
+        intersections.sort_indices()
+        card_of_entry = np.repeat(np.arange(len(card_keywords)), np.diff(intersections.indptr))
+        unions = (np.asarray(card_sizes, dtype=np.int64)[card_of_entry]
+                  + np.asarray(prompt_sizes, dtype=np.int64)[intersections.indices]
+                  - intersections.data)
+        scores = intersections.data / unions
+        
+        indptr = intersections.indptr
+        prompt_indices = intersections.indices.tolist()
+        score_values = scores.tolist()
+        return {
+            card_idx: dict(zip(prompt_indices[indptr[i]:indptr[i + 1]], score_values[indptr[i]:indptr[i + 1]]))
+            for i, card_idx in enumerate(card_indices)
+        }
+    
+    # Pares por bloco no Jaccard exato dos candidatos (limita a memória das matrizes por par)
+    SEMANTIC_PAIR_CHUNK = 1 << 16
+    
+    def _calculate_semantic_pairs(self, index: Dict[str, Any],
+                                  pairs: List[Tuple[int, int]]) -> Dict[int, Dict[int, float]]:
+        """Jaccard exato de uma lista de pares (card, prompt), no formato de `_calculate_semantic_matrix`
+        
+        Memória proporcional ao número de pares: cada par é o produto elemento a
+        elemento de uma linha do card e uma do prompt nas matrizes esparsas,
+        calculado em blocos de `SEMANTIC_PAIR_CHUNK` pares.
+        """
+        card_keywords = index['card_keywords']
+        prompt_keywords = index['prompt_keywords']
+        rows: Dict[int, Dict[int, float]] = {}
+        if sparse is None or not pairs:
+            for card_idx, prompt_idx in pairs:
+                rows.setdefault(card_idx, {})[prompt_idx] = self._jaccard_similarity(
+                    card_keywords[card_idx], prompt_keywords[prompt_idx]
+                )
+            return rows
+        
+        pair_array = np.fromiter(chain.from_iterable(pairs), dtype=np.int64, count=2 * len(pairs)).reshape(-1, 2)
+        card_ids, card_rows = np.unique(pair_array[:, 0], return_inverse=True)
+        prompt_ids, prompt_rows = np.unique(pair_array[:, 1], return_inverse=True)
+        card_sets = [card_keywords[card_idx] for card_idx in card_ids.tolist()]
+        prompt_sets = [prompt_keywords[prompt_idx] for prompt_idx in prompt_ids.tolist()]
+        vocabulary: Dict[str, int] = {}
+        for keywords in prompt_sets:
+            for keyword in keywords:
+                vocabulary.setdefault(keyword, len(vocabulary))
+        
+        def to_matrix(keyword_sets: List[set], known_only: bool):
+            id_lists = [[vocabulary[k] for k in keywords if k in vocabulary] if known_only
+                        else [vocabulary[k] for k in keywords] for keywords in keyword_sets]
+            indptr = np.zeros(len(id_lists) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum([len(ids) for ids in id_lists])
+            indices = np.fromiter(chain.from_iterable(id_lists), dtype=np.int64, count=int(indptr[-1]))
+            return sparse.csr_matrix((np.ones(len(indices), dtype=np.int64), indices, indptr),
+                                     shape=(len(id_lists), len(vocabulary)))
+        
+        card_matrix = to_matrix(card_sets, known_only=True)
+        prompt_matrix = to_matrix(prompt_sets, known_only=False)
+        card_sizes = np.array([len(keywords) for keywords in card_sets], dtype=np.int64)[card_rows]
+        prompt_sizes = np.array([len(keywords) for keywords in prompt_sets], dtype=np.int64)[prompt_rows]
+        
+        # |A ∩ B| por par, em blocos de pares; |A ∪ B| = |A| + |B| - |A ∩ B|
+        intersections = np.empty(len(pairs), dtype=np.int64)
+        for start in range(0, len(pairs), self.SEMANTIC_PAIR_CHUNK):
+            end = start + self.SEMANTIC_PAIR_CHUNK
+            block = card_matrix[card_rows[start:end]].multiply(prompt_matrix[prompt_rows[start:end]])
+            intersections[start:end] = np.asarray(block.sum(axis=1)).ravel()
+        unions = card_sizes + prompt_sizes - intersections
+        scores = np.divide(intersections, unions, out=np.zeros(len(pairs)), where=unions > 0)
+        
+        # Pares chegam agrupados por card: um dicionário por trecho contíguo
+        card_list = pair_array[:, 0].tolist()
+        prompt_list = pair_array[:, 1].tolist()
+        score_list = scores.tolist()
+        bounds = [0] + (np.flatnonzero(np.diff(pair_array[:, 0])) + 1).tolist() + [len(pairs)]
+        for start, end in zip(bounds, bounds[1:]):
+            rows.setdefault(card_list[start], {}).update(zip(prompt_list[start:end], score_list[start:end]))
+        return rows
+    
+    # Palavras do card compatíveis com cada tag de automação do prompt
+    TAG_COMPATIBILITY = {
+        'API_INTEGRATION': ['api', 'integração', 'conectar', 'sincronizar'],
+        'DATA_PROCESSING': ['dados', 'relatório', 'análise', 'processamento'],
+        'AI_INTEGRATION': ['ia', 'inteligência', 'automático', 'gpt', 'ai'],
+        'TRELLO_AUTOMATION': ['trello', 'card', 'lista', 'board', 'kanban'],
+        'GOVERNMENT_APIS': ['governo', 'receita', 'cnpj', 'cep', 'ibge'],
+        'WEBHOOK_HANDLER': ['webhook', 'notificação', 'evento', 'trigger'],
+        'ASYNC_PROCESSING': ['processamento', 'batch', 'assíncrono', 'paralelo']
+    }
+    
     def _calculate_automation_compatibility(self, card: SmartTrelloCard, prompt: SmartGitHubPrompt) -> float:
         """Calcula compatibilidade para automação"""
+        return self._automation_score_from_matches(
+            card, prompt, self._match_compatibility_tags(card.keyword_hits())
+        )
+    
+    def _match_compatibility_tags(self, card_hits: frozenset) -> Dict[str, int]:
+        """Conta palavras compatíveis presentes no texto do card, por tag"""
+        return {
+            tag: len(card_hits.intersection(keywords))
+            for tag, keywords in self.TAG_COMPATIBILITY.items()
+        }
+    
+    @staticmethod
+    def _automation_score_from_matches(card: SmartTrelloCard, prompt: SmartGitHubPrompt,
+                                       tag_matches: Dict[str, int]) -> float:
+        """Score de automação a partir das contagens de tags já calculadas"""
         score = 0.0
         
         # Potencial de automação do card
         score += card.automation_potential * 0.1
         
         # Compatibilidade com tags do prompt
-        card_text = (card.name + " " + card.desc).lower()
-        
-        tag_compatibility = {
-            'API_INTEGRATION': ['api', 'integração', 'conectar', 'sincronizar'],
-            'DATA_PROCESSING': ['dados', 'relatório', 'análise', 'processamento'],
-            'AI_INTEGRATION': ['ia', 'inteligência', 'automático', 'gpt', 'ai'],
-            'TRELLO_AUTOMATION': ['trello', 'card', 'lista', 'board', 'kanban'],
-            'GOVERNMENT_APIS': ['governo', 'receita', 'cnpj', 'cep', 'ibge'],
-            'WEBHOOK_HANDLER': ['webhook', 'notificação', 'evento', 'trigger'],
-            'ASYNC_PROCESSING': ['processamento', 'batch', 'assíncrono', 'paralelo']
-        }
-        
         for tag in prompt.automation_tags:
-            if tag in tag_compatibility:
-                keywords = tag_compatibility[tag]
-                matches = sum(1 for keyword in keywords if keyword in card_text)
-                score += matches * 0.15
+            if tag in tag_matches:
+                score += tag_matches[tag] * 0.15
         
         return min(score, 1.0)
     
@@ -730,7 +2753,8 @@ class UniversalAPIConnector:
     
     def _calculate_implementation_priority(self, score: float, card: SmartTrelloCard, prompt: SmartGitHubPrompt) -> str:
         """Calcula prioridade de implementação"""
-        priority_score = (score * 0.5) + (card.priority_score / 10.0 * 0.3) + (card.business_value / 10.0 * 0.2)
+        priority_base, business_base = self._priority_components(card)
+        priority_score = (score * 0.5) + priority_base + business_base
         
         if priority_score > 0.8:
             return "CRÍTICA"
@@ -741,8 +2765,18 @@ class UniversalAPIConnector:
         else:
             return "BAIXA"
     
+    @staticmethod
+    def _priority_components(card: SmartTrelloCard) -> Tuple[float, float]:
+        """Parcelas do card na prioridade de implementação (prioridade e valor de negócio)"""
+        return card.priority_score / 10.0 * 0.3, card.business_value / 10.0 * 0.2
+    
     def _estimate_roi(self, card: SmartTrelloCard, prompt: SmartGitHubPrompt) -> str:
         """Estima ROI da implementação"""
+        return self._estimate_card_roi(card)
+    
+    @staticmethod
+    def _estimate_card_roi(card: SmartTrelloCard) -> str:
+        """Faixa de ROI do card (não depende do prompt correlacionado)"""
         roi_score = (card.business_value + card.automation_potential) / 2.0
         
         if roi_score > 8:
@@ -808,72 +2842,57 @@ class UniversalAPIConnector:
         
         return steps
     
-    def generate_executive_summary(self, correlations: List[Dict]) -> Dict:
-        """Gera resumo executivo da análise"""
-        if not correlations:
-            return {"error": "Nenhuma correlação encontrada"}
-        
-        # Estatísticas gerais
-        total_correlations = len(correlations)
-        high_priority = len([c for c in correlations if c['implementation_priority'] in ['CRÍTICA', 'ALTA']])
-        avg_score = sum(c['final_score'] for c in correlations) / total_correlations
-        
-        # Top correlações
-        top_correlations = correlations[:5]
-        
-        # Categorias mais relevantes
-        categories = {}
-        for c in correlations:
-            cat = c['prompt_category']
-            if cat not in categories:
-                categories[cat] = {'count': 0, 'avg_score': 0, 'total_score': 0}
-            categories[cat]['count'] += 1
-            categories[cat]['total_score'] += c['final_score']
+    def generate_executive_summary(self, correlations: Optional[List[Dict]] = None) -> Dict:
+        """Gera resumo executivo da análise
         
-        for cat in categories:
-            categories[cat]['avg_score'] = categories[cat]['total_score'] / categories[cat]['count']
-        
-        # ROI estimado
-        roi_distribution = {}
-        for c in correlations:
-            roi = c['estimated_roi']
-            roi_distribution[roi] = roi_distribution.get(roi, 0) + 1
+        Sem `correlations`, usa o acumulador preenchido durante a pontuação (O(1),
+        cobre todas as correlações acima do threshold); com a lista, resume-a em
+        uma única passada.
+        """
+        if correlations is not None:
+            accumulator = SummaryAccumulator.from_correlations(correlations)
+        else:
+            accumulator = self.summary_accumulator
+        if accumulator is None or not accumulator.count:
+            return {"error": "Nenhuma correlação encontrada"}
         
-        return {
+        summary = {
             'analysis_date': datetime.now().isoformat(),
             'total_cards_analyzed': len(self.cards),
             'total_prompts_analyzed': len(self.prompts),
-            'total_correlations_found': total_correlations,
-            'high_priority_items': high_priority,
-            'average_correlation_score': round(avg_score, 3),
-            'top_correlations': top_correlations,
-            'categories_analysis': categories,
-            'roi_distribution': roi_distribution,
-            'recommendations': self._generate_executive_recommendations(correlations)
+            'total_correlations_found': accumulator.count,
+            'high_priority_items': accumulator.high_priority,
+            'average_correlation_score': round(accumulator.total_score / accumulator.count, 3),
+            'top_correlations': accumulator.top_correlations,
+            'categories_analysis': accumulator.categories_analysis(),
+            'roi_distribution': dict(accumulator.roi_distribution),
+            'recommendations': self._generate_executive_recommendations(accumulator)
         }
+        
+        # No modo top_k apenas as K melhores correlações são materializadas
+        if self.top_k is not None:
+            summary['top_k'] = self.top_k
+            summary['total_correlations_above_threshold'] = self.correlation_stats.get(
+                'correlations_found', accumulator.count
+            )
+            summary['total_correlations_kept'] = self.correlation_stats.get('correlations_kept', accumulator.count)
+        
+        return summary
     
-    def _generate_executive_recommendations(self, correlations: List[Dict]) -> List[str]:
+    def _generate_executive_recommendations(self, accumulator: SummaryAccumulator) -> List[str]:
         """Gera recomendações executivas"""
         recommendations = []
         
-        high_priority = [c for c in correlations if c['implementation_priority'] in ['CRÍTICA', 'ALTA']]
-        
-        if len(high_priority) > 0:
-            recommendations.append(f"🎯 Focar nos {len(high_priority)} itens de alta prioridade para máximo impacto")
+        if accumulator.high_priority > 0:
+            recommendations.append(f"🎯 Focar nos {accumulator.high_priority} itens de alta prioridade para máximo impacto")
         
         # Análise por categoria
-        categories = {}
-        for c in correlations:
-            cat = c['prompt_category']
-            categories[cat] = categories.get(cat, 0) + 1
-        
-        top_category = max(categories.items(), key=lambda x: x[1])
-        recommendations.append(f"🔥 Categoria '{top_category[0]}' tem maior potencial ({top_category[1]} correlações)")
+        top_category = max(accumulator.categories.items(), key=lambda x: x[1][0])
+        recommendations.append(f"🔥 Categoria '{top_category[0]}' tem maior potencial ({top_category[1][0]} correlações)")
         
         # ROI
-        high_roi = len([c for c in correlations if 'ALTO' in c['estimated_roi']])
-        if high_roi > 0:
-            recommendations.append(f"💰 {high_roi} oportunidades com ROI alto identificadas")
+        if accumulator.high_roi > 0:
+            recommendations.append(f"💰 {accumulator.high_roi} oportunidades com ROI alto identificadas")
         
         recommendations.append("⚡ Implementar automações em fases para reduzir riscos")
         recommendations.append("📊 Estabelecer métricas de sucesso antes da implementação")
@@ -881,62 +2900,209 @@ class UniversalAPIConnector:
         return recommendations
     
     def run_complete_analysis(self) -> Dict:
-        """Executa análise completa do sistema"""
+        """Executa análise completa do sistema
+        
+        Cada fase vira um span (tempo de parede, CPU, contadores e, com
+        `trace_memory`, pico do tracemalloc) exposto em result['performance']
+        e, com `trace_path`, num arquivo de trace do Chrome.
+        """
         logger.info("🚀 Iniciando análise completa do sistema...")
+        tracer = PerformanceTracer(self.trace_memory)
         
         # Carregar dados
-        if not self.load_and_analyze_trello():
-            return {"success": False, "error": "Falha ao carregar dados do Trello"}
-        
-        if not self.load_and_analyze_github():
-            return {"success": False, "error": "Falha ao carregar dados do GitHub"}
+        with tracer.span('load_trello') as counters:
+            loaded = self.load_and_analyze_trello()
+            counters.update(cards=len(self.cards), lists=len(self.lists))
+        if not loaded:
+            return self._finish_trace(tracer, {"success": False, "error": "Falha ao carregar dados do Trello"})
+        
+        with tracer.span('load_prompts') as counters:
+            loaded = self.load_and_analyze_github()
+            counters['prompts'] = len(self.prompts)
+        if not loaded:
+            return self._finish_trace(tracer, {"success": False, "error": "Falha ao carregar dados do GitHub"})
         
         # Criar correlações
-        correlations = self.create_intelligent_correlations()
+        with tracer.span('correlate', semantic_mode=self.semantic_mode, workers=self.workers) as counters:
+            correlations = self.create_intelligent_correlations()
+            counters.update(self.correlation_stats)
         
         # Gerar resumo executivo
-        executive_summary = self.generate_executive_summary(correlations)
+        with tracer.span('summarize', correlations=len(correlations)):
+            executive_summary = self.generate_executive_summary()
         
         # Preparar resultado final
-        result = {
-            'success': True,
-            'executive_summary': executive_summary,
-            'detailed_correlations': correlations,
-            'cards_analysis': [asdict(card) for card in self.cards],
-            'prompts_analysis': [asdict(prompt) for prompt in self.prompts]
-        }
+        with tracer.span('build_result', cards=len(self.cards), prompts=len(self.prompts)):
+            result = {
+                'success': True,
+                'executive_summary': executive_summary,
+                'detailed_correlations': correlations,
+                'cards_analysis': [asdict(card) for card in self.cards],
+                'prompts_analysis': [asdict(prompt) for prompt in self.prompts]
+            }
         
         # Salvar resultados
-        with open('final_analysis_complete.json', 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
-        
-        # Gerar código de implementação
-        implementation_code = self._generate_production_code(correlations)
-        with open('production_implementation.py', 'w', encoding='utf-8') as f:
-            f.write(implementation_code)
-        
-        # Gerar documentação
-        documentation = self._generate_documentation(correlations, executive_summary)
-        with open('implementation_guide.md', 'w', encoding='utf-8') as f:
-            f.write(documentation)
+        if self.output_format in ("json", "both"):
+            with tracer.span('write_analysis_json') as counters:
+                with open('final_analysis_complete.json', 'w', encoding='utf-8') as f:
+                    json.dump(result, f, indent=2, ensure_ascii=False)
+                    counters['bytes'] = f.tell()
+        if self.output_format in ("compact", "both"):
+            with tracer.span('write_analysis_compact') as counters:
+                counters['bytes'] = CompactAnalysisFile.write(result, self.COMPACT_RESULT_PATH)
+        with tracer.span('write_result_index', correlations=len(correlations)) as counters:
+            counters['bytes'] = IndexedResultFile.write(correlations, self.RESULT_INDEX_PATH)
+        
+        # Gerar código de implementação e documentação (só regrava se as entradas mudaram)
+        self._write_generated_output(
+            tracer, 'production_code', 'production_implementation.py', PRODUCTION_CODE_TEMPLATE,
+            lambda: self._production_code_inputs(correlations)
+        )
+        self._write_generated_output(
+            tracer, 'documentation', 'implementation_guide.md', DOCUMENTATION_TEMPLATE,
+            lambda: self._documentation_inputs(correlations, executive_summary)
+        )
         
         logger.info("✅ Análise completa finalizada com sucesso!")
+        # Os spans só terminam depois da gravação, por isso `performance` não vai para o JSON salvo
+        return self._finish_trace(tracer, result)
+    
+    def _finish_trace(self, tracer: PerformanceTracer, result: Dict) -> Dict:
+        """Anexa os spans ao resultado, registra as fases e grava o trace do Chrome"""
+        tracer.stop()
+        result['performance'] = tracer.report()
+        logger.info("⏱️ Fases: " + " | ".join(
+            f"{span['name']} {span['wall_seconds']:.2f}s" for span in tracer.spans
+        ))
+        if self.trace_path:
+            tracer.write_chrome_trace(self.trace_path)
+            logger.info(f"🧭 Trace de desempenho salvo em {self.trace_path}")
         return result
     
+    def _production_code_inputs(self, correlations: List[Dict]) -> Dict[str, Any]:
+        """Campos do template do código de produção (sem a data de geração)"""
+        high_priority = [c for c in correlations if c['implementation_priority'] in ['CRÍTICA', 'ALTA']]
+        return {
+            'correlation_count': len(correlations),
+            'high_priority_count': len(high_priority),
+            'categories': ", ".join(dict.fromkeys(c['prompt_category'] for c in correlations[:5])),
+            'tasks': json.dumps([{
+                'card_id': c['card_id'],
+                'card_name': c['card_name'],
+                'prompt_category': c['prompt_category'],
+                'priority': c['implementation_priority'],
+                'actions': c['suggested_actions'],
+                'estimated_roi': c['estimated_roi'],
+                'implementation_steps': c['implementation_steps']
+            } for c in high_priority], indent=12)
+        }
+    
     def _generate_production_code(self, correlations: List[Dict]) -> str:
         """Gera código de produção otimizado"""
+        return self._render_template(PRODUCTION_CODE_TEMPLATE, self._production_code_inputs(correlations))
+    
+    def _documentation_inputs(self, correlations: List[Dict], executive_summary: Dict) -> Dict[str, Any]:
+        """Campos do template da documentação (sem a data de geração)"""
         high_priority = [c for c in correlations if c['implementation_priority'] in ['CRÍTICA', 'ALTA']]
-        
-        code = f'''#!/usr/bin/env python3.11
+        items = "".join(
+            DOCUMENTATION_ITEM_TEMPLATE.format(
+                i=i,
+                actions="\n".join(f"- {action}" for action in item['suggested_actions']),
+                steps="\n".join(f"{step}" for step in item['implementation_steps']),
+                **item
+            )
+            for i, item in enumerate(high_priority[:10], 1)  # Top 10
+        )
+        categories = "".join(
+            DOCUMENTATION_CATEGORY_TEMPLATE.format(
+                category=category,
+                count=data['count'],
+                avg_score=data['avg_score'],
+                recommendation="Implementar imediatamente" if data['avg_score'] > 0.6 else "Avaliar oportunidades"
+            )
+            for category, data in executive_summary.get('categories_analysis', {}).items()
+        )
+        return {
+            'analysis_date': executive_summary['analysis_date'],
+            'total_cards_analyzed': executive_summary['total_cards_analyzed'],
+            'total_prompts_analyzed': executive_summary['total_prompts_analyzed'],
+            'total_correlations_found': executive_summary['total_correlations_found'],
+            'high_priority_items': executive_summary['high_priority_items'],
+            'average_correlation_score': executive_summary['average_correlation_score'],
+            'recommendations': "\n".join(f"- {rec}" for rec in executive_summary['recommendations']),
+            'high_priority_count': len(high_priority),
+            'items': items,
+            'categories': categories,
+            'roi_distribution': "".join(
+                f"- **{roi}:** {count} oportunidades\n"
+                for roi, count in executive_summary.get('roi_distribution', {}).items()
+            )
+        }
+    
+    def _generate_documentation(self, correlations: List[Dict], executive_summary: Dict) -> str:
+        """Gera documentação completa"""
+        return self._render_template(DOCUMENTATION_TEMPLATE, self._documentation_inputs(correlations, executive_summary))
+    
+    @staticmethod
+    def _template_fingerprint(template: str, inputs: Dict[str, Any]) -> str:
+        """SHA-256 do template e das entradas; a data da análise não conta (reexecuções iguais não mudam)"""
+        digest = hashlib.sha256(template.encode('utf-8'))
+        stable = {key: value for key, value in inputs.items() if key != 'analysis_date'}
+        digest.update(json.dumps(stable, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _render_template(self, template: str, inputs: Dict[str, Any], fingerprint: Optional[str] = None) -> str:
+        """Preenche o template com as entradas, o fingerprint e a data de geração"""
+        return template.format(
+            fingerprint=fingerprint or self._template_fingerprint(template, inputs),
+            generated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            **inputs
+        )
+    
+    @staticmethod
+    def _output_fingerprint(path: str) -> Optional[str]:
+        """Fingerprint gravado no cabeçalho de um arquivo gerado (None se não existe)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                head = f.read(OUTPUT_FINGERPRINT_HEAD)
+        except (OSError, UnicodeDecodeError):
+            return None
+        match = OUTPUT_FINGERPRINT_PATTERN.search(head)
+        return match.group(1) if match else None
+    
+    def _write_generated_output(self, tracer: PerformanceTracer, name: str, path: str, template: str,
+                                build_inputs) -> bool:
+        """Renderiza e grava `path` só quando o fingerprint das entradas muda; True se gravou"""
+        with tracer.span(f'generate_{name}') as counters:
+            inputs = build_inputs()
+            fingerprint = self._template_fingerprint(template, inputs)
+            counters['unchanged'] = fingerprint == self._output_fingerprint(path)
+            if counters['unchanged']:
+                logger.info(f"♻️ {path} inalterado (mesmas entradas): arquivo mantido")
+                return False
+            content = self._render_template(template, inputs, fingerprint)
+        with tracer.span(f'write_{name}') as counters:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+                counters['bytes'] = f.tell()
+        return True
+
+# Templates do código de produção e da documentação, preparados uma vez no import.
+# Cada arquivo gerado leva o fingerprint das entradas no cabeçalho.
+OUTPUT_FINGERPRINT_PATTERN = re.compile(r"Fingerprint das entradas: ([0-9a-f]{64})")
+OUTPUT_FINGERPRINT_HEAD = 1024  # Bytes lidos do início do arquivo para achar o fingerprint
+
+PRODUCTION_CODE_TEMPLATE = '''#!/usr/bin/env python3.11
 """
 Sistema de Automação de Produção - Arte Comercial
 Código gerado automaticamente baseado em análise inteligente
-Data: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+Data: {generated_at}
+Fingerprint das entradas: {fingerprint}
 
 RESUMO DA ANÁLISE:
-- {len(correlations)} correlações identificadas
-- {len(high_priority)} itens de alta prioridade
-- Categorias principais: {", ".join(set(c['prompt_category'] for c in correlations[:5]))}
+- {correlation_count} correlações identificadas
+- {high_priority_count} itens de alta prioridade
+- Categorias principais: {categories}
 """
 
 import asyncio
@@ -971,10 +3137,231 @@ class AutomationTask:
     estimated_roi: str
     implementation_steps: List[str]
 
+class TrelloBatchReader:
+    """Agrupa leituras do Trello em chamadas ao /1/batch
+    
+    As leituras pedidas dentro de uma janela curta (ou até juntar 10 rotas, o
+    máximo do /1/batch) saem numa única requisição; cada chamador aguarda o
+    próprio future, resolvido com o JSON da sua rota (None em caso de erro).
+    Rotas repetidas na mesma janela viram uma só. Se o /1/batch falhar, as
+    rotas do lote são lidas uma a uma.
+    """
+    
+    MAX_BATCH_URLS = 10  # Limite do endpoint /1/batch
+    WINDOW = 0.005  # Segundos de espera para juntar leituras
+    
+    def __init__(self, engine: 'ProductionAutomationEngine', window: Optional[float] = None):
+        self.engine = engine
+        self.window = self.WINDOW if window is None else window
+        self._pending: Dict[str, List[asyncio.Future]] = {{}}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._batches: set = set()
+        self.metrics = {{'reads': 0, 'batch_requests': 0, 'batched_urls': 0, 'fallback_requests': 0}}
+    
+    async def get(self, route: str) -> Optional[Dict]:
+        """Lê uma rota da API (ex.: /cards/<id>) pela próxima chamada em lote"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.metrics['reads'] += 1
+        self._pending.setdefault(route, []).append(future)
+        if len(self._pending) >= self.MAX_BATCH_URLS:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+    
+    async def drain(self):
+        """Envia o que estiver pendente e aguarda os lotes em andamento"""
+        self._flush()
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+    
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {{}}
+        routes = list(pending.items())
+        for start in range(0, len(routes), self.MAX_BATCH_URLS):
+            batch = asyncio.ensure_future(self._fetch(dict(routes[start:start + self.MAX_BATCH_URLS])))
+            self._batches.add(batch)
+            batch.add_done_callback(self._batches.discard)
+    
+    async def _fetch(self, routes: Dict[str, List[asyncio.Future]]):
+        """Uma requisição /1/batch; cada item da resposta é {{"<status>": corpo}}"""
+        engine = self.engine
+        results: Optional[List] = None
+        self.metrics['batch_requests'] += 1
+        self.metrics['batched_urls'] += len(routes)
+        params = {{'urls': ','.join(routes), 'key': engine.trello_api_key, 'token': engine.trello_token}}
+        try:
+            session = await engine.get_session()
+            async with session.get(f"{{engine.trello_base_url}}/batch", params=params) as response:
+                if response.status == 200:
+                    results = await response.json()
+                else:
+                    logger.error(f"Erro no lote do Trello ({{response.status}}) com {{len(routes)}} rotas")
+        except Exception as e:
+            logger.error(f"Erro no lote do Trello com {{len(routes)}} rotas: {{e}}")
+        
+        if results is None:
+            # /1/batch indisponível: uma leitura por rota
+            data = await asyncio.gather(*(self._fetch_single(route) for route in routes))
+        else:
+            data = [item.get('200') if isinstance(item, dict) else None
+                    for item in results[:len(routes)]]
+            data += [None] * (len(routes) - len(data))
+        for route_data, futures in zip(data, routes.values()):
+            for future in futures:
+                if not future.done():
+                    future.set_result(route_data)
+    
+    async def _fetch_single(self, route: str) -> Optional[Dict]:
+        """Leitura direta de uma rota (fallback quando o /1/batch falha)"""
+        engine = self.engine
+        self.metrics['fallback_requests'] += 1
+        params = {{'key': engine.trello_api_key, 'token': engine.trello_token}}
+        try:
+            session = await engine.get_session()
+            async with session.get(f"{{engine.trello_base_url}}{{route}}", params=params) as response:
+                if response.status == 200:
+                    return await response.json()
+                logger.error(f"Erro ao ler {{route}} do Trello ({{response.status}})")
+        except Exception as e:
+            logger.error(f"Erro ao ler {{route}} do Trello: {{e}}")
+        return None
+
+class TrelloWriteBuffer:
+    """Write-behind das alterações de cards do Trello
+    
+    As alterações de campos de um mesmo card são apenas enfileiradas e
+    mescladas (o valor mais recente de cada campo vence; textos anexados à
+    descrição se acumulam) até saírem numa única PUT: em `flush(card_id)`, ao
+    fim da automação, no timer ou no encerramento. `update` e `append_to_desc`
+    não bloqueiam: devolvem um future resolvido com True/False conforme a PUT.
+    """
+    
+    FLUSH_INTERVAL = 0.5  # Segundos entre a primeira alteração pendente e a gravação
+    
+    def __init__(self, engine: 'ProductionAutomationEngine', flush_interval: Optional[float] = None):
+        self.engine = engine
+        self.flush_interval = self.FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self._pending: Dict[str, Dict] = {{}}  # card_id -> {{'fields': {{...}}, 'futures': [...]}}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set = set()
+        self._inflight: Dict[str, asyncio.Future] = {{}}  # PUT em andamento de cada card
+        # Descrição da PUT em andamento de cada card (base dos anexos feitos enquanto ela não termina)
+        self._sent_desc: Dict[str, str] = {{}}
+        self.metrics = {{'writes': 0, 'put_requests': 0, 'failed_puts': 0}}
+    
+    def update(self, card_id: str, fields: Dict) -> asyncio.Future:
+        """Enfileira a alteração de campos do card (o future resolve quando ela for gravada)"""
+        entry = self._entry(card_id)
+        entry['fields'].update(fields)
+        return self._future(entry)
+    
+    def append_to_desc(self, card_id: str, current_desc: str, text: str) -> asyncio.Future:
+        """Anexa texto à descrição sem perder anexos pendentes ou com a PUT em andamento"""
+        entry = self._entry(card_id)
+        fields = entry['fields']
+        fields['desc'] = fields.get('desc', self._sent_desc.get(card_id, current_desc)) + text
+        return self._future(entry)
+    
+    async def flush(self, card_id: Optional[str] = None):
+        """Grava agora as alterações pendentes (uma PUT por card) e aguarda; com `card_id`, só as do card"""
+        if card_id is None:
+            pending, self._pending = self._pending, {{}}
+        else:
+            entry = self._pending.pop(card_id, None)
+            pending = {{card_id: entry}} if entry else {{}}
+        if not self._pending and self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for pending_card_id, entry in pending.items():
+            self._start_put(pending_card_id, entry)
+        if card_id is None:
+            waiting = list(self._inflight.values())
+        else:
+            # A última PUT do card só termina depois das anteriores
+            waiting = [self._inflight[card_id]] if card_id in self._inflight else []
+        if waiting:
+            await asyncio.gather(*waiting, return_exceptions=True)
+    
+    def _entry(self, card_id: str) -> Dict:
+        entry = self._pending.get(card_id)
+        if entry is None:
+            entry = self._pending[card_id] = {{'fields': {{}}, 'futures': []}}
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._flush_on_timer)
+        return entry
+    
+    def _future(self, entry: Dict) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        entry['futures'].append(future)
+        self.metrics['writes'] += 1
+        return future
+    
+    def _flush_on_timer(self):
+        self._timer = None
+        flush = asyncio.ensure_future(self.flush())
+        self._flushes.add(flush)
+        flush.add_done_callback(self._flushes.discard)
+    
+    def _start_put(self, card_id: str, entry: Dict) -> asyncio.Future:
+        # Anexos feitos enquanto a PUT está em andamento partem da descrição já enviada
+        if 'desc' in entry['fields']:
+            self._sent_desc[card_id] = entry['fields']['desc']
+        # PUTs do mesmo card saem em ordem: cada uma espera a anterior terminar
+        put = asyncio.ensure_future(self._put(card_id, entry, self._inflight.get(card_id)))
+        self._inflight[card_id] = put
+        put.add_done_callback(lambda done: self._inflight.pop(card_id) if self._inflight.get(card_id) is done else None)
+        return put
+    
+    async def _put(self, card_id: str, entry: Dict, previous: Optional[asyncio.Future]):
+        if previous is not None:
+            await asyncio.wait([previous])
+        fields = entry['fields']
+        self.metrics['put_requests'] += 1
+        success = await self.engine.put_trello_card(card_id, fields)
+        # Gravada ou não, a PUT terminou: os próximos anexos partem da descrição lida pelo chamador
+        if 'desc' in fields and self._sent_desc.get(card_id) is fields['desc']:
+            del self._sent_desc[card_id]
+        if not success:
+            self.metrics['failed_puts'] += 1
+        for future in entry['futures']:
+            if not future.done():
+                future.set_result(success)
+
 class ProductionAutomationEngine:
-    """Motor de automação para produção"""
-    
-    def __init__(self):
+    """Motor de automação para produção
+    
+    As tarefas rodam em paralelo com um limite global de concorrência, um
+    limite por categoria (cada categoria depende de uma API externa diferente)
+    e um timeout por tarefa, então uma chamada lenta não trava o lote inteiro.
+    """
+    
+    # Concorrência máxima de tarefas (todas as categorias)
+    MAX_CONCURRENCY = int(os.getenv('AUTOMATION_MAX_CONCURRENCY', '20'))
+    # Concorrência por categoria, conforme a API externa de cada uma
+    CATEGORY_CONCURRENCY = {{
+        'AI_Integration': 4,
+        'Government_APIs': 2,  # receitaws/viacep limitam requisições por minuto
+        'Trello_Automation': 10,
+        'Data_Processing': 10,
+        'API_Integration': 5
+    }}
+    DEFAULT_CATEGORY_CONCURRENCY = 5
+    # Tempo máximo de uma tarefa (segundos)
+    TASK_TIMEOUT = float(os.getenv('AUTOMATION_TASK_TIMEOUT', '60'))
+    # Pool de conexões HTTP compartilhado por todas as chamadas de API
+    HTTP_POOL_LIMIT = 100  # Conexões abertas no total
+    HTTP_POOL_LIMIT_PER_HOST = 10  # Conexões por host (Trello, receitaws, viacep...)
+    HTTP_DNS_CACHE_TTL = 300  # Segundos de cache das resoluções DNS
+    HTTP_KEEPALIVE_TIMEOUT = 30  # Segundos que uma conexão ociosa fica aberta para reúso
+    HTTP_REQUEST_TIMEOUT = 30  # Segundos por requisição
+    
+    def __init__(self, max_concurrency: Optional[int] = None, category_concurrency: Optional[Dict[str, int]] = None,
+                 task_timeout: Optional[float] = None):
         # Configurações de API (carregar de variáveis de ambiente)
         self.trello_api_key = os.getenv('TRELLO_API_KEY')
         self.trello_token = os.getenv('TRELLO_TOKEN')
@@ -985,44 +3372,136 @@ class ProductionAutomationEngine:
         self.trello_base_url = "https://api.trello.com/1"
         self.github_base_url = "https://api.github.com"
         
+        # Limites de execução
+        self.max_concurrency = max_concurrency or self.MAX_CONCURRENCY
+        self.category_concurrency = dict(self.CATEGORY_CONCURRENCY, **(category_concurrency or {{}}))
+        self.task_timeout = task_timeout or self.TASK_TIMEOUT
+        
+        # Sessão HTTP compartilhada (criada no primeiro uso; fechar com close() ou `async with`)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.http_metrics = {{
+            'requests': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+            'dns_cache_hits': 0,
+            'dns_cache_misses': 0
+        }}
+        # Leituras de cards agrupadas em chamadas /1/batch
+        self.card_reader = TrelloBatchReader(self)
+        # Alterações de cards mescladas numa PUT por card (write-behind)
+        self.card_writer = TrelloWriteBuffer(self)
+        
         # Tarefas de alta prioridade
-        self.high_priority_tasks = [
-{json.dumps([{
-    'card_id': c['card_id'],
-    'card_name': c['card_name'],
-    'prompt_category': c['prompt_category'],
-    'priority': c['implementation_priority'],
-    'actions': c['suggested_actions'],
-    'estimated_roi': c['estimated_roi'],
-    'implementation_steps': c['implementation_steps']
-} for c in high_priority], indent=12)}
-        ]
+        self.high_priority_tasks = {tasks}
         
         # Status de execução
         self.execution_status = {{
             'started_at': None,
+            'finished_at': None,
             'completed_tasks': 0,
             'failed_tasks': 0,
+            'timed_out_tasks': 0,  # Também contadas em failed_tasks
+            'running_tasks': 0,
+            'peak_concurrency': 0,
             'total_tasks': len(self.high_priority_tasks)
         }}
     
+    async def __aenter__(self) -> 'ProductionAutomationEngine':
+        await self.get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Sessão HTTP do motor: conexões keep-alive reaproveitadas e DNS em cache"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.HTTP_POOL_LIMIT,
+                limit_per_host=self.HTTP_POOL_LIMIT_PER_HOST,
+                ttl_dns_cache=self.HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=self.HTTP_KEEPALIVE_TIMEOUT
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.HTTP_REQUEST_TIMEOUT),
+                trace_configs=[self._http_trace_config()]
+            )
+        return self._session
+    
+    async def close(self):
+        """Grava as alterações pendentes, conclui as leituras em lote e fecha a sessão HTTP"""
+        await self.card_writer.flush()
+        await self.card_reader.drain()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    def _http_trace_config(self) -> aiohttp.TraceConfig:
+        """Contadores de requisições, conexões novas/reaproveitadas e cache de DNS"""
+        metrics = self.http_metrics
+        
+        def counter(name: str):
+            async def increment(session, context, params):
+                metrics[name] += 1
+            return increment
+        
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(counter('requests'))
+        trace_config.on_connection_create_end.append(counter('connections_created'))
+        trace_config.on_connection_reuseconn.append(counter('connections_reused'))
+        trace_config.on_dns_cache_hit.append(counter('dns_cache_hits'))
+        trace_config.on_dns_cache_miss.append(counter('dns_cache_misses'))
+        return trace_config
+    
     async def execute_all_automations(self):
-        """Executa todas as automações de alta prioridade"""
+        """Executa todas as automações de alta prioridade (em paralelo, dentro dos limites)"""
         self.execution_status['started_at'] = datetime.now().isoformat()
-        logger.info(f"🚀 Iniciando execução de {{len(self.high_priority_tasks)}} automações")
+        logger.info(f"🚀 Iniciando execução de {{len(self.high_priority_tasks)}} automações "
+                    f"(até {{self.max_concurrency}} simultâneas, timeout de {{self.task_timeout:.0f}}s)")
         
+        global_limit = asyncio.Semaphore(self.max_concurrency)
+        category_limits = {{}}
         for task_data in self.high_priority_tasks:
-            try:
-                await self.execute_single_automation(task_data)
-                self.execution_status['completed_tasks'] += 1
-                logger.info(f"✅ Automação concluída: {{task_data['card_name']}}")
-            except Exception as e:
-                self.execution_status['failed_tasks'] += 1
-                logger.error(f"❌ Erro na automação {{task_data['card_name']}}: {{e}}")
+            category = task_data['prompt_category']
+            if category not in category_limits:
+                category_limits[category] = asyncio.Semaphore(
+                    self.category_concurrency.get(category, self.DEFAULT_CATEGORY_CONCURRENCY)
+                )
+        
+        await asyncio.gather(*(
+            self.run_limited_automation(task_data, global_limit, category_limits[task_data['prompt_category']])
+            for task_data in self.high_priority_tasks
+        ))
+        self.execution_status['finished_at'] = datetime.now().isoformat()
         
         # Gerar relatório final
         await self.generate_execution_report()
     
+    async def run_limited_automation(self, task_data: Dict, global_limit: asyncio.Semaphore,
+                                     category_limit: asyncio.Semaphore):
+        """Executa uma automação respeitando os limites e atualiza os contadores"""
+        status = self.execution_status
+        # Vaga da categoria primeiro: tarefas de uma categoria saturada não ocupam vagas globais
+        async with category_limit:
+            async with global_limit:
+                status['running_tasks'] += 1
+                status['peak_concurrency'] = max(status['peak_concurrency'], status['running_tasks'])
+                try:
+                    await asyncio.wait_for(self.execute_single_automation(task_data), self.task_timeout)
+                except asyncio.TimeoutError:
+                    status['failed_tasks'] += 1
+                    status['timed_out_tasks'] += 1
+                    logger.error(f"⏱️ Timeout na automação {{task_data['card_name']}} ({{self.task_timeout:.0f}}s)")
+                except Exception as e:
+                    status['failed_tasks'] += 1
+                    logger.error(f"❌ Erro na automação {{task_data['card_name']}}: {{e}}")
+                else:
+                    status['completed_tasks'] += 1
+                    logger.info(f"✅ Automação concluída: {{task_data['card_name']}}")
+                finally:
+                    status['running_tasks'] -= 1
+    
     async def execute_single_automation(self, task_data: Dict):
         """Executa uma automação específica"""
         category = task_data['prompt_category']
@@ -1042,6 +3521,9 @@ class ProductionAutomationEngine:
             await self.execute_api_integration_automation(task_data)
         else:
             logger.warning(f"⚠️ Categoria desconhecida: {{category}}")
+        
+        # Alterações de campos enfileiradas pela automação saem juntas numa PUT
+        await self.card_writer.flush(card_id)
     
     async def execute_ai_automation(self, task_data: Dict):
         """Executa automação com IA"""
@@ -1059,9 +3541,7 @@ class ProductionAutomationEngine:
             ai_analysis = await self.process_with_ai(card_data)
             
             # Atualizar card com análise
-            await self.update_trello_card(card_id, {{
-                'desc': card_data.get('desc', '') + f"\\n\\n**Análise IA:**\\n{{ai_analysis}}"
-            }})
+            self.queue_card_desc_append(card_id, card_data, f"\\n\\n**Análise IA:**\\n{{ai_analysis}}")
     
     async def execute_government_api_automation(self, task_data: Dict):
         """Executa automação com APIs governamentais"""
@@ -1099,7 +3579,7 @@ class ProductionAutomationEngine:
             # Definir data de vencimento se não existir
             if not card_data.get('due'):
                 due_date = (datetime.now() + timedelta(days=7)).isoformat()
-                await self.update_trello_card(card_id, {{'due': due_date}})
+                self.queue_card_update(card_id, {{'due': due_date}})
             
             # Adicionar comentário de automação
             await self.add_card_comment(card_id, "🤖 Card processado automaticamente pelo sistema de integração")
@@ -1118,9 +3598,7 @@ class ProductionAutomationEngine:
             report = self.generate_card_report(card_data, analysis)
             
             # Anexar relatório ao card
-            await self.update_trello_card(card_id, {{
-                'desc': card_data.get('desc', '') + f"\\n\\n**Relatório de Análise:**\\n{{report}}"
-            }})
+            self.queue_card_desc_append(card_id, card_data, f"\\n\\n**Relatório de Análise:**\\n{{report}}")
     
     async def execute_api_integration_automation(self, task_data: Dict):
         """Executa automação de integração de APIs"""
@@ -1137,36 +3615,59 @@ class ProductionAutomationEngine:
     
     # Métodos auxiliares para APIs
     async def get_trello_card(self, card_id: str) -> Optional[Dict]:
-        """Busca dados de um card do Trello"""
+        """Busca dados de um card do Trello (agrupado com outras leituras via /1/batch)"""
         if not self.trello_api_key or not self.trello_token:
             return None
         
-        url = f"{{self.trello_base_url}}/cards/{{card_id}}"
-        params = {{'key': self.trello_api_key, 'token': self.trello_token}}
-        
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        return await response.json()
-        except Exception as e:
-            logger.error(f"Erro ao buscar card {{card_id}}: {{e}}")
-        
-        return None
+        card_data = await self.card_reader.get(f"/cards/{{card_id}}")
+        if card_data is None:
+            logger.error(f"Erro ao buscar card {{card_id}}")
+        return card_data
     
     async def update_trello_card(self, card_id: str, updates: Dict) -> bool:
-        """Atualiza um card do Trello"""
+        """Atualiza um card do Trello (junto com as alterações pendentes do card, numa única PUT)"""
+        write = self.queue_card_update(card_id, updates)
+        await self.card_writer.flush(card_id)
+        return await write
+    
+    async def append_to_card_desc(self, card_id: str, card_data: Dict, text: str) -> bool:
+        """Anexa texto à descrição do card e grava (anexos de várias automações se acumulam)"""
+        write = self.queue_card_desc_append(card_id, card_data, text)
+        await self.card_writer.flush(card_id)
+        return await write
+    
+    def queue_card_update(self, card_id: str, updates: Dict) -> asyncio.Future:
+        """Enfileira a atualização de um card sem bloquear
+        
+        O future resolve com True/False quando a PUT for feita
+        (`card_writer.flush(card_id)`, timer do buffer ou encerramento).
+        \"\"\"
         if not self.trello_api_key or not self.trello_token:
-            return False
-        
+            return self._resolved(False)
+        return self.card_writer.update(card_id, updates)
+    
+    def queue_card_desc_append(self, card_id: str, card_data: Dict, text: str) -> asyncio.Future:
+        """Enfileira um anexo à descrição do card sem bloquear (future como em queue_card_update)"""
+        if not self.trello_api_key or not self.trello_token:
+            return self._resolved(False)
+        return self.card_writer.append_to_desc(card_id, card_data.get('desc', ''), text)
+    
+    @staticmethod
+    def _resolved(value) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        return future
+    
+    async def put_trello_card(self, card_id: str, updates: Dict) -> bool:
+        """Grava campos de um card do Trello numa PUT"""
         url = f"{{self.trello_base_url}}/cards/{{card_id}}"
         params = {{'key': self.trello_api_key, 'token': self.trello_token}}
         params.update(updates)
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.put(url, params=params) as response:
-                    return response.status == 200
+            session = await self.get_session()
+            async with session.put(url, params=params) as response:
+                return response.status == 200
         except Exception as e:
             logger.error(f"Erro ao atualizar card {{card_id}}: {{e}}")
             return False
@@ -1184,9 +3685,9 @@ class ProductionAutomationEngine:
         }}
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, params=params) as response:
-                    return response.status == 200
+            session = await self.get_session()
+            async with session.post(url, params=params) as response:
+                return response.status == 200
         except Exception as e:
             logger.error(f"Erro ao adicionar comentário ao card {{card_id}}: {{e}}")
             return False
@@ -1215,10 +3716,10 @@ class ProductionAutomationEngine:
         url = f"https://www.receitaws.com.br/v1/cnpj/{{cnpj_clean}}"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.json()
+            session = await self.get_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    return await response.json()
         except Exception as e:
             logger.error(f"Erro ao consultar CNPJ {{cnpj}}: {{e}}")
         
@@ -1230,10 +3731,10 @@ class ProductionAutomationEngine:
         url = f"https://viacep.com.br/ws/{{cep_clean}}/json"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.json()
+            session = await self.get_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    return await response.json()
         except Exception as e:
             logger.error(f"Erro ao consultar CEP {{cep}}: {{e}}")
         
@@ -1262,25 +3763,40 @@ class ProductionAutomationEngine:
     
     async def generate_execution_report(self):
         """Gera relatório de execução"""
+        total_tasks = self.execution_status['total_tasks']
+        http_metrics = self.http_metrics
+        connections = http_metrics['connections_created'] + http_metrics['connections_reused']
         report = {{
             'execution_summary': self.execution_status,
-            'completion_rate': (self.execution_status['completed_tasks'] / self.execution_status['total_tasks']) * 100,
+            'http_metrics': dict(
+                http_metrics,
+                connection_reuse_rate=http_metrics['connections_reused'] / connections * 100 if connections else 0.0
+            ),
+            'trello_batch_reads': self.card_reader.metrics,
+            'trello_buffered_writes': self.card_writer.metrics,
+            'completion_rate': (self.execution_status['completed_tasks'] / total_tasks) * 100 if total_tasks else 0.0,
+            'limits': {{
+                'max_concurrency': self.max_concurrency,
+                'category_concurrency': self.category_concurrency,
+                'task_timeout': self.task_timeout
+            }},
             'generated_at': datetime.now().isoformat()
         }}
         
         with open('execution_report.json', 'w', encoding='utf-8') as f:
             json.dump(report, f, indent=2, ensure_ascii=False)
         
-        logger.info(f"📊 Relatório gerado: {{report['completion_rate']:.1f}}% de sucesso")
+        logger.info(f"📊 Relatório gerado: {{report['completion_rate']:.1f}}% de sucesso | "
+                    f"{{http_metrics['requests']}} requisições HTTP, "
+                    f"{{report['http_metrics']['connection_reuse_rate']:.0f}}% em conexões reaproveitadas")
 
 async def main():
     """Função principal"""
-    engine = ProductionAutomationEngine()
-    
     logger.info("🚀 Iniciando Motor de Automação de Produção")
     
     try:
-        await engine.execute_all_automations()
+        async with ProductionAutomationEngine() as engine:
+            await engine.execute_all_automations()
         logger.info("✅ Todas as automações foram executadas!")
     except Exception as e:
         logger.error(f"❌ Erro na execução: {{e}}")
@@ -1288,77 +3804,35 @@ async def main():
 if __name__ == "__main__":
     asyncio.run(main())
 '''
-        
-        return code
-    
-    def _generate_documentation(self, correlations: List[Dict], executive_summary: Dict) -> str:
-        """Gera documentação completa"""
-        high_priority = [c for c in correlations if c['implementation_priority'] in ['CRÍTICA', 'ALTA']]
-        
-        doc = f'''# Guia de Implementação - Sistema de Integração Arte Comercial
+
+DOCUMENTATION_TEMPLATE = '''<!-- Fingerprint das entradas: {fingerprint} -->
+# Guia de Implementação - Sistema de Integração Arte Comercial
 
 ## Resumo Executivo
 
-**Data da Análise:** {executive_summary['analysis_date']}
+**Data da Análise:** {analysis_date}
 
 ### Estatísticas Gerais
-- **Cards Analisados:** {executive_summary['total_cards_analyzed']}
-- **Prompts Analisados:** {executive_summary['total_prompts_analyzed']}
-- **Correlações Encontradas:** {executive_summary['total_correlations_found']}
-- **Itens de Alta Prioridade:** {executive_summary['high_priority_items']}
-- **Score Médio de Correlação:** {executive_summary['average_correlation_score']}
+- **Cards Analisados:** {total_cards_analyzed}
+- **Prompts Analisados:** {total_prompts_analyzed}
+- **Correlações Encontradas:** {total_correlations_found}
+- **Itens de Alta Prioridade:** {high_priority_items}
+- **Score Médio de Correlação:** {average_correlation_score}
 
 ### Recomendações Principais
-{chr(10).join(f"- {rec}" for rec in executive_summary['recommendations'])}
+{recommendations}
 
 ## Itens de Alta Prioridade
 
-### Implementação Imediata ({len(high_priority)} itens)
-
-'''
-        
-        for i, item in enumerate(high_priority[:10], 1):  # Top 10
-            doc += f'''
-#### {i}. {item['card_name']}
-- **Categoria:** {item['prompt_category']}
-- **Prioridade:** {item['implementation_priority']}
-- **ROI Estimado:** {item['estimated_roi']}
-- **Score de Correlação:** {item['final_score']}
-
-**Ações Sugeridas:**
-{chr(10).join(f"- {action}" for action in item['suggested_actions'])}
-
-**Passos de Implementação:**
-{chr(10).join(f"{step}" for step in item['implementation_steps'])}
+### Implementação Imediata ({high_priority_count} itens)
 
----
-'''
-        
-        doc += f'''
+{items}
 ## Análise por Categoria
 
-'''
-        
-        categories = executive_summary.get('categories_analysis', {})
-        for category, data in categories.items():
-            doc += f'''
-### {category}
-- **Correlações:** {data['count']}
-- **Score Médio:** {data['avg_score']:.3f}
-- **Recomendação:** {"Implementar imediatamente" if data['avg_score'] > 0.6 else "Avaliar oportunidades"}
-
-'''
-        
-        doc += f'''
+{categories}
 ## Distribuição de ROI
 
-'''
-        
-        roi_dist = executive_summary.get('roi_distribution', {})
-        for roi, count in roi_dist.items():
-            doc += f"- **{roi}:** {count} oportunidades\n"
-        
-        doc += f'''
+{roi_distribution}
 
 ## Configuração do Ambiente
 
@@ -1413,16 +3887,54 @@ python production_implementation.py
 ---
 
 *Documentação gerada automaticamente pelo Sistema de Integração Arte Comercial*
-*Versão: 1.0 | Data: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}*
+*Versão: 1.0 | Data: {generated_at}*
 '''
-        
-        return doc
+
+DOCUMENTATION_ITEM_TEMPLATE = '''
+#### {i}. {card_name}
+- **Categoria:** {prompt_category}
+- **Prioridade:** {implementation_priority}
+- **ROI Estimado:** {estimated_roi}
+- **Score de Correlação:** {final_score}
+
+**Ações Sugeridas:**
+{actions}
+
+**Passos de Implementação:**
+{steps}
+
+---
+'''
+
+DOCUMENTATION_CATEGORY_TEMPLATE = '''
+### {category}
+- **Correlações:** {count}
+- **Score Médio:** {avg_score:.3f}
+- **Recomendação:** {recommendation}
+
+'''
+
+# Estado de cada processo do pool de correlação (definido uma vez por worker)
+_WORKER_CONTEXT: Dict[str, Any] = {}
+
+def _init_correlation_worker(system: FinalIntegrationSystem, index: Dict[str, Any]) -> None:
+    """Recebe sistema (cards e prompts) e índice uma única vez por processo"""
+    _WORKER_CONTEXT['system'] = system
+    _WORKER_CONTEXT['index'] = index
+
+def _score_correlation_shard(card_indices: range) -> Dict[str, Any]:
+    """Pontua uma fatia de cards dentro do worker"""
+    return _WORKER_CONTEXT['system']._score_card_range(_WORKER_CONTEXT['index'], card_indices)
 
 def main():
     """Função principal"""
     system = FinalIntegrationSystem(
         trello_json_path='/home/ubuntu/upload/arte-comercial_Jason_Update.json',
-        github_repo_url='https://github.com/pietrorampazzo/arte_comercial'
+        github_repo_url='https://github.com/pietrorampazzo/arte_comercial',
+        store_path=os.getenv('ARTE_COMERCIAL_STORE_PATH'),  # Banco SQLite para reanálise incremental (opcional)
+        prompts_path=os.getenv('ARTE_COMERCIAL_PROMPTS_PATH'),  # Clone local; sem ele, dados simulados
+        trace_path=os.getenv('ARTE_COMERCIAL_TRACE_PATH'),  # Trace do Chrome das fases (opcional)
+        output_format=os.getenv('ARTE_COMERCIAL_OUTPUT_FORMAT', 'json')  # json, compact ou both
     )
     
     result = system.run_complete_analysis()
@@ -1442,7 +3954,11 @@ def main():
             print(f"   {i}. {corr['card_name']} → {corr['prompt_category']} (Score: {corr['final_score']})")
         
         print(f"\n📁 ARQUIVOS GERADOS:")
-        print("   📊 final_analysis_complete.json (análise detalhada)")
+        if system.output_format in ("json", "both"):
+            print("   📊 final_analysis_complete.json (análise detalhada)")
+        if system.output_format in ("compact", "both"):
+            print(f"   🗜️ {system.COMPACT_RESULT_PATH} (análise detalhada, formato compacto)")
+        print(f"   🗂️ {system.RESULT_INDEX_PATH} (correlações indexadas por card, prompt e categoria)")
         print("   🚀 production_implementation.py (código de produção)")
         print("   📖 implementation_guide.md (guia completo)")
         print("   📝 final_integration.log (logs detalhados)")
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3.11
+"""
+Análise de vários boards - Arte Comercial
+Carrega os prompts e monta o lado dos prompts do índice (tags, palavras-chave,
+complexidade, listas invertidas) uma única vez, e então carrega e correlaciona
+cada board em paralelo (um processo por board). O resultado traz o resumo
+executivo de cada board e um resumo mesclado, equivalente a analisar todos os
+boards concatenados num só (na ordem informada).
+
+    python multi_board_analysis.py novo_pietro.json outro_board.json --workers 4
+"""
+
+import argparse
+import copy
+import heapq
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from final_integration_system import (FinalIntegrationSystem, IndexedResultFile, PerformanceTracer,
+                                      SummaryAccumulator)
+
+logger = logging.getLogger(__name__)
+
+# Estado de cada processo do pool de boards (definido uma vez por worker)
+_BOARD_CONTEXT: Dict[str, Any] = {}
+
+class MultiBoardAnalysis:
+    """Correlaciona vários boards do Trello contra um único índice de prompts
+    
+    `boards` mapeia nome -> exportação JSON (uma lista de caminhos usa o nome
+    do arquivo). As demais opções seguem para o FinalIntegrationSystem de cada
+    board; `top_k` vale por board e cada board é pontuado num único processo.
+    """
+    
+    SUMMARY_PATH = 'multi_board_summary.json'
+    
+    def __init__(self, boards, github_repo_url: str, prompts_path: Optional[str] = None,
+                 workers: Optional[int] = None, output_dir: Optional[str] = None, **options):
+        if not isinstance(boards, dict):
+            boards = {Path(path).stem: path for path in boards}
+        self.boards: Dict[str, str] = dict(boards)
+        self.workers = workers or min(len(self.boards), os.cpu_count() or 1)
+        # Diretório dos índices de correlação por board (IndexedResultFile); None = não grava
+        self.output_dir = output_dir
+        self.options = dict(options, workers=1)
+        self.prompt_system = FinalIntegrationSystem('', github_repo_url, prompts_path=prompts_path, **self.options)
+    
+    def run(self) -> Dict:
+        """Executa a análise de todos os boards e devolve resumos por board e mesclado"""
+        logger.info(f"🚀 Iniciando análise de {len(self.boards)} boards...")
+        tracer = PerformanceTracer()
+        
+        with tracer.span('load_prompts') as counters:
+            loaded = self.prompt_system.load_and_analyze_github()
+            counters['prompts'] = len(self.prompt_system.prompts)
+        if not loaded:
+            tracer.stop()
+            return {"success": False, "error": "Falha ao carregar dados do GitHub", 'performance': tracer.report()}
+        
+        with tracer.span('build_prompt_index'):
+            self.prompt_system.prompt_index = self.prompt_system.build_prompt_index()
+        
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+        with tracer.span('analyze_boards', boards=len(self.boards), workers=self.workers):
+            board_results = self._analyze_boards()
+        
+        with tracer.span('merge_summaries'):
+            merged_summary = self._merge_summaries(board_results)
+        
+        tracer.stop()
+        result = {
+            'success': all(board['success'] for board in board_results.values()),
+            'boards': board_results,
+            'merged_summary': merged_summary,
+            'performance': tracer.report()
+        }
+        slowest = max((board['seconds'] for board in board_results.values()), default=0.0)
+        logger.info(f"✅ {len(self.boards)} boards analisados em {result['performance']['total_wall_seconds']:.2f}s "
+                    f"(board mais lento: {slowest:.2f}s)")
+        return result
+    
+    def _analyze_boards(self) -> Dict[str, Dict]:
+        """Analisa os boards em paralelo; a ordem do resultado segue a de `boards`"""
+        context = (self.prompt_system.prompts, self.prompt_system.prompt_index, self.options, self.output_dir)
+        items = list(self.boards.items())
+        if self.workers > 1 and len(items) > 1:
+            # Prompts e índice seguem uma única vez para cada worker (initializer)
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_board_worker,
+                                     initargs=context) as executor:
+                results = list(executor.map(_analyze_board_task, items))
+        else:
+            _init_board_worker(*context)
+            results = [_analyze_board_task(item) for item in items]
+        return dict(zip(self.boards, results))
+    
+    def _merge_summaries(self, board_results: Dict[str, Dict]) -> Dict:
+        """Resumo executivo dos boards somados, na ordem de `boards`"""
+        prompts = self.prompt_system.prompts
+        accumulator = SummaryAccumulator(len(prompts))
+        stats: Dict[str, int] = {}
+        card_offset = 0
+        top_lists = []
+        for board in board_results.values():
+            board_accumulator = board.pop('summary_accumulator', None)
+            if board_accumulator is not None:
+                accumulator.merge(board_accumulator, card_offset)
+                top_lists.append(board_accumulator.top_correlations)
+            card_offset += board.get('cards', 0)
+            for key, value in board.get('correlation_stats', {}).items():
+                stats[key] = stats.get(key, 0) + value
+        
+        # Empates de score: o board anterior vem primeiro (merge estável), como na análise única
+        top_correlations = list(islice(heapq.merge(*top_lists, key=lambda c: -c['final_score']),
+                                       SummaryAccumulator.TOP_CORRELATIONS))
+        accumulator.close(prompts, top_correlations)
+        
+        merged = copy.copy(self.prompt_system)
+        merged.summary_accumulator = accumulator
+        merged.correlation_stats = stats
+        summary = merged.generate_executive_summary()
+        if 'error' not in summary:
+            summary['total_cards_analyzed'] = card_offset
+            summary['boards'] = list(board_results)
+        return summary
+
+def _init_board_worker(prompts: List, prompt_index: Dict[str, Any], options: Dict[str, Any],
+                       output_dir: Optional[str]) -> None:
+    """Recebe prompts, índice dos prompts e opções uma única vez por processo"""
+    _BOARD_CONTEXT.update(prompts=prompts, prompt_index=prompt_index, options=options, output_dir=output_dir)
+
+def _analyze_board_task(item) -> Dict:
+    """Carrega e correlaciona um board dentro do worker"""
+    name, trello_json_path = item
+    started = time.perf_counter()
+    system = FinalIntegrationSystem(trello_json_path, '', **_BOARD_CONTEXT['options'])
+    system.prompts = _BOARD_CONTEXT['prompts']
+    system.prompt_index = _BOARD_CONTEXT['prompt_index']
+    
+    if not system.load_and_analyze_trello():
+        return {'success': False, 'trello_json_path': trello_json_path, 'error': "Falha ao carregar dados do Trello",
+                'seconds': round(time.perf_counter() - started, 3)}
+    
+    correlations = system.create_intelligent_correlations()
+    result = {
+        'success': True,
+        'trello_json_path': trello_json_path,
+        'cards': len(system.cards),
+        'correlation_stats': system.correlation_stats,
+        'executive_summary': system.generate_executive_summary(),
+        'summary_accumulator': system.summary_accumulator
+    }
+    if _BOARD_CONTEXT['output_dir']:
+        slug = re.sub(r'[^\w.-]+', '_', name)
+        result['result_index'] = os.path.join(_BOARD_CONTEXT['output_dir'], f"{slug}_index.bin")
+        IndexedResultFile.write(correlations, result['result_index'])
+    result['seconds'] = round(time.perf_counter() - started, 3)
+    logger.info(f"📋 Board {name}: {len(system.cards)} cards, {len(correlations)} correlações "
+                f"em {result['seconds']:.2f}s")
+    return result
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Análise de vários boards do Trello com índice de prompts único")
+    parser.add_argument('boards', nargs='+', help="Exportações JSON dos boards (nome do board = nome do arquivo)")
+    parser.add_argument('--prompts-path', default=os.getenv('ARTE_COMERCIAL_PROMPTS_PATH'),
+                        help="Clone local com os prompts (sem ele, dados simulados)")
+    parser.add_argument('--workers', type=int, help="Processos (padrão: um por board, até o número de CPUs)")
+    parser.add_argument('--semantic-mode', default='batch', choices=['batch', 'pair', 'minhash'])
+    parser.add_argument('--top-k', type=int, help="Mantém as K melhores correlações de cada board")
+    parser.add_argument('--output-dir', default='.', help="Onde gravar o resumo e os índices por board")
+    args = parser.parse_args()
+    
+    analysis = MultiBoardAnalysis(
+        args.boards,
+        github_repo_url='https://github.com/pietrorampazzo/arte_comercial',
+        prompts_path=args.prompts_path,
+        workers=args.workers,
+        output_dir=args.output_dir,
+        semantic_mode=args.semantic_mode,
+        top_k=args.top_k
+    )
+    result = analysis.run()
+    
+    summary_path = os.path.join(args.output_dir, MultiBoardAnalysis.SUMMARY_PATH)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    
+    print("🎉 ANÁLISE DE BOARDS CONCLUÍDA!" if result['success'] else "⚠️ Análise concluída com falhas")
+    for name, board in result.get('boards', {}).items():
+        if board['success']:
+            summary = board['executive_summary']
+            print(f"   📋 {name}: {board['cards']} cards, {summary.get('total_correlations_found', 0)} correlações "
+                  f"({board['seconds']}s)")
+        else:
+            print(f"   ❌ {name}: {board['error']}")
+    merged = result.get('merged_summary', {})
+    if 'error' not in merged and merged:
+        print(f"   🔗 Total: {merged['total_cards_analyzed']} cards, {merged['total_correlations_found']} correlações, "
+              f"{merged['high_priority_items']} de alta prioridade")
+    print(f"   💾 Resumos salvos em {summary_path}")
+
+if __name__ == "__main__":
+    main()
@@ -42,10 +42,231 @@ class AutomationTask:
     estimated_roi: str
     implementation_steps: List[str]
 
+class TrelloBatchReader:
+    """Agrupa leituras do Trello em chamadas ao /1/batch
+    
+    As leituras pedidas dentro de uma janela curta (ou até juntar 10 rotas, o
+    máximo do /1/batch) saem numa única requisição; cada chamador aguarda o
+    próprio future, resolvido com o JSON da sua rota (None em caso de erro).
+    Rotas repetidas na mesma janela viram uma só. Se o /1/batch falhar, as
+    rotas do lote são lidas uma a uma.
+    """
+    
+    MAX_BATCH_URLS = 10  # Limite do endpoint /1/batch
+    WINDOW = 0.005  # Segundos de espera para juntar leituras
+    
+    def __init__(self, engine: 'ProductionAutomationEngine', window: Optional[float] = None):
+        self.engine = engine
+        self.window = self.WINDOW if window is None else window
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._batches: set = set()
+        self.metrics = {'reads': 0, 'batch_requests': 0, 'batched_urls': 0, 'fallback_requests': 0}
+    
+    async def get(self, route: str) -> Optional[Dict]:
+        """Lê uma rota da API (ex.: /cards/<id>) pela próxima chamada em lote"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.metrics['reads'] += 1
+        self._pending.setdefault(route, []).append(future)
+        if len(self._pending) >= self.MAX_BATCH_URLS:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+    
+    async def drain(self):
+        """Envia o que estiver pendente e aguarda os lotes em andamento"""
+        self._flush()
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+    
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        routes = list(pending.items())
+        for start in range(0, len(routes), self.MAX_BATCH_URLS):
+            batch = asyncio.ensure_future(self._fetch(dict(routes[start:start + self.MAX_BATCH_URLS])))
+            self._batches.add(batch)
+            batch.add_done_callback(self._batches.discard)
+    
+    async def _fetch(self, routes: Dict[str, List[asyncio.Future]]):
+        """Uma requisição /1/batch; cada item da resposta é {"<status>": corpo}"""
+        engine = self.engine
+        results: Optional[List] = None
+        self.metrics['batch_requests'] += 1
+        self.metrics['batched_urls'] += len(routes)
+        params = {'urls': ','.join(routes), 'key': engine.trello_api_key, 'token': engine.trello_token}
+        try:
+            session = await engine.get_session()
+            async with session.get(f"{engine.trello_base_url}/batch", params=params) as response:
+                if response.status == 200:
+                    results = await response.json()
+                else:
+                    logger.error(f"Erro no lote do Trello ({response.status}) com {len(routes)} rotas")
+        except Exception as e:
+            logger.error(f"Erro no lote do Trello com {len(routes)} rotas: {e}")
+        
+        if results is None:
+            # /1/batch indisponível: uma leitura por rota
+            data = await asyncio.gather(*(self._fetch_single(route) for route in routes))
+        else:
+            data = [item.get('200') if isinstance(item, dict) else None
+                    for item in results[:len(routes)]]
+            data += [None] * (len(routes) - len(data))
+        for route_data, futures in zip(data, routes.values()):
+            for future in futures:
+                if not future.done():
+                    future.set_result(route_data)
+    
+    async def _fetch_single(self, route: str) -> Optional[Dict]:
+        """Leitura direta de uma rota (fallback quando o /1/batch falha)"""
+        engine = self.engine
+        self.metrics['fallback_requests'] += 1
+        params = {'key': engine.trello_api_key, 'token': engine.trello_token}
+        try:
+            session = await engine.get_session()
+            async with session.get(f"{engine.trello_base_url}{route}", params=params) as response:
+                if response.status == 200:
+                    return await response.json()
+                logger.error(f"Erro ao ler {route} do Trello ({response.status})")
+        except Exception as e:
+            logger.error(f"Erro ao ler {route} do Trello: {e}")
+        return None
+
+class TrelloWriteBuffer:
+    """Write-behind das alterações de cards do Trello
+    
+    As alterações de campos de um mesmo card são apenas enfileiradas e
+    mescladas (o valor mais recente de cada campo vence; textos anexados à
+    descrição se acumulam) até saírem numa única PUT: em `flush(card_id)`, ao
+    fim da automação, no timer ou no encerramento. `update` e `append_to_desc`
+    não bloqueiam: devolvem um future resolvido com True/False conforme a PUT.
+    """
+    
+    FLUSH_INTERVAL = 0.5  # Segundos entre a primeira alteração pendente e a gravação
+    
+    def __init__(self, engine: 'ProductionAutomationEngine', flush_interval: Optional[float] = None):
+        self.engine = engine
+        self.flush_interval = self.FLUSH_INTERVAL if flush_interval is None else flush_interval
+        self._pending: Dict[str, Dict] = {}  # card_id -> {'fields': {...}, 'futures': [...]}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushes: set = set()
+        self._inflight: Dict[str, asyncio.Future] = {}  # PUT em andamento de cada card
+        # Descrição da PUT em andamento de cada card (base dos anexos feitos enquanto ela não termina)
+        self._sent_desc: Dict[str, str] = {}
+        self.metrics = {'writes': 0, 'put_requests': 0, 'failed_puts': 0}
+    
+    def update(self, card_id: str, fields: Dict) -> asyncio.Future:
+        """Enfileira a alteração de campos do card (o future resolve quando ela for gravada)"""
+        entry = self._entry(card_id)
+        entry['fields'].update(fields)
+        return self._future(entry)
+    
+    def append_to_desc(self, card_id: str, current_desc: str, text: str) -> asyncio.Future:
+        """Anexa texto à descrição sem perder anexos pendentes ou com a PUT em andamento"""
+        entry = self._entry(card_id)
+        fields = entry['fields']
+        fields['desc'] = fields.get('desc', self._sent_desc.get(card_id, current_desc)) + text
+        return self._future(entry)
+    
+    async def flush(self, card_id: Optional[str] = None):
+        """Grava agora as alterações pendentes (uma PUT por card) e aguarda; com `card_id`, só as do card"""
+        if card_id is None:
+            pending, self._pending = self._pending, {}
+        else:
+            entry = self._pending.pop(card_id, None)
+            pending = {card_id: entry} if entry else {}
+        if not self._pending and self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for pending_card_id, entry in pending.items():
+            self._start_put(pending_card_id, entry)
+        if card_id is None:
+            waiting = list(self._inflight.values())
+        else:
+            # A última PUT do card só termina depois das anteriores
+            waiting = [self._inflight[card_id]] if card_id in self._inflight else []
+        if waiting:
+            await asyncio.gather(*waiting, return_exceptions=True)
+    
+    def _entry(self, card_id: str) -> Dict:
+        entry = self._pending.get(card_id)
+        if entry is None:
+            entry = self._pending[card_id] = {'fields': {}, 'futures': []}
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._flush_on_timer)
+        return entry
+    
+    def _future(self, entry: Dict) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        entry['futures'].append(future)
+        self.metrics['writes'] += 1
+        return future
+    
+    def _flush_on_timer(self):
+        self._timer = None
+        flush = asyncio.ensure_future(self.flush())
+        self._flushes.add(flush)
+        flush.add_done_callback(self._flushes.discard)
+    
+    def _start_put(self, card_id: str, entry: Dict) -> asyncio.Future:
+        # Anexos feitos enquanto a PUT está em andamento partem da descrição já enviada
+        if 'desc' in entry['fields']:
+            self._sent_desc[card_id] = entry['fields']['desc']
+        # PUTs do mesmo card saem em ordem: cada uma espera a anterior terminar
+        put = asyncio.ensure_future(self._put(card_id, entry, self._inflight.get(card_id)))
+        self._inflight[card_id] = put
+        put.add_done_callback(lambda done: self._inflight.pop(card_id) if self._inflight.get(card_id) is done else None)
+        return put
+    
+    async def _put(self, card_id: str, entry: Dict, previous: Optional[asyncio.Future]):
+        if previous is not None:
+            await asyncio.wait([previous])
+        fields = entry['fields']
+        self.metrics['put_requests'] += 1
+        success = await self.engine.put_trello_card(card_id, fields)
+        # Gravada ou não, a PUT terminou: os próximos anexos partem da descrição lida pelo chamador
+        if 'desc' in fields and self._sent_desc.get(card_id) is fields['desc']:
+            del self._sent_desc[card_id]
+        if not success:
+            self.metrics['failed_puts'] += 1
+        for future in entry['futures']:
+            if not future.done():
+                future.set_result(success)
+
 class ProductionAutomationEngine:
-    """Motor de automação para produção"""
+    """Motor de automação para produção
+    
+    As tarefas rodam em paralelo com um limite global de concorrência, um
+    limite por categoria (cada categoria depende de uma API externa diferente)
+    e um timeout por tarefa, então uma chamada lenta não trava o lote inteiro.
+    """
+    
+    # Concorrência máxima de tarefas (todas as categorias)
+    MAX_CONCURRENCY = int(os.getenv('AUTOMATION_MAX_CONCURRENCY', '20'))
+    # Concorrência por categoria, conforme a API externa de cada uma
+    CATEGORY_CONCURRENCY = {
+        'AI_Integration': 4,
+        'Government_APIs': 2,  # receitaws/viacep limitam requisições por minuto
+        'Trello_Automation': 10,
+        'Data_Processing': 10,
+        'API_Integration': 5
+    }
+    DEFAULT_CATEGORY_CONCURRENCY = 5
+    # Tempo máximo de uma tarefa (segundos)
+    TASK_TIMEOUT = float(os.getenv('AUTOMATION_TASK_TIMEOUT', '60'))
+    # Pool de conexões HTTP compartilhado por todas as chamadas de API
+    HTTP_POOL_LIMIT = 100  # Conexões abertas no total
+    HTTP_POOL_LIMIT_PER_HOST = 10  # Conexões por host (Trello, receitaws, viacep...)
+    HTTP_DNS_CACHE_TTL = 300  # Segundos de cache das resoluções DNS
+    HTTP_KEEPALIVE_TIMEOUT = 30  # Segundos que uma conexão ociosa fica aberta para reúso
+    HTTP_REQUEST_TIMEOUT = 30  # Segundos por requisição
     
-    def __init__(self):
+    def __init__(self, max_concurrency: Optional[int] = None, category_concurrency: Optional[Dict[str, int]] = None,
+                 task_timeout: Optional[float] = None):
         # Configurações de API (carregar de variáveis de ambiente)
         self.trello_api_key = os.getenv('TRELLO_API_KEY')
         self.trello_token = os.getenv('TRELLO_TOKEN')
@@ -56,36 +277,136 @@ class ProductionAutomationEngine:
         self.trello_base_url = "https://api.trello.com/1"
         self.github_base_url = "https://api.github.com"
         
+        # Limites de execução
+        self.max_concurrency = max_concurrency or self.MAX_CONCURRENCY
+        self.category_concurrency = dict(self.CATEGORY_CONCURRENCY, **(category_concurrency or {}))
+        self.task_timeout = task_timeout or self.TASK_TIMEOUT
+        
+        # Sessão HTTP compartilhada (criada no primeiro uso; fechar com close() ou `async with`)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.http_metrics = {
+            'requests': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+            'dns_cache_hits': 0,
+            'dns_cache_misses': 0
+        }
+        # Leituras de cards agrupadas em chamadas /1/batch
+        self.card_reader = TrelloBatchReader(self)
+        # Alterações de cards mescladas numa PUT por card (write-behind)
+        self.card_writer = TrelloWriteBuffer(self)
+        
         # Tarefas de alta prioridade
-        self.high_priority_tasks = [
-[]
-        ]
+        self.high_priority_tasks = []
         
         # Status de execução
         self.execution_status = {
             'started_at': None,
+            'finished_at': None,
             'completed_tasks': 0,
             'failed_tasks': 0,
+            'timed_out_tasks': 0,  # Também contadas em failed_tasks
+            'running_tasks': 0,
+            'peak_concurrency': 0,
             'total_tasks': len(self.high_priority_tasks)
         }
     
+    async def __aenter__(self) -> 'ProductionAutomationEngine':
+        await self.get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Sessão HTTP do motor: conexões keep-alive reaproveitadas e DNS em cache"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.HTTP_POOL_LIMIT,
+                limit_per_host=self.HTTP_POOL_LIMIT_PER_HOST,
+                ttl_dns_cache=self.HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=self.HTTP_KEEPALIVE_TIMEOUT
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.HTTP_REQUEST_TIMEOUT),
+                trace_configs=[self._http_trace_config()]
+            )
+        return self._session
+    
+    async def close(self):
+        """Grava as alterações pendentes, conclui as leituras em lote e fecha a sessão HTTP"""
+        await self.card_writer.flush()
+        await self.card_reader.drain()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    def _http_trace_config(self) -> aiohttp.TraceConfig:
+        """Contadores de requisições, conexões novas/reaproveitadas e cache de DNS"""
+        metrics = self.http_metrics
+        
+        def counter(name: str):
+            async def increment(session, context, params):
+                metrics[name] += 1
+            return increment
+        
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(counter('requests'))
+        trace_config.on_connection_create_end.append(counter('connections_created'))
+        trace_config.on_connection_reuseconn.append(counter('connections_reused'))
+        trace_config.on_dns_cache_hit.append(counter('dns_cache_hits'))
+        trace_config.on_dns_cache_miss.append(counter('dns_cache_misses'))
+        return trace_config
+    
     async def execute_all_automations(self):
-        """Executa todas as automações de alta prioridade"""
+        """Executa todas as automações de alta prioridade (em paralelo, dentro dos limites)"""
         self.execution_status['started_at'] = datetime.now().isoformat()
-        logger.info(f"🚀 Iniciando execução de {len(self.high_priority_tasks)} automações")
+        logger.info(f"🚀 Iniciando execução de {len(self.high_priority_tasks)} automações "
+                    f"(até {self.max_concurrency} simultâneas, timeout de {self.task_timeout:.0f}s)")
         
+        global_limit = asyncio.Semaphore(self.max_concurrency)
+        category_limits = {}
         for task_data in self.high_priority_tasks:
-            try:
-                await self.execute_single_automation(task_data)
-                self.execution_status['completed_tasks'] += 1
-                logger.info(f"✅ Automação concluída: {task_data['card_name']}")
-            except Exception as e:
-                self.execution_status['failed_tasks'] += 1
-                logger.error(f"❌ Erro na automação {task_data['card_name']}: {e}")
+            category = task_data['prompt_category']
+            if category not in category_limits:
+                category_limits[category] = asyncio.Semaphore(
+                    self.category_concurrency.get(category, self.DEFAULT_CATEGORY_CONCURRENCY)
+                )
+        
+        await asyncio.gather(*(
+            self.run_limited_automation(task_data, global_limit, category_limits[task_data['prompt_category']])
+            for task_data in self.high_priority_tasks
+        ))
+        self.execution_status['finished_at'] = datetime.now().isoformat()
         
         # Gerar relatório final
         await self.generate_execution_report()
     
+    async def run_limited_automation(self, task_data: Dict, global_limit: asyncio.Semaphore,
+                                     category_limit: asyncio.Semaphore):
+        """Executa uma automação respeitando os limites e atualiza os contadores"""
+        status = self.execution_status
+        # Vaga da categoria primeiro: tarefas de uma categoria saturada não ocupam vagas globais
+        async with category_limit:
+            async with global_limit:
+                status['running_tasks'] += 1
+                status['peak_concurrency'] = max(status['peak_concurrency'], status['running_tasks'])
+                try:
+                    await asyncio.wait_for(self.execute_single_automation(task_data), self.task_timeout)
+                except asyncio.TimeoutError:
+                    status['failed_tasks'] += 1
+                    status['timed_out_tasks'] += 1
+                    logger.error(f"⏱️ Timeout na automação {task_data['card_name']} ({self.task_timeout:.0f}s)")
+                except Exception as e:
+                    status['failed_tasks'] += 1
+                    logger.error(f"❌ Erro na automação {task_data['card_name']}: {e}")
+                else:
+                    status['completed_tasks'] += 1
+                    logger.info(f"✅ Automação concluída: {task_data['card_name']}")
+                finally:
+                    status['running_tasks'] -= 1
+    
     async def execute_single_automation(self, task_data: Dict):
         """Executa uma automação específica"""
         category = task_data['prompt_category']
@@ -105,6 +426,9 @@ class ProductionAutomationEngine:
             await self.execute_api_integration_automation(task_data)
         else:
             logger.warning(f"⚠️ Categoria desconhecida: {category}")
+        
+        # Alterações de campos enfileiradas pela automação saem juntas numa PUT
+        await self.card_writer.flush(card_id)
     
     async def execute_ai_automation(self, task_data: Dict):
         """Executa automação com IA"""
@@ -122,9 +446,7 @@ class ProductionAutomationEngine:
             ai_analysis = await self.process_with_ai(card_data)
             
             # Atualizar card com análise
-            await self.update_trello_card(card_id, {
-                'desc': card_data.get('desc', '') + f"\n\n**Análise IA:**\n{ai_analysis}"
-            })
+            self.queue_card_desc_append(card_id, card_data, f"\n\n**Análise IA:**\n{ai_analysis}")
     
     async def execute_government_api_automation(self, task_data: Dict):
         """Executa automação com APIs governamentais"""
@@ -162,7 +484,7 @@ class ProductionAutomationEngine:
             # Definir data de vencimento se não existir
             if not card_data.get('due'):
                 due_date = (datetime.now() + timedelta(days=7)).isoformat()
-                await self.update_trello_card(card_id, {'due': due_date})
+                self.queue_card_update(card_id, {'due': due_date})
             
             # Adicionar comentário de automação
             await self.add_card_comment(card_id, "🤖 Card processado automaticamente pelo sistema de integração")
@@ -181,9 +503,7 @@ class ProductionAutomationEngine:
             report = self.generate_card_report(card_data, analysis)
             
             # Anexar relatório ao card
-            await self.update_trello_card(card_id, {
-                'desc': card_data.get('desc', '') + f"\n\n**Relatório de Análise:**\n{report}"
-            })
+            self.queue_card_desc_append(card_id, card_data, f"\n\n**Relatório de Análise:**\n{report}")
     
     async def execute_api_integration_automation(self, task_data: Dict):
         """Executa automação de integração de APIs"""
@@ -200,36 +520,59 @@ class ProductionAutomationEngine:
     
     # Métodos auxiliares para APIs
     async def get_trello_card(self, card_id: str) -> Optional[Dict]:
-        """Busca dados de um card do Trello"""
+        """Busca dados de um card do Trello (agrupado com outras leituras via /1/batch)"""
         if not self.trello_api_key or not self.trello_token:
             return None
         
-        url = f"{self.trello_base_url}/cards/{card_id}"
-        params = {'key': self.trello_api_key, 'token': self.trello_token}
-        
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status == 200:
-                        return await response.json()
-        except Exception as e:
-            logger.error(f"Erro ao buscar card {card_id}: {e}")
-        
-        return None
+        card_data = await self.card_reader.get(f"/cards/{card_id}")
+        if card_data is None:
+            logger.error(f"Erro ao buscar card {card_id}")
+        return card_data
     
     async def update_trello_card(self, card_id: str, updates: Dict) -> bool:
-        """Atualiza um card do Trello"""
-        if not self.trello_api_key or not self.trello_token:
-            return False
+        """Atualiza um card do Trello (junto com as alterações pendentes do card, numa única PUT)"""
+        write = self.queue_card_update(card_id, updates)
+        await self.card_writer.flush(card_id)
+        return await write
+    
+    async def append_to_card_desc(self, card_id: str, card_data: Dict, text: str) -> bool:
+        """Anexa texto à descrição do card e grava (anexos de várias automações se acumulam)"""
+        write = self.queue_card_desc_append(card_id, card_data, text)
+        await self.card_writer.flush(card_id)
+        return await write
+    
+    def queue_card_update(self, card_id: str, updates: Dict) -> asyncio.Future:
+        """Enfileira a atualização de um card sem bloquear
         
+        O future resolve com True/False quando a PUT for feita
+        (`card_writer.flush(card_id)`, timer do buffer ou encerramento).
+        """
+        if not self.trello_api_key or not self.trello_token:
+            return self._resolved(False)
+        return self.card_writer.update(card_id, updates)
+    
+    def queue_card_desc_append(self, card_id: str, card_data: Dict, text: str) -> asyncio.Future:
+        """Enfileira um anexo à descrição do card sem bloquear (future como em queue_card_update)"""
+        if not self.trello_api_key or not self.trello_token:
+            return self._resolved(False)
+        return self.card_writer.append_to_desc(card_id, card_data.get('desc', ''), text)
+    
+    @staticmethod
+    def _resolved(value) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(value)
+        return future
+    
+    async def put_trello_card(self, card_id: str, updates: Dict) -> bool:
+        """Grava campos de um card do Trello numa PUT"""
         url = f"{self.trello_base_url}/cards/{card_id}"
         params = {'key': self.trello_api_key, 'token': self.trello_token}
         params.update(updates)
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.put(url, params=params) as response:
-                    return response.status == 200
+            session = await self.get_session()
+            async with session.put(url, params=params) as response:
+                return response.status == 200
         except Exception as e:
             logger.error(f"Erro ao atualizar card {card_id}: {e}")
             return False
@@ -247,9 +590,9 @@ class ProductionAutomationEngine:
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, params=params) as response:
-                    return response.status == 200
+            session = await self.get_session()
+            async with session.post(url, params=params) as response:
+                return response.status == 200
         except Exception as e:
             logger.error(f"Erro ao adicionar comentário ao card {card_id}: {e}")
             return False
@@ -278,10 +621,10 @@ class ProductionAutomationEngine:
         url = f"https://www.receitaws.com.br/v1/cnpj/{cnpj_clean}"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.json()
+            session = await self.get_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    return await response.json()
         except Exception as e:
             logger.error(f"Erro ao consultar CNPJ {cnpj}: {e}")
         
@@ -293,10 +636,10 @@ class ProductionAutomationEngine:
         url = f"https://viacep.com.br/ws/{cep_clean}/json"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.json()
+            session = await self.get_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    return await response.json()
         except Exception as e:
             logger.error(f"Erro ao consultar CEP {cep}: {e}")
         
@@ -325,28 +668,43 @@ class ProductionAutomationEngine:
     
     async def generate_execution_report(self):
         """Gera relatório de execução"""
+        total_tasks = self.execution_status['total_tasks']
+        http_metrics = self.http_metrics
+        connections = http_metrics['connections_created'] + http_metrics['connections_reused']
         report = {
             'execution_summary': self.execution_status,
-            'completion_rate': (self.execution_status['completed_tasks'] / self.execution_status['total_tasks']) * 100,
+            'http_metrics': dict(
+                http_metrics,
+                connection_reuse_rate=http_metrics['connections_reused'] / connections * 100 if connections else 0.0
+            ),
+            'trello_batch_reads': self.card_reader.metrics,
+            'trello_buffered_writes': self.card_writer.metrics,
+            'completion_rate': (self.execution_status['completed_tasks'] / total_tasks) * 100 if total_tasks else 0.0,
+            'limits': {
+                'max_concurrency': self.max_concurrency,
+                'category_concurrency': self.category_concurrency,
+                'task_timeout': self.task_timeout
+            },
             'generated_at': datetime.now().isoformat()
         }
         
         with open('execution_report.json', 'w', encoding='utf-8') as f:
             json.dump(report, f, indent=2, ensure_ascii=False)
         
-        logger.info(f"📊 Relatório gerado: {report['completion_rate']:.1f}% de sucesso")
+        logger.info(f"📊 Relatório gerado: {report['completion_rate']:.1f}% de sucesso | "
+                    f"{http_metrics['requests']} requisições HTTP, "
+                    f"{report['http_metrics']['connection_reuse_rate']:.0f}% em conexões reaproveitadas")
 
 async def main():
     """Função principal"""
-    engine = ProductionAutomationEngine()
-    
     logger.info("🚀 Iniciando Motor de Automação de Produção")
     
     try:
-        await engine.execute_all_automations()
+        async with ProductionAutomationEngine() as engine:
+            await engine.execute_all_automations()
         logger.info("✅ Todas as automações foram executadas!")
     except Exception as e:
         logger.error(f"❌ Erro na execução: {e}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
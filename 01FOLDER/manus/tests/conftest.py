@@ -0,0 +1,36 @@
+"""
+Fixtures compartilhadas dos testes - Arte Comercial
+Os módulos do sistema ficam no diretório pai (scripts soltos, sem pacote).
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+# Os módulos gravam logs e relatórios no diretório atual: fora da árvore do repositório
+os.chdir(tempfile.mkdtemp(prefix='arte_comercial_tests_'))
+
+from benchmark import generate_prompt_library, generate_trello_export  # noqa: E402
+
+SAMPLE_CARDS = 300
+SAMPLE_PROMPTS = 40
+
+@pytest.fixture(scope='session')
+def sample_board(tmp_path_factory) -> Path:
+    """Exportação sintética do Trello (determinística) usada pelos testes"""
+    path = tmp_path_factory.mktemp('board') / 'sample_board.json'
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(generate_trello_export(SAMPLE_CARDS), f, ensure_ascii=False)
+    return path
+
+@pytest.fixture(scope='session')
+def sample_prompts(tmp_path_factory) -> Path:
+    """Biblioteca sintética de prompts (um arquivo .py por prompt)"""
+    directory = tmp_path_factory.mktemp('prompts')
+    generate_prompt_library(directory, SAMPLE_PROMPTS)
+    return directory
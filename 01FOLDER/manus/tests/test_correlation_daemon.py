@@ -0,0 +1,48 @@
+"""
+Serviço residente: estado após muitas alterações igual a uma análise nova
+"""
+
+import copy
+import json
+import random
+
+from correlation_daemon import CorrelationService
+from final_integration_system import FinalIntegrationSystem
+
+EXTRA_TEXT = [' api integração relatório diário', ' cliente vendas webhook', ' receita automação planilha']
+
+def _service(board_path, prompts_path) -> CorrelationService:
+    service = CorrelationService(FinalIntegrationSystem(str(board_path), '', prompts_path=str(prompts_path)))
+    service.load()
+    return service
+
+def _without_date(summary: dict) -> dict:
+    return {key: value for key, value in summary.items() if key != 'analysis_date'}
+
+def test_summary_after_many_upserts_matches_fresh_analysis(sample_board, sample_prompts, tmp_path):
+    service = _service(sample_board, sample_prompts)
+    board = json.loads(sample_board.read_text(encoding='utf-8'))
+    open_cards = [card for card in board['cards'] if not card.get('closed')]
+    rng = random.Random(7)
+    for _ in range(500):
+        card = rng.choice(open_cards)
+        card['desc'] = card['desc'][:200] + rng.choice(EXTRA_TEXT)
+        service.upsert_card(copy.deepcopy(card))
+    
+    edited_path = tmp_path / 'edited_board.json'
+    edited_path.write_text(json.dumps(board), encoding='utf-8')
+    fresh = FinalIntegrationSystem(str(edited_path), '', prompts_path=str(sample_prompts))
+    assert fresh.load_and_analyze_trello() and fresh.load_and_analyze_github()
+    fresh.create_intelligent_correlations()
+    
+    assert _without_date(service.summary()) == _without_date(fresh.generate_executive_summary())
+
+def test_totals_return_to_zero_after_deleting_every_card(sample_board, sample_prompts):
+    service = _service(sample_board, sample_prompts)
+    for card_id in list(service.cards):
+        service.delete_card(card_id)
+    
+    assert service.stats()['correlations'] == 0
+    assert service._totals == {'count': 0, 'high_priority': 0, 'total_milli': 0, 'high_roi': 0}
+    assert not any(service._prompt_milli) and not any(service._prompt_counts)
+    assert 'error' in service.summary()
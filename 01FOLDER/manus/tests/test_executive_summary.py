@@ -0,0 +1,42 @@
+"""
+Resumo executivo: mesmo resultado (bit a bit) por qualquer caminho de cálculo
+"""
+
+import json
+
+from benchmark import generate_trello_export
+from final_integration_system import FinalIntegrationSystem
+from multi_board_analysis import MultiBoardAnalysis
+
+def _summary(board_path, prompts_path, correlations_path: bool = False, **options) -> dict:
+    system = FinalIntegrationSystem(str(board_path), '', prompts_path=str(prompts_path), **options)
+    assert system.load_and_analyze_trello() and system.load_and_analyze_github()
+    correlations = system.create_intelligent_correlations()
+    summary = system.generate_executive_summary(correlations if correlations_path else None)
+    summary.pop('analysis_date')
+    return summary
+
+def test_summary_independent_of_worker_count(sample_board, sample_prompts):
+    single = _summary(sample_board, sample_prompts)
+    
+    assert _summary(sample_board, sample_prompts, workers=3) == single
+    assert _summary(sample_board, sample_prompts, correlations_path=True) == single
+
+def test_merged_boards_match_concatenated_board(tmp_path, sample_prompts):
+    boards = [generate_trello_export(cards, seed) for cards, seed in ((120, 1), (80, 2), (60, 3))]
+    paths = []
+    concatenated = {'lists': [], 'cards': []}
+    for number, board in enumerate(boards):
+        paths.append(tmp_path / f"board_{number}.json")
+        paths[-1].write_text(json.dumps(board), encoding='utf-8')
+        concatenated['lists'] += board['lists']
+        concatenated['cards'] += board['cards']
+    concatenated_path = tmp_path / 'concatenated.json'
+    concatenated_path.write_text(json.dumps(concatenated), encoding='utf-8')
+    
+    merged = MultiBoardAnalysis([str(path) for path in paths], '', prompts_path=str(sample_prompts),
+                                workers=1).run()['merged_summary']
+    merged.pop('analysis_date')
+    merged.pop('boards')
+    
+    assert merged == _summary(concatenated_path, sample_prompts)
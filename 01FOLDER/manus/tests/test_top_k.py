@@ -0,0 +1,23 @@
+"""
+Modo top_k: apenas as K melhores correlações são materializadas
+"""
+
+import pytest
+
+from final_integration_system import FinalIntegrationSystem
+
+@pytest.mark.parametrize('top_k', [0, -1])
+def test_top_k_must_be_positive(top_k):
+    with pytest.raises(ValueError):
+        FinalIntegrationSystem('', '', top_k=top_k)
+
+def test_top_k_keeps_best_correlations(sample_board, sample_prompts):
+    systems = []
+    for top_k in (None, 1, 25):
+        system = FinalIntegrationSystem(str(sample_board), '', prompts_path=str(sample_prompts), top_k=top_k)
+        assert system.load_and_analyze_trello() and system.load_and_analyze_github()
+        systems.append(system.create_intelligent_correlations())
+    full, top_1, top_25 = systems
+    
+    assert top_1 == full[:1]
+    assert top_25 == full[:25]
@@ -0,0 +1,102 @@
+"""
+Leituras de cards agrupadas no /1/batch, contra um Trello simulado (aiohttp)
+"""
+
+import asyncio
+
+from aiohttp import web
+
+from production_implementation import ProductionAutomationEngine, TrelloBatchReader
+
+class MockTrello:
+    """Servidor local com /1/batch e /1/cards/<id> que conta as requisições"""
+    
+    def __init__(self, batch_status: int = 200):
+        self.batch_status = batch_status
+        self.batch_sizes = []
+        self.single_reads = 0
+        self.runner = None
+        self.base_url = None
+    
+    async def start(self) -> 'MockTrello':
+        app = web.Application()
+        app.router.add_get('/1/batch', self.batch)
+        app.router.add_get('/1/cards/{card_id}', self.card)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        self.base_url = f"http://127.0.0.1:{self.runner.addresses[0][1]}/1"
+        return self
+    
+    async def stop(self):
+        await self.runner.cleanup()
+    
+    @staticmethod
+    def card_body(card_id: str):
+        return None if card_id.startswith('missing') else {'id': card_id, 'desc': f"descrição {card_id}"}
+    
+    async def batch(self, request):
+        assert request.query['key'] == 'key' and request.query['token'] == 'token'
+        urls = request.query['urls'].split(',')
+        self.batch_sizes.append(len(urls))
+        if self.batch_status != 200:
+            return web.Response(status=self.batch_status)
+        items = []
+        for url in urls:
+            body = self.card_body(url.rsplit('/', 1)[1])
+            items.append({'200': body} if body else {'404': 'card not found'})
+        return web.json_response(items)
+    
+    async def card(self, request):
+        self.single_reads += 1
+        body = self.card_body(request.match_info['card_id'])
+        return web.json_response(body) if body else web.Response(status=404, text='card not found')
+
+async def _read_cards(server: MockTrello, card_ids):
+    async with ProductionAutomationEngine() as engine:
+        engine.trello_api_key, engine.trello_token = 'key', 'token'
+        engine.trello_base_url = server.base_url
+        results = await asyncio.gather(*(engine.get_trello_card(card_id) for card_id in card_ids))
+        return results, dict(engine.card_reader.metrics)
+
+def _run(card_ids, batch_status: int = 200):
+    async def scenario():
+        server = await MockTrello(batch_status).start()
+        try:
+            results, metrics = await _read_cards(server, card_ids)
+        finally:
+            await server.stop()
+        return server, results, metrics
+    return asyncio.run(scenario())
+
+def test_reads_are_grouped_in_batches_of_at_most_ten():
+    # Rota repetida dentro da mesma janela: uma leitura atende os dois chamadores
+    card_ids = ['card0', 'card0'] + [f"card{i}" for i in range(1, 95)] + ['missing1']
+    server, results, metrics = _run(card_ids)
+    
+    unique_routes = len(set(card_ids))
+    assert max(server.batch_sizes) <= TrelloBatchReader.MAX_BATCH_URLS
+    assert sum(server.batch_sizes) == unique_routes
+    assert len(server.batch_sizes) == -(-unique_routes // TrelloBatchReader.MAX_BATCH_URLS)
+    assert server.single_reads == 0
+    assert metrics['batch_requests'] == len(server.batch_sizes) and metrics['reads'] == len(card_ids)
+    assert results == [MockTrello.card_body(card_id) for card_id in card_ids]
+
+def test_falls_back_to_single_reads_when_batch_fails():
+    card_ids = [f"card{i}" for i in range(25)] + ['missing1']
+    server, results, metrics = _run(card_ids, batch_status=503)
+    
+    assert len(server.batch_sizes) == 3
+    assert server.single_reads == len(card_ids) == metrics['fallback_requests']
+    assert results == [MockTrello.card_body(card_id) for card_id in card_ids]
+
+def test_unreachable_trello_resolves_every_read_to_none():
+    async def scenario():
+        server = await MockTrello().start()
+        await server.stop()  # Porta fechada: nem o lote nem as leituras diretas conectam
+        return await _read_cards(server, ['card1', 'card2'])
+    results, metrics = asyncio.run(scenario())
+    
+    assert results == [None, None]
+    assert metrics['fallback_requests'] == 2
@@ -0,0 +1,129 @@
+"""
+Receptor de webhooks: rajadas de ações reenviadas contra o serviço de correlação
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from correlation_daemon import CorrelationService
+from final_integration_system import FinalIntegrationSystem
+from trello_webhook import WebhookCoalescer, create_webhook_server, replay_actions
+
+SECRET = 'segredo-do-app'
+CALLBACK_URL = 'https://example.com/webhooks/trello'
+
+@pytest.fixture
+def service(sample_board, sample_prompts):
+    service = CorrelationService(FinalIntegrationSystem(str(sample_board), '', prompts_path=str(sample_prompts)))
+    service.load()
+    return service
+
+class UpsertCounter:
+    """Conta (e data) os recálculos de cada card no serviço"""
+    
+    def __init__(self, service: CorrelationService):
+        self.calls = {}
+        self._upsert = service.upsert_card
+        service.upsert_card = self
+    
+    def __call__(self, card_data):
+        self.calls.setdefault(card_data['id'], []).append(time.monotonic())
+        return self._upsert(card_data)
+
+def _action(action_type: str, card: dict, **data) -> dict:
+    return {'action': {'type': action_type, 'data': dict(data, card=card)}}
+
+def _open_card_ids(service: CorrelationService, count: int):
+    return list(service.cards)[:count]
+
+def test_burst_is_one_recalculation_per_card(service):
+    counter = UpsertCounter(service)
+    card_ids = _open_card_ids(service, 5)
+    coalescer = WebhookCoalescer(service, window=60)
+    for step in range(20):
+        for card_id in card_ids:
+            coalescer.submit(_action('updateCard', {'id': card_id, 'desc': f"api integração webhook {step}"}))
+        coalescer.submit(_action('addLabelToCard', {'id': card_ids[0]}, label={'name': f"Urgente {step}"}))
+    coalescer.submit({'action': {'type': 'updateBoard', 'data': {'board': {'id': 'b'}}}})
+    
+    assert coalescer.flush() == len(card_ids)
+    assert {card_id: len(calls) for card_id, calls in counter.calls.items()} == dict.fromkeys(card_ids, 1)
+    assert service.card_snapshot(card_ids[1])['desc'] == "api integração webhook 19"
+    assert len(service.card_snapshot(card_ids[0])['labels']) >= 20
+    assert coalescer.stats == {'events': 121, 'ignored': 1, 'cards_applied': 5, 'cards_deleted': 0,
+                               'apply_errors': 0}
+
+def test_max_delay_bounds_waiting_of_a_busy_card(service):
+    counter = UpsertCounter(service)
+    card_id = _open_card_ids(service, 1)[0]
+    coalescer = WebhookCoalescer(service, window=0.3, max_delay=0.5)
+    coalescer.start()
+    try:
+        started = time.monotonic()
+        # Eventos a cada 50ms (menos que a janela): sem max_delay o card nunca seria aplicado
+        while time.monotonic() - started < 1.6:
+            coalescer.submit(_action('updateCard', {'id': card_id, 'desc': f"relatório {time.monotonic()}"}))
+            time.sleep(0.05)
+    finally:
+        coalescer.stop()
+    
+    applied = counter.calls[card_id]
+    assert len(applied) >= 3
+    assert applied[0] - started <= 0.5 + 0.2
+    assert all(later - earlier <= 0.5 + 0.2 for earlier, later in zip(applied, applied[1:-1]))
+
+def test_delete_archive_and_unarchive(service):
+    deleted_id, archived_id = _open_card_ids(service, 2)
+    before = service.card_correlations(archived_id, 1000)
+    coalescer = WebhookCoalescer(service, window=60)
+    
+    coalescer.submit(_action('updateCard', {'id': deleted_id, 'desc': 'edição antes da exclusão'}))
+    coalescer.submit(_action('deleteCard', {'id': deleted_id}))
+    coalescer.submit(_action('updateCard', {'id': archived_id, 'closed': True}))
+    coalescer.flush()
+    assert service.card_snapshot(deleted_id) is None and service.card_snapshot(archived_id) is None
+    assert coalescer.stats['cards_deleted'] == 2
+    
+    # Desarquivamento: o evento traz só o id e closed=false
+    coalescer.submit(_action('updateCard', {'id': archived_id, 'closed': False}))
+    coalescer.flush()
+    assert service.card_correlations(archived_id, 1000) == before
+    assert service.card_snapshot(deleted_id) is None
+
+def test_replay_with_signature_and_bad_hmac_rejected(service):
+    counter = UpsertCounter(service)
+    card_ids = _open_card_ids(service, 3)
+    coalescer = WebhookCoalescer(service, window=60)
+    server = create_webhook_server(coalescer, port=0, secret=SECRET, callback_url=CALLBACK_URL)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/webhooks/trello"
+    try:
+        payloads = [_action('updateCard', {'id': card_id, 'desc': f"planilha de vendas {step}"})
+                    for step in range(10) for card_id in card_ids]
+        assert replay_actions(payloads, url, secret=SECRET, callback_url=CALLBACK_URL)['sent'] == len(payloads)
+        
+        body = json.dumps(payloads[0]).encode('utf-8')
+        wrong = base64.b64encode(hmac.new(b'outro-segredo', body + CALLBACK_URL.encode('utf-8'),
+                                          hashlib.sha1).digest()).decode('ascii')
+        for signature in (wrong, None):
+            headers = {'Content-Type': 'application/json'}
+            if signature:
+                headers['X-Trello-Webhook'] = signature
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(urllib.request.Request(url, body, headers, method='POST'), timeout=5)
+            assert error.value.code == 401
+    finally:
+        server.shutdown()
+        server.server_close()
+    
+    assert coalescer.stats['events'] == len(payloads)
+    coalescer.flush()
+    assert {card_id: len(calls) for card_id, calls in counter.calls.items()} == dict.fromkeys(card_ids, 1)
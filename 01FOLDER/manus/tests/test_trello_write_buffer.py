@@ -0,0 +1,142 @@
+"""
+Alterações de cards enfileiradas e gravadas numa PUT por card (Trello simulado)
+"""
+
+import asyncio
+import time
+
+from aiohttp import web
+
+from production_implementation import ProductionAutomationEngine
+
+class MockTrello:
+    """Servidor local com GET /1/batch e PUT /1/cards/<id>; guarda o estado dos cards"""
+    
+    def __init__(self, cards):
+        self.cards = {card_id: dict(card, id=card_id) for card_id, card in cards.items()}
+        self.puts = []  # (card_id, campos da query, corpo)
+        self.failing = set()  # Cards cuja PUT responde 500 sem gravar
+        self.runner = None
+        self.base_url = None
+    
+    async def start(self) -> 'MockTrello':
+        app = web.Application()
+        app.router.add_get('/1/batch', self.batch)
+        app.router.add_put('/1/cards/{card_id}', self.put)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        self.base_url = f"http://127.0.0.1:{self.runner.addresses[0][1]}/1"
+        return self
+    
+    async def stop(self):
+        await self.runner.cleanup()
+    
+    async def batch(self, request):
+        return web.json_response([{'200': self.cards[url.rsplit('/', 1)[1]]}
+                                  for url in request.query['urls'].split(',')])
+    
+    async def put(self, request):
+        card_id = request.match_info['card_id']
+        fields = {key: value for key, value in request.query.items() if key not in ('key', 'token')}
+        self.puts.append((card_id, fields, await request.text()))
+        if card_id in self.failing:
+            return web.json_response({'message': 'erro simulado'}, status=500)
+        self.cards[card_id].update(fields)
+        return web.json_response(self.cards[card_id])
+    
+    def put_count(self, card_id: str) -> int:
+        return sum(1 for put_card_id, _, _ in self.puts if put_card_id == card_id)
+
+def _run(cards, scenario, failing=()):
+    async def main():
+        server = await MockTrello(cards).start()
+        server.failing.update(failing)
+        try:
+            async with ProductionAutomationEngine() as engine:
+                engine.trello_api_key, engine.trello_token = 'key', 'token'
+                engine.openai_api_key = 'openai'
+                engine.trello_base_url = server.base_url
+                engine.card_writer.flush_interval = 60  # Só flush explícito ou encerramento
+                result = await scenario(engine, server)
+            return server, result
+        finally:
+            await server.stop()
+    return asyncio.run(main())
+
+def test_sequential_writes_merge_into_one_put_without_blocking():
+    async def scenario(engine, server):
+        started = time.perf_counter()
+        writes = [
+            engine.queue_card_update('card1', {'due': '2025-08-01'}),
+            engine.queue_card_desc_append('card1', {'desc': 'edital'}, ' +IA'),
+            engine.queue_card_update('card1', {'due': '2025-08-08', 'name': 'Pregão 12/2025'}),
+            engine.queue_card_desc_append('card1', {'desc': 'edital'}, ' +relatório')
+        ]
+        queued = time.perf_counter() - started
+        await engine.card_writer.flush('card1')
+        return queued, [await write for write in writes], time.perf_counter() - started
+    server, (queued, results, elapsed) = _run({'card1': {'desc': 'edital'}}, scenario)
+    
+    assert queued < 0.05 and elapsed < 1.0
+    assert results == [True] * 4
+    assert server.put_count('card1') == 1
+    # Campos seguem na query, como antes do buffer
+    assert server.puts[0][1:] == ({'due': '2025-08-08', 'desc': 'edital +IA +relatório', 'name': 'Pregão 12/2025'}, '')
+
+def test_card_flush_leaves_other_cards_pending_until_close():
+    async def scenario(engine, server):
+        first = engine.queue_card_update('card1', {'name': 'um'})
+        second = engine.queue_card_update('card2', {'name': 'dois'})
+        await engine.card_writer.flush('card1')
+        return await first, second.done(), second
+    server, (first, second_done_before_close, second) = _run({'card1': {}, 'card2': {}}, scenario)
+    
+    assert first is True and not second_done_before_close
+    assert second.result() is True  # Gravado pelo close() do `async with`
+    assert [card_id for card_id, _, _ in server.puts] == ['card1', 'card2']
+
+def test_automations_on_same_card_keep_both_appends():
+    tasks = [{'card_id': 'card1', 'card_name': 'Pregão', 'prompt_category': category}
+             for category in ('AI_Integration', 'Data_Processing')]
+    
+    async def scenario(engine, server):
+        started = time.perf_counter()
+        await asyncio.gather(*(engine.execute_single_automation(task) for task in tasks))
+        return time.perf_counter() - started
+    server, elapsed = _run({'card1': {'desc': 'edital', 'name': 'Pregão'}}, scenario)
+    
+    assert elapsed < 1.0
+    desc = server.cards['card1']['desc']
+    assert desc.startswith('edital') and '**Análise IA:**' in desc and '**Relatório de Análise:**' in desc
+    assert server.put_count('card1') <= 2
+
+def test_update_trello_card_awaits_its_put():
+    async def scenario(engine, server):
+        return await engine.update_trello_card('card1', {'name': 'um'})
+    server, result = _run({'card1': {}}, scenario)
+    
+    assert result is True
+    assert server.puts[0][:2] == ('card1', {'name': 'um'})
+
+def test_failed_put_does_not_leak_into_next_append():
+    async def scenario(engine, server):
+        failed = await engine.append_to_card_desc('card1', {'desc': 'edital'}, ' +perdido')
+        server.failing.clear()
+        retried = await engine.append_to_card_desc('card1', {'desc': 'edital'}, ' +IA')
+        return failed, retried
+    server, (failed, retried) = _run({'card1': {'desc': 'edital'}}, scenario, failing={'card1'})
+    
+    assert (failed, retried) == (False, True)
+    assert server.cards['card1']['desc'] == 'edital +IA'
+
+def test_append_after_put_uses_externally_edited_desc():
+    async def scenario(engine, server):
+        await engine.append_to_card_desc('card1', {'desc': 'edital'}, ' +IA')
+        server.cards['card1']['desc'] = 'editado no Trello'
+        return await engine.append_to_card_desc('card1', {'desc': 'editado no Trello'}, ' +relatório')
+    server, result = _run({'card1': {'desc': 'edital'}}, scenario)
+    
+    assert result is True
+    assert server.cards['card1']['desc'] == 'editado no Trello +relatório'
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3.11
+"""
+Receptor de webhooks do Trello - Arte Comercial
+Recebe as ações do board (edição de descrição, etiquetas, listas...), agrupa
+os eventos de cada card numa janela curta e recalcula cada card agrupado uma
+única vez (métricas + correlação) no serviço residente. Uma rajada de edições
+custa um recálculo por card, e não uma nova análise do board inteiro.
+
+Modo replay: reenvia ações gravadas (corpos de webhook ou o campo "actions" da
+exportação do board) para um receptor local, no lugar do Trello.
+
+    python trello_webhook.py --trello board.json --port 8766
+    python trello_webhook.py --replay acoes.json --url http://127.0.0.1:8766/webhooks/trello
+"""
+
+import argparse
+import base64
+import copy
+import hashlib
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+from correlation_daemon import CorrelationService, create_server
+from final_integration_system import FinalIntegrationSystem
+
+logger = logging.getLogger(__name__)
+
+class WebhookCoalescer:
+    """Agrupa as ações do Trello por card e aplica cada card uma vez por janela
+    
+    Cada ação reinicia a janela do card (debounce); `max_delay` limita a espera
+    de um card que não para de receber eventos. Na aplicação, o card atual do
+    serviço recebe os campos alterados e as etiquetas/membros na ordem dos
+    eventos (ou é buscado inteiro via `fetch_card`, quando informado) e passa
+    por `CorrelationService.upsert_card`. Cards arquivados guardam o último
+    estado, para que o desarquivamento (evento sem nome/lista) os restaure.
+    """
+    
+    CARD_FIELDS = ('name', 'desc', 'idList', 'due', 'closed')
+    
+    def __init__(self, service: CorrelationService, window: float = 1.0, max_delay: float = 10.0,
+                 fetch_card: Optional[Callable[[str], Optional[Dict]]] = None):
+        self.service = service
+        self.window = window
+        self.max_delay = max_delay
+        self.fetch_card = fetch_card
+        self._pending: Dict[str, Dict] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._archived: Dict[str, Dict] = {}  # card_id -> último estado antes do arquivamento
+        self.stats = {'events': 0, 'ignored': 0, 'cards_applied': 0, 'cards_deleted': 0, 'apply_errors': 0}
+    
+    def start(self) -> None:
+        """Inicia a thread que aplica os cards quando a janela fecha"""
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name='webhook-coalescer', daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Para a thread e aplica o que ainda estiver pendente"""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+    
+    def submit(self, payload: Dict) -> bool:
+        """Registra uma ação (corpo do webhook ou a ação em si); False se não é de card"""
+        action = payload.get('action', payload)
+        data = action.get('data') or {}
+        card = data.get('card') or {}
+        with self._condition:
+            self.stats['events'] += 1
+            if not card.get('id'):
+                self.stats['ignored'] += 1
+                return False
+            
+            now = time.monotonic()
+            pending = self._pending.get(card['id'])
+            if pending is None:
+                pending = self._pending[card['id']] = {'fields': {}, 'ops': [], 'lists': {}, 'deleted': False,
+                                                      'events': 0, 'first': now}
+            self._merge_action(pending, action.get('type', ''), data, card)
+            pending['events'] += 1
+            pending['due'] = min(now + self.window, pending['first'] + self.max_delay)
+            self._condition.notify()
+        return True
+    
+    def flush(self) -> int:
+        """Aplica imediatamente todos os cards pendentes; devolve quantos foram aplicados"""
+        with self._condition:
+            batch, self._pending = self._pending, {}
+        for card_id, pending in batch.items():
+            self._apply(card_id, pending)
+        return len(batch)
+    
+    def _count(self, stat: str, amount: int = 1) -> None:
+        # Estatísticas também são alteradas por submit (outra thread)
+        with self._condition:
+            self.stats[stat] += amount
+    
+    def pending_count(self) -> int:
+        with self._condition:
+            return len(self._pending)
+    
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._running:
+                    now = time.monotonic()
+                    ready = [card_id for card_id, pending in self._pending.items() if pending['due'] <= now]
+                    if ready:
+                        break
+                    next_due = min((pending['due'] for pending in self._pending.values()), default=None)
+                    self._condition.wait(None if next_due is None else next_due - now)
+                if not self._running:
+                    return
+                batch = [(card_id, self._pending.pop(card_id)) for card_id in ready]
+            
+            # Fora do lock: novos eventos continuam chegando durante o recálculo
+            for card_id, pending in batch:
+                self._apply(card_id, pending)
+    
+    def _merge_action(self, pending: Dict, action_type: str, data: Dict, card: Dict) -> None:
+        """Incorpora uma ação ao estado pendente do card"""
+        if action_type == 'deleteCard':
+            pending['deleted'] = True
+            return
+        
+        fields = pending['fields']
+        for field in self.CARD_FIELDS:
+            if field in card:
+                fields[field] = card[field]
+        
+        # Listas citadas na ação (criação, movimentação) entram no mapa de nomes
+        for key in ('list', 'listAfter'):
+            board_list = data.get(key)
+            if board_list and board_list.get('id'):
+                if board_list.get('name'):
+                    pending['lists'][board_list['id']] = board_list['name']
+                if key == 'listAfter' or action_type in ('createCard', 'copyCard', 'moveCardToBoard'):
+                    fields['idList'] = board_list['id']
+        
+        if action_type in ('addLabelToCard', 'removeLabelFromCard'):
+            name = (data.get('label') or {}).get('name') or data.get('text', '')
+            pending['ops'].append(('labels', name, action_type == 'addLabelToCard'))
+        elif action_type in ('addMemberToCard', 'removeMemberFromCard'):
+            member = data.get('idMember') or (data.get('member') or {}).get('id')
+            pending['ops'].append(('idMembers', member, action_type == 'addMemberToCard'))
+        
+        if action_type in ('createCard', 'copyCard', 'moveCardToBoard'):
+            pending['deleted'] = False
+    
+    def _apply(self, card_id: str, pending: Dict) -> None:
+        """Recalcula o card uma vez com todos os eventos agrupados"""
+        try:
+            for list_id, name in pending['lists'].items():
+                self.service.register_list(list_id, name)
+            
+            if pending['deleted']:
+                self._archived.pop(card_id, None)
+                self.service.delete_card(card_id)
+                self._count('cards_deleted')
+                return
+            
+            card_data = self.fetch_card(card_id) if self.fetch_card else None
+            if card_data is None:
+                card_data = self._merged_card(card_id, pending)
+            if card_data is None:
+                logger.warning(f"⚠️ Card {card_id} desconhecido e sem nome/lista nos eventos: ignorado")
+                self._count('ignored', pending['events'])
+                return
+            
+            if card_data.get('closed', False):
+                self._archived[card_id] = dict(card_data, closed=False)
+            else:
+                self._archived.pop(card_id, None)
+            result = self.service.upsert_card(card_data)
+            if result.get('deleted') is not None:
+                self._count('cards_deleted')
+            else:
+                self._count('cards_applied')
+            logger.debug(f"🔁 Card {card_id}: {pending['events']} eventos -> 1 recálculo ({result['elapsed_ms']}ms)")
+        except Exception as e:
+            self._count('apply_errors')
+            logger.error(f"❌ Erro ao aplicar eventos do card {card_id}: {e}")
+    
+    def _merged_card(self, card_id: str, pending: Dict) -> Optional[Dict]:
+        """Card atual do serviço com os campos e operações dos eventos aplicados"""
+        card_data = self.service.card_snapshot(card_id)
+        if card_data is None and card_id in self._archived:
+            # Desarquivamento: o serviço removeu o card, o último estado ficou guardado
+            card_data = copy.deepcopy(self._archived[card_id])
+        if card_data is None:
+            card_data = {'id': card_id, 'desc': '', 'labels': [], 'due': None, 'idMembers': []}
+        card_data.update(pending['fields'])
+        if not card_data.get('name') or not card_data.get('idList'):
+            return None
+        
+        labels = [label['name'] for label in card_data['labels']]
+        members = list(card_data['idMembers'])
+        for field, value, added in pending['ops']:
+            values = labels if field == 'labels' else members
+            if added and value not in values:
+                values.append(value)
+            elif not added and value in values:
+                values.remove(value)
+        card_data['labels'] = [{'name': name} for name in labels]
+        card_data['idMembers'] = members
+        return card_data
+
+class TrelloWebhookHandler(BaseHTTPRequestHandler):
+    """HEAD responde à verificação do Trello; POST entrega a ação ao agrupador"""
+    
+    server_version = "ArteComercialWebhook/1.0"
+    
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        secret = self.server.secret
+        if secret:
+            # Assinatura do Trello: base64(HMAC-SHA1(segredo, corpo + callbackURL))
+            digest = hmac.new(secret.encode('utf-8'), body + self.server.callback_url.encode('utf-8'),
+                              hashlib.sha1).digest()
+            if not hmac.compare_digest(base64.b64encode(digest).decode('ascii'),
+                                       self.headers.get('X-Trello-Webhook', '')):
+                self._send(401, {'error': "Assinatura inválida"})
+                return
+        try:
+            payload = json.loads(body or b'{}')
+            accepted = self.server.coalescer.submit(payload)
+        except (ValueError, AttributeError) as e:
+            self._send(400, {'error': f"Payload inválido: {e}"})
+            return
+        self._send(200, {'accepted': accepted})
+    
+    def _send(self, status: int, payload: Dict) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+def create_webhook_server(coalescer: WebhookCoalescer, host: str = '127.0.0.1', port: int = 8766,
+                          secret: Optional[str] = None, callback_url: str = '') -> ThreadingHTTPServer:
+    """Servidor HTTP que recebe os webhooks do Trello"""
+    server = ThreadingHTTPServer((host, port), TrelloWebhookHandler)
+    server.daemon_threads = True
+    server.coalescer = coalescer
+    server.secret = secret
+    server.callback_url = callback_url
+    return server
+
+def load_recorded_actions(path: str) -> List[Dict]:
+    """Ações gravadas em ordem cronológica (lista de corpos de webhook ou exportação do board)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        # Exportação do board: "actions" vem da mais recente para a mais antiga
+        return [{'action': action} for action in sorted(data.get('actions', []), key=lambda a: a.get('date', ''))]
+    return [item if 'action' in item else {'action': item} for item in data]
+
+def replay_actions(payloads: List[Dict], url: str, interval: float = 0.0,
+                   secret: Optional[str] = None, callback_url: str = '') -> Dict:
+    """Reenvia as ações gravadas ao receptor, como o Trello faria"""
+    started = time.perf_counter()
+    sent = failed = 0
+    for payload in payloads:
+        body = json.dumps(payload).encode('utf-8')
+        headers = {'Content-Type': 'application/json'}
+        if secret:
+            digest = hmac.new(secret.encode('utf-8'), body + callback_url.encode('utf-8'), hashlib.sha1).digest()
+            headers['X-Trello-Webhook'] = base64.b64encode(digest).decode('ascii')
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, body, headers, method='POST'), timeout=10):
+                sent += 1
+        except OSError as e:
+            failed += 1
+            logger.warning(f"⚠️ Falha ao reenviar ação: {e}")
+        if interval:
+            time.sleep(interval)
+    return {'sent': sent, 'failed': failed, 'seconds': round(time.perf_counter() - started, 3)}
+
+def main():
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Receptor de webhooks do Trello com recálculo agrupado por card")
+    parser.add_argument('--trello', default='/home/ubuntu/upload/arte-comercial_Jason_Update.json',
+                        help="Exportação JSON do board do Trello (carga inicial)")
+    parser.add_argument('--prompts-path', default=os.getenv('ARTE_COMERCIAL_PROMPTS_PATH'),
+                        help="Clone local com os prompts (sem ele, dados simulados)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766, help="Porta do receptor de webhooks")
+    parser.add_argument('--api-port', type=int, default=8765, help="Porta da API de consultas (0 desativa)")
+    parser.add_argument('--window', type=float, default=1.0, help="Janela de agrupamento por card (segundos)")
+    parser.add_argument('--max-delay', type=float, default=10.0, help="Espera máxima de um card (segundos)")
+    parser.add_argument('--secret', default=os.getenv('TRELLO_WEBHOOK_SECRET'),
+                        help="Segredo da aplicação Trello (valida X-Trello-Webhook)")
+    parser.add_argument('--callback-url', default=os.getenv('TRELLO_WEBHOOK_CALLBACK_URL', ''),
+                        help="URL de callback registrada no Trello (parte da assinatura)")
+    parser.add_argument('--replay', help="Reenvia as ações gravadas deste arquivo e sai")
+    parser.add_argument('--url', default='http://127.0.0.1:8766/webhooks/trello', help="Receptor do replay")
+    parser.add_argument('--interval', type=float, default=0.0, help="Pausa entre ações no replay (segundos)")
+    args = parser.parse_args()
+    
+    if args.replay:
+        result = replay_actions(load_recorded_actions(args.replay), args.url, args.interval,
+                                args.secret, args.callback_url)
+        print(f"📨 Replay: {result['sent']} ações enviadas, {result['failed']} falhas em {result['seconds']}s")
+        return
+    
+    system = FinalIntegrationSystem(
+        trello_json_path=args.trello,
+        github_repo_url='https://github.com/pietrorampazzo/arte_comercial',
+        prompts_path=args.prompts_path
+    )
+    service = CorrelationService(system)
+    service.load()
+    coalescer = WebhookCoalescer(service, args.window, args.max_delay)
+    coalescer.start()
+    
+    api_server = None
+    if args.api_port:
+        api_server = create_server(service, args.host, args.api_port)
+        threading.Thread(target=api_server.serve_forever, daemon=True).start()
+    
+    server = create_webhook_server(coalescer, args.host, args.port, args.secret, args.callback_url)
+    logger.info(f"🪝 Webhooks em http://{args.host}:{args.port} (janela {args.window}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("🛑 Receptor encerrado")
+    finally:
+        server.server_close()
+        coalescer.stop()
+        if api_server:
+            api_server.shutdown()
+            api_server.server_close()
+        logger.info(f"📊 Eventos: {coalescer.stats}")
+
+if __name__ == "__main__":
+    main()